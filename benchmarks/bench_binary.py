@@ -0,0 +1,68 @@
+"""Compare the binary format against json + asdict.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_binary.py
+"""
+from enum import Enum
+import json
+import timeit
+from typing import List, Optional
+
+from c11h.dataclassutils import asdict, dataclass
+from c11h.dataclassutils.binary import dumps, loads
+
+
+class Color(Enum):
+    red = 'r'
+    blue = 'b'
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    price: float
+    amount: int
+    color: Color
+    note: Optional[str]
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+    customer: str
+    items: List[Item]
+
+
+def make_order(n_items):
+    return Order(**{
+        'id': 12345, 'customer': 'pepe the frog',
+        'items': [{'sku': f'SKU-{i:06d}', 'price': i * 0.5, 'amount': i,
+                   'color': 'r' if i % 2 else 'b'} for i in range(n_items)]})
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28}{seconds * 1e6:>10.1f} us")
+
+
+def main():
+    for n_items in (1, 10, 100):
+        order = make_order(n_items)
+        as_json = json.dumps(asdict(order))
+        as_binary = dumps(order)
+        number = max(10, 2000 // n_items)
+        print(f"Order with {n_items} items: json {len(as_json)} bytes, "
+              f"binary {len(as_binary)} bytes")
+        bench('json.dumps(asdict(obj))', lambda: json.dumps(asdict(order)),
+              number)
+        bench('dumps(obj)', lambda: dumps(order), number)
+        bench('Order(**json.loads(s))', lambda: Order(**json.loads(as_json)),
+              number)
+        bench('loads(Order, b)', lambda: loads(Order, as_binary), number)
+        bench('loads(Order, b, trusted)',
+              lambda: loads(Order, as_binary, validate=False), number)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Compare coerce=True against converting the input before initializing.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_coerce.py
+"""
+from datetime import datetime
+from decimal import Decimal
+import timeit
+from typing import List
+
+from c11h.dataclassutils import dataclass
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    price: Decimal
+    amount: int
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+    created: datetime
+    items: List[Item]
+
+
+@dataclass(nest=True, validate=True, coerce=True)
+class CoercedItem:
+    sku: str
+    price: Decimal
+    amount: int
+
+
+@dataclass(nest=True, validate=True, coerce=True)
+class CoercedOrder:
+    id: int
+    created: datetime
+    items: List[CoercedItem]
+
+
+def make_payload(n_items):
+    return {'id': '12345', 'created': '2024-01-02T03:04:05',
+            'items': [{'sku': f'SKU-{i:06d}', 'price': f'{i}.50',
+                       'amount': str(i)} for i in range(n_items)]}
+
+
+def convert(payload):
+    """Convert a payload by hand, the way it is done without coerce."""
+    return {'id': int(payload['id']),
+            'created': datetime.fromisoformat(payload['created']),
+            'items': [{'sku': item['sku'], 'price': Decimal(item['price']),
+                       'amount': int(item['amount'])}
+                      for item in payload['items']]}
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28}{seconds * 1e6:>10.1f} us")
+
+
+def main():
+    for n_items in (1, 10, 100):
+        payload = make_payload(n_items)
+        number = max(10, 2000 // n_items)
+        print(f"Order with {n_items} items:")
+        bench('Order(**convert(payload))', lambda: Order(**convert(payload)),
+              number)
+        bench('CoercedOrder(**payload)', lambda: CoercedOrder(**payload),
+              number)
+
+
+if __name__ == '__main__':
+    main()
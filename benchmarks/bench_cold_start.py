@@ -0,0 +1,64 @@
+"""Measure the import time of a module with many models.
+
+Each run happens in a fresh interpreter, so all per-class preparation of
+the models is part of the measured time.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_cold_start.py
+"""
+import os
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+
+N_MODELS = 300
+
+MODEL = '''
+@dataclass(nest=True, validate=True)
+class Model{i}:
+    id: int
+    name: str
+    tags: List[str]
+    note: Optional[str]
+    child: Optional[Model{parent}] = field(optional=True)
+'''
+
+TIMER = '''
+import time
+start = time.perf_counter()
+import models
+print(time.perf_counter() - start)
+'''
+
+
+def write_models(directory):
+    lines = ['from typing import List, Optional',
+             'from c11h.dataclassutils import dataclass, field',
+             MODEL.format(i=0, parent=0).replace('Optional[Model0]',
+                                                 'Optional[int]')]
+    lines += [MODEL.format(i=i, parent=i - 1) for i in range(1, N_MODELS)]
+    Path(directory, 'models.py').write_text('\n'.join(lines))
+
+
+def run(directory):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    env['PYTHONPATH'] = os.pathsep.join(
+        [directory, str(Path(__file__).parents[1] / 'src'),
+         env.get('PYTHONPATH', '')])
+    out = subprocess.run([sys.executable, '-c', TIMER], env=env, check=True,
+                         stdout=subprocess.PIPE, universal_newlines=True)
+    return float(out.stdout)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        write_models(directory)
+        run(directory)  # warm up the file system
+        seconds = min(run(directory) for _ in range(5))
+        print(f"Importing {N_MODELS} models: {seconds * 1e3:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Compare build_deep and asdict_deep against the recursive engine.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_deep_tree.py
+"""
+import timeit
+from typing import List
+
+from c11h.dataclassutils import (asdict, asdict_deep, build_deep,
+                                 dataclass, field)
+
+
+@dataclass(nest=True, validate=True)
+class Category:
+    name: str
+    children: List['Category'] = field(default_factory=list)
+
+
+def make_tree(depth):
+    """A chain of categories with a leaf next to each of them."""
+    data: dict = {'name': 'leaf'}
+    for level in range(depth):
+        data = {'name': f'level {level}',
+                'children': [data, {'name': f'sibling {level}'}]}
+    return data
+
+
+def bench(label, func, number):
+    try:
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    except RecursionError:
+        print(f"  {label:<30}{'RecursionError':>14}")
+    else:
+        print(f"  {label:<30}{seconds * 1e3:>11.2f} ms")
+
+
+def main():
+    for depth in (10, 100, 10000):
+        data = make_tree(depth)
+        tree = build_deep(Category, data)
+        number = max(1, 1000 // depth)
+        print(f"Tree {depth} levels deep:")
+        bench('Category(**data)', lambda: Category(**data), number)
+        bench('build_deep(Category, data)',
+              lambda: build_deep(Category, data), number)
+        bench('asdict(tree)', lambda: asdict(tree), number)
+        bench('asdict_deep(tree)', lambda: asdict_deep(tree), number)
+
+
+if __name__ == '__main__':
+    main()
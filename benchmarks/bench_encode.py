@@ -0,0 +1,59 @@
+"""Compare asdict(encode=True) against a json.dumps(default=...) hook.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_encode.py
+"""
+from datetime import datetime
+from decimal import Decimal
+import json
+import timeit
+from typing import List
+from uuid import UUID, uuid4
+
+from c11h.dataclassutils import asdict, dataclass
+
+
+@dataclass(nest=True, validate=True)
+class Entry:
+    id: UUID
+    at: datetime
+    amount: Decimal
+
+
+@dataclass(nest=True, validate=True)
+class Ledger:
+    entries: List[Entry]
+
+
+def default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f"{type(value)} is not JSON serializable")
+
+
+def make_ledger(n_entries):
+    return Ledger([Entry(uuid4(), datetime(2024, 1, 2, 3, 4), Decimal(i))
+                   for i in range(n_entries)])
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<36}{seconds * 1e6:>10.1f} us")
+
+
+def main():
+    for n_entries in (1, 10, 100):
+        ledger = make_ledger(n_entries)
+        number = max(10, 2000 // n_entries)
+        print(f"Ledger with {n_entries} entries:")
+        bench('json.dumps(asdict(l), default=...)',
+              lambda: json.dumps(asdict(ledger), default=default), number)
+        bench('json.dumps(asdict(l, encode=True))',
+              lambda: json.dumps(asdict(ledger, encode=True)), number)
+
+
+if __name__ == '__main__':
+    main()
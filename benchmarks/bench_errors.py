@@ -0,0 +1,56 @@
+"""Time rejecting a big, badly broken payload, with and without max_errors.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_errors.py
+"""
+import timeit
+from typing import List
+
+from c11h.dataclassutils import dataclass, max_errors
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+    items: List[Item]
+    blob: List[int]
+
+
+PAYLOAD = {'id': 1, 'items': [{'sku': i} for i in range(2000)],
+           'blob': [str(i) * 50 for i in range(20000)]}
+
+
+def reject():
+    try:
+        Order(**PAYLOAD)
+    except NestedInitializationException as e:
+        return e
+    raise AssertionError("The payload should be rejected.")
+
+
+def reject_early():
+    with max_errors(10):
+        return reject()
+
+
+def bench(label, func):
+    seconds = min(timeit.repeat(func, number=1, repeat=3))
+    print(f"  {label:<28}{seconds * 1e3:>10.1f} ms")
+
+
+def main():
+    print("Payload with 22000 errors:")
+    bench('collect all errors', reject)
+    bench('render all messages', lambda: reject().messages())
+    bench('max_errors(10)', reject_early)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compare hashing and comparing deep frozen trees with and without caching.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_hash.py
+"""
+import timeit
+from typing import Optional
+
+from c11h.dataclassutils import dataclass
+
+
+@dataclass(nest=True, frozen=True)
+class Plain:
+    value: int
+    child: Optional['Plain']
+
+
+@dataclass(nest=True, frozen=True, cache_hash=True)
+class Cached:
+    value: int
+    child: Optional['Cached']
+
+
+def make_tree(cls, depth, leaf):
+    node = cls(value=leaf, child=None)
+    for i in range(depth - 1):
+        node = cls(value=i, child=node)
+    return node
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28}{seconds * 1e6:>10.2f} us")
+
+
+def main():
+    for depth in (10, 100):
+        print(f"Chain of {depth} instances:")
+        for cls in (Plain, Cached):
+            # Equal but for the deepest value.
+            a, b = make_tree(cls, depth, -3), make_tree(cls, depth, -4)
+            hash(a), hash(b)
+            bench(f'hash, {cls.__name__}', lambda: hash(a), 1000)
+            bench(f'a == b, {cls.__name__}', lambda: a == b, 1000)
+
+
+if __name__ == '__main__':
+    main()
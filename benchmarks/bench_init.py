@@ -0,0 +1,49 @@
+"""Compare the generated __init__ against the wrapped stdlib __init__.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_init.py
+"""
+import timeit
+from typing import List, Optional
+from unittest import mock
+
+from c11h.dataclassutils import dataclass, field
+from c11h.dataclassutils import re_wrap
+
+
+def make_classes():
+    @dataclass(nest=True, validate=True, ignore_additional_properties=True)
+    class Item:
+        sku: str
+        price: float
+        note: Optional[str]
+
+    @dataclass(nest=True, validate=True)
+    class Order:
+        id: int
+        items: List[Item]
+        tags: List[str] = field(optional=True, default_optional_value=[])
+    return Order
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28}{seconds * 1e6:>10.1f} us")
+
+
+def main():
+    generated = make_classes()
+    with mock.patch.object(re_wrap, 'can_generate_init', lambda cls: False):
+        wrapped = make_classes()
+    for n_items in (0, 10):
+        payload = {'id': 1, 'items': [{'sku': f'SKU-{i}', 'price': 1.0}
+                                      for i in range(n_items)]}
+        number = max(100, 5000 // (n_items + 1))
+        print(f"Order with {n_items} items:")
+        bench('wrapped __init__', lambda: wrapped(**payload), number)
+        bench('generated __init__', lambda: generated(**payload), number)
+
+
+if __name__ == '__main__':
+    main()
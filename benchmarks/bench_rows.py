@@ -0,0 +1,64 @@
+"""Compare astuples and from_rows against going through dicts.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_rows.py
+"""
+from enum import Enum
+import timeit
+from typing import Optional
+
+from c11h.dataclassutils import asdict, astuples, dataclass, from_rows
+
+
+class Color(Enum):
+    red = 'r'
+    blue = 'b'
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    price: float
+    amount: int
+    color: Color
+    note: Optional[str]
+
+
+COLUMNS = ['sku', 'price', 'amount', 'color', 'note']
+
+
+def via_asdict(items):
+    dicts = (asdict(item) for item in items)
+    return [tuple(d.get(c) for c in COLUMNS) for d in dicts]
+
+
+def via_kwargs(rows):
+    return [Item(**dict(zip(COLUMNS, row))) for row in rows]
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28}{seconds * 1e3:>10.2f} ms")
+
+
+def main():
+    for n_items in (100, 10000):
+        items = [Item(**{'sku': f'SKU-{i:06d}', 'price': i * 0.5,
+                         'amount': i, 'color': 'r' if i % 2 else 'b'})
+                 for i in range(n_items)]
+        assert via_asdict(items) == astuples(items, COLUMNS)
+        number = max(3, 10000 // n_items)
+        print(f"{n_items} items:")
+        bench('asdict + pick columns', lambda: via_asdict(items), number)
+        bench('astuples', lambda: astuples(items), number)
+        rows = astuples(items)
+        assert via_kwargs(rows) == from_rows(Item, rows, COLUMNS)
+        bench('Item(**dict(zip(...)))', lambda: via_kwargs(rows), number)
+        bench('from_rows', lambda: from_rows(Item, rows, COLUMNS), number)
+        bench('from_rows, validate=False',
+              lambda: from_rows(Item, rows, COLUMNS, validate=False), number)
+
+
+if __name__ == '__main__':
+    main()
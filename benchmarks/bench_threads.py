@@ -0,0 +1,64 @@
+"""Measure construction throughput from many threads.
+
+On regular CPython builds the GIL serializes the threads, on free-threaded
+builds (python3.13t and later) they may run in parallel. Run with either:
+
+    dataclassutils$ python benchmarks/bench_threads.py
+    dataclassutils$ python3.13t -X gil=0 benchmarks/bench_threads.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import time
+from typing import List, Optional
+
+from c11h.dataclassutils import dataclass
+from c11h.dataclassutils.binary import dumps, loads
+
+N_INSTANCES = 4000
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    price: float
+    note: Optional[str]
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+    items: List[Item]
+
+
+PAYLOAD = {'id': 1, 'items': [{'sku': f'SKU-{i}', 'price': 1.0}
+                              for i in range(5)]}
+
+
+def work(n):
+    for _ in range(n):
+        loads(Order, dumps(Order(**PAYLOAD)))
+
+
+def throughput(n_threads):
+    per_thread = N_INSTANCES // n_threads
+    with ThreadPoolExecutor(n_threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(work, [per_thread] * n_threads))
+        seconds = time.perf_counter() - start
+    return per_thread * n_threads / seconds
+
+
+def main():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+    print(f"Python {sys.version.split()[0]}, "
+          f"GIL {'enabled' if is_gil_enabled() else 'disabled'}")
+    work(10)  # fill the caches
+    base = throughput(1)
+    for n_threads in (1, 2, 4, 8):
+        rate = throughput(n_threads)
+        print(f"  {n_threads} threads{rate:>12.0f} instances/s"
+              f"{rate / base:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
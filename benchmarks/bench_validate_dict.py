@@ -0,0 +1,58 @@
+"""Compare validate_dict against initializing and discarding the instance.
+
+Run with:
+
+    dataclassutils$ python benchmarks/bench_validate_dict.py
+"""
+from enum import Enum
+import timeit
+from typing import List, Optional
+
+from c11h.dataclassutils import dataclass, validate_dict
+
+
+class Color(Enum):
+    red = 'r'
+    blue = 'b'
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    price: float
+    amount: int
+    color: Color
+    note: Optional[str]
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+    customer: str
+    items: List[Item]
+
+
+def make_payload(n_items):
+    return {'id': 12345, 'customer': 'pepe the frog',
+            'items': [{'sku': f'SKU-{i:06d}', 'price': i * 0.5, 'amount': i,
+                       'color': 'r' if i % 2 else 'b'}
+                      for i in range(n_items)]}
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28}{seconds * 1e6:>10.1f} us")
+
+
+def main():
+    for n_items in (1, 10, 100):
+        payload = make_payload(n_items)
+        number = max(10, 2000 // n_items)
+        print(f"Order with {n_items} items:")
+        bench('Order(**payload)', lambda: Order(**payload), number)
+        bench('validate_dict(Order, payload)',
+              lambda: validate_dict(Order, payload), number)
+
+
+if __name__ == '__main__':
+    main()
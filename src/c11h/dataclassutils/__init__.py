@@ -1,4 +1,14 @@
+from .async_validation import acreate
+from .diff import diff, patch
+from .evolve import evolve
+from .iterative import asdict_deep, build_deep
 from .nesting import asdict
+from .projection import from_dict
+from .raw_validation import validate_dict
 from .re_wrap import dataclass, field
+from .rows import astuples, from_rows, iter_rows
+from .validation import max_errors
 
-__all__ = ['asdict', 'dataclass', 'field']
+__all__ = ['acreate', 'asdict', 'asdict_deep', 'astuples', 'build_deep',
+           'dataclass', 'diff', 'evolve', 'field', 'from_dict', 'from_rows',
+           'iter_rows', 'max_errors', 'patch', 'validate_dict']
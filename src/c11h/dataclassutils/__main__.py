@@ -1,4 +1,6 @@
 """Main Module call code."""
+import importlib
+import json
 from logging import getLogger
 import sys
 
@@ -29,5 +31,46 @@ def version():
     print(VERSION)
 
 
+@main.command('memory-report')
+@click.argument('sample', type=click.Path(exists=True, dir_okay=False))
+@click.option('--cls', 'class_path', required=True,
+              help="dataclass to load the sample with, as 'module:Class'.")
+@click.option('--number', default=10, show_default=True,
+              help="Initializations to trace for the allocations by phase.")
+def memory_report(sample, class_path, number):
+    """Print the memory held by instances loaded from a JSON sample file.
+
+    The sample holds the keyword arguments of one instance, or a list of
+    them.
+    """
+    from c11h.dataclassutils.accounting import (
+        construction_phases, deep_size, instance_counts)
+    module_name, _, class_name = class_path.partition(':')
+    cls = getattr(importlib.import_module(module_name), class_name)
+    with open(sample) as f:
+        data = json.load(f)
+    records = data if isinstance(data, list) else [data]
+    instances = [cls(**record) for record in records]
+
+    report = deep_size(instances)
+    print(f"{len(instances)} {class_name} instances hold "
+          f"{report['bytes']} bytes:")
+    print(f"  {'class':<32}{'instances':>10}{'bytes':>12}")
+    for c, entry in sorted(report['classes'].items(),
+                           key=lambda item: -item[1]['bytes']):
+        print(f"  {c.__qualname__:<32}{entry['instances']:>10}"
+              f"{entry['bytes']:>12}")
+    print(f"Allocations of {number} initializations by phase:")
+    for phase, size in construction_phases(cls, records[0], number).items():
+        print(f"  {phase:<32}{size:>22}")
+    counts = instance_counts()
+    if counts:
+        print("Instances of classes with accounting:")
+        print(f"  {'class':<32}{'created':>10}{'live':>12}")
+        for c, entry in counts.items():
+            print(f"  {c.__qualname__:<32}{entry['created']:>10}"
+                  f"{entry['live']:>12}")
+
+
 if __name__ == '__main__':
     main(prog_name='dataclassutils')
@@ -0,0 +1,176 @@
+"""Memory accounting of dataclass instances.
+
+- Classes decorated with account=True count their instances as they get
+  created and finalized, see instance_counts.
+- deep_size measures the memory held by a graph of instances.
+- construction_phases attributes the memory allocated while initializing
+  instances to the phases of the initialization, using tracemalloc.
+"""
+from dataclasses import _is_dataclass_instance, fields  # type: ignore
+from enum import Enum
+import sys
+import threading
+import tracemalloc
+import typing as ty
+
+# Reentrant, since a __del__ may be run by the garbage collector while the
+# lock is held by the same thread.
+_LOCK = threading.RLock()
+_created: ty.Dict[type, int] = {}
+_finalized: ty.Dict[type, int] = {}
+
+# Innermost file of an allocation's traceback -> phase it belongs to.
+_PHASE_FILES = (
+    ('copy', ('copy.py',)),
+    ('nest', ('nesting.py',)),
+    ('validate', ('validation.py',)),
+    ('init', ('<string>', 'codegen.py', 're_wrap.py')),
+)
+
+
+def _count(counters, cls):
+    with _LOCK:
+        counters[cls] = counters.get(cls, 0) + 1
+
+
+def enable_accounting(cls):
+    """Make a class count its instances.
+
+    Instances are counted when they are allocated, which includes copies
+    and instances created without __init__, and again when they are
+    finalized. Subclasses are counted on their own.
+
+    Args:
+        cls: Class to count the instances of, it gets mutated.
+
+    """
+    base_new = cls.__new__
+    if getattr(base_new, 'accounting', False):
+        return  # inherited, it counts by the actual class already
+    base_del = getattr(cls, '__del__', None)
+
+    def __new__(klass, *args, **kwargs):
+        if base_new is object.__new__:
+            obj = object.__new__(klass)
+        else:
+            obj = base_new(klass, *args, **kwargs)
+        _count(_created, klass)
+        return obj
+
+    def __del__(self):
+        _count(_finalized, type(self))
+        if base_del is not None:
+            base_del(self)
+    __new__.accounting = True  # type: ignore
+    cls.__new__ = staticmethod(__new__)
+    cls.__del__ = __del__
+
+
+def instance_counts() -> ty.Dict[type, ty.Dict[str, int]]:
+    """Return the instance counters of all classes with accounting.
+
+    Returns:
+        Dict mapping each class to the number of its instances which have
+        been created, and which are still alive.
+
+    """
+    with _LOCK:
+        return {cls: {'created': created,
+                      'live': created - _finalized.get(cls, 0)}
+                for cls, created in _created.items()}
+
+
+def _children(value):
+    if _is_dataclass_instance(value):
+        return [getattr(value, f.name) for f in fields(value)]
+    if isinstance(value, dict):
+        return [*value.keys(), *value.values()]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return value
+    return ()
+
+
+def deep_size(obj) -> ty.Dict:
+    """Measure the memory held by a graph of dataclass instances.
+
+    Each object is counted once, no matter how many instances share it.
+    Its size is attributed to the class of the closest instance owning it,
+    None, booleans and enum members are shared by everyone and not counted.
+
+    Args:
+        obj: dataclass instance, or a container of them.
+
+    Returns:
+        Dict with the total size in bytes under 'bytes', and under
+        'classes' a dict mapping each class to the number of its instances
+        and the bytes they hold.
+
+    """
+    seen: set = set()
+    classes: dict = {}
+    total = 0
+    stack = [(obj, None)]
+    while stack:
+        value, owner = stack.pop()
+        if (id(value) in seen or value is None or
+                isinstance(value, (bool, Enum))):
+            continue
+        seen.add(id(value))
+        size = sys.getsizeof(value)
+        if _is_dataclass_instance(value):
+            owner = type(value)
+            classes.setdefault(owner, {'instances': 0, 'bytes': 0})
+            classes[owner]['instances'] += 1
+            if hasattr(value, '__dict__'):
+                seen.add(id(value.__dict__))
+                size += sys.getsizeof(value.__dict__)
+        if owner is not None:
+            classes[owner]['bytes'] += size
+        total += size
+        stack.extend((child, owner) for child in _children(value))
+    return {'bytes': total, 'classes': classes}
+
+
+def _phase(traceback):
+    for frame in reversed(traceback):  # the most recent frame is last
+        for phase, files in _PHASE_FILES:
+            if frame.filename.endswith(files):
+                return phase
+    return 'other'
+
+
+def construction_phases(cls, data: ty.Dict, number: int = 1) -> ty.Dict:
+    """Attribute the memory allocated by initializations to their phases.
+
+    The instances are initialized with tracemalloc tracing, and each
+    allocation that is still alive afterwards is attributed to a phase by
+    the innermost frame of its traceback: copying the input, nesting,
+    validation, the rest of the __init__, or other (e.g. a __post_init__).
+
+    Args:
+        cls: dataclass to initialize.
+        data: Keyword arguments for the class.
+        number: How many instances to initialize.
+
+    Returns:
+        Dict mapping each phase to the number of bytes allocated in it.
+
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start(50)
+    try:
+        before = tracemalloc.take_snapshot()
+        # Kept alive until the second snapshot, so they show up in it.
+        instances = [cls(**data) for _ in range(number)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    phases = dict.fromkeys([phase for phase, _ in _PHASE_FILES], 0)
+    phases['other'] = 0
+    for stat in after.compare_to(before, 'traceback'):
+        if stat.size_diff > 0:
+            phases[_phase(stat.traceback)] += stat.size_diff
+    del instances
+    return phases
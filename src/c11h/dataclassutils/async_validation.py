@@ -0,0 +1,209 @@
+import asyncio
+from dataclasses import _is_dataclass_instance, fields  # type: ignore
+import typing as ty
+
+from c11h.dataclassutils.nesting import may_nest
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+_NONE_TYPE = type(None)
+# Defaults for acreate, they can be overridden per call.
+MAX_CONCURRENCY = 100
+TIMEOUT: ty.Optional[float] = None
+
+
+def _collect_async_validations(value, path, jobs):
+    """Gather the async validators to run on an instance tree.
+
+    Args:
+        value: Field value to look for dataclass instances in.
+        path: Tuple of keys which lead to the value, as used in the errors
+            of NestedInitializationException.
+        jobs: List the (path, validator, value) triples get appended to.
+
+    """
+    if _is_dataclass_instance(value):
+        params = value.__dataclass_params__
+        checkers = getattr(value, '__dataclass_checkers__', {})
+        validate = getattr(params, 'validate', False)
+        for name, checker in checkers.items():
+            field_value = getattr(value, name)
+            if validate and not checker.is_unset(field_value):
+                for validator in checker.async_validators:
+                    jobs.append((path + (name,), validator, field_value))
+            _collect_async_validations(field_value, path + (name,), jobs)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for idx, item in enumerate(value):
+            _collect_async_validations(item, path + (idx,), jobs)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _collect_async_validations(item, path + (key,), jobs)
+
+
+def _collect_raw_validations(cls, data, path, errors, jobs):
+    """Gather the async validators to run on input which failed to build.
+
+    Only values which are not changed by nesting, and have no errors of the
+    regular initialization, are validated. See _collect_async_validations.
+    """
+    if not isinstance(data, dict):
+        return
+    params = cls.__dataclass_params__
+    validate = getattr(params, 'validate', False)
+    nest = getattr(params, 'nest', False)
+    for name, checker in getattr(cls, '__dataclass_checkers__', {}).items():
+        error = _error_at(errors, path + (name,))
+        if name not in data or (error is not None and
+                                not isinstance(error, dict)):
+            continue
+        value = data[name]
+        if (validate and error is None and not may_nest(checker.type) and
+                not checker.is_unset(value)):
+            for validator in checker.async_validators:
+                jobs.append((path + (name,), validator, value))
+        if nest:
+            _collect_raw_value(checker.type, value, path + (name,), errors,
+                               jobs)
+
+
+def _collect_raw_value(anno, value, path, errors, jobs):
+    if getattr(getattr(anno, '__dataclass_params__', None), 'nest', False):
+        _collect_raw_validations(anno, value, path, errors, jobs)
+        return
+    origin = getattr(anno, '__origin__', None)
+    args = getattr(anno, '__args__', ())
+    if origin is ty.Union:
+        arms = [a for a in args if a is not _NONE_TYPE]
+        if len(arms) == 1:  # which arm a value is meant for is unclear
+            _collect_raw_value(arms[0], value, path, errors, jobs)
+    elif origin is list and isinstance(value, list):
+        for idx, item in enumerate(value):
+            _collect_raw_value(args[0], item, path + (idx,), errors, jobs)
+    elif origin is dict and isinstance(value, dict):
+        for key, item in value.items():
+            _collect_raw_value(args[1], item, path + (key,), errors, jobs)
+
+
+def _error_at(errors: ty.Dict, path):
+    """Return the errors at a path, or the error of a parent, or None."""
+    for key in path:
+        if not isinstance(errors, dict):
+            return errors
+        if key not in errors:
+            return None
+        errors = errors[key]
+    return errors
+
+
+def _set_error(errors: ty.Dict, path, msg):
+    """Put an error under its path, nested errors win over whole ones.
+
+    Like in the regular initialization, where the validators of a field
+    only run once its value has been nested, the error of a field is
+    replaced by the errors of its nested values.
+    """
+    *parents, last = path
+    for key in parents:
+        if not isinstance(errors.get(key), dict):
+            errors[key] = {}
+        errors = errors[key]
+    if not isinstance(errors.get(last), dict):
+        errors[last] = msg
+
+
+def _merge_errors(into: ty.Dict, errors: ty.Dict):
+    """Add errors to the ones of the regular initialization, which win."""
+    for key, error in errors.items():
+        current = into.get(key)
+        if current is None:
+            into[key] = error
+        elif isinstance(current, dict) and isinstance(error, dict):
+            _merge_errors(current, error)
+
+
+async def _run_validations(jobs, max_concurrency, timeout) -> ty.Dict:
+    """Run validation jobs concurrently and gather their errors by path."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(validator, value):
+        async with semaphore:
+            try:
+                await asyncio.wait_for(validator(value), timeout)
+            except AttributeError as e:
+                return str(e)
+            except asyncio.TimeoutError:
+                name = getattr(validator, '__name__', repr(validator))
+                return (f"The validator '{name}' did not finish within "
+                        f"{timeout} seconds.")
+        return None
+
+    results = await asyncio.gather(*(run(validator, value)
+                                     for _, validator, value in jobs))
+    errors: dict = {}
+    for (path, _, _), msg in zip(jobs, results):
+        if msg is not None:
+            _set_error(errors, path, msg)
+    return errors
+
+
+async def acreate(cls, *args, max_concurrency: int = None,
+                  timeout: float = None, **kwargs):
+    """Initialize a dataclass and run its coroutine validators.
+
+    Coroutine functions given as field validators are skipped by the regular
+    initialization. Here, the instance is initialized as usual first, then
+    the coroutine validators of all instances in the whole nested tree are
+    run concurrently. Just like regular validators, they signal an invalid
+    value by raising an AttributeError. If the regular initialization
+    failed, the coroutine validators still run on the values without errors
+    which don't need to be nested, and all errors are raised together.
+
+    Example usage:
+
+      async def known_sku(sku):
+          if not await registry.exists(sku):
+              raise AttributeError(f"Unknown SKU {sku}.")
+
+      @dataclass(nest=True, validate=True)
+      class Item:
+          sku: str = field(validators=known_sku)
+
+      item = await acreate(Item, **{'sku': 'A-1'})
+
+    Args:
+        cls: dataclass to initialize.
+        *args: Positional arguments for the class.
+        max_concurrency: Maximum number of validators running at the same
+            time, defaults to MAX_CONCURRENCY.
+        timeout: Seconds each validator may take before its value is
+            considered invalid, defaults to TIMEOUT.
+        **kwargs: Keyword arguments for the class.
+
+    Raises:
+        NestedInitializationException: If the regular initialization or any
+            of the coroutine validators failed, with the errors of both.
+            Errors of the validators are gathered under the path of their
+            field.
+
+    Returns:
+        The new instance.
+
+    """
+    jobs: list = []
+    try:
+        obj = cls(*args, **kwargs)
+    except NestedInitializationException as e:
+        obj, errors = None, e.errors
+        data = dict(zip((f.name for f in fields(cls) if f.init), args))
+        data.update(kwargs)
+        _collect_raw_validations(cls, data, (), errors, jobs)
+    else:
+        errors = {}
+        _collect_async_validations(obj, (), jobs)
+    if jobs:
+        _merge_errors(errors, await _run_validations(
+            jobs,
+            MAX_CONCURRENCY if max_concurrency is None else max_concurrency,
+            TIMEOUT if timeout is None else timeout))
+    if errors:
+        raise NestedInitializationException(errors)
+    return obj
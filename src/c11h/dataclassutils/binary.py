@@ -0,0 +1,445 @@
+"""Compact binary serialization driven by the field annotations.
+
+Since both sides know the class, nothing but the values is written: fields
+are stored in declaration order, scalars are packed with struct, enums as
+their ordinal, and lists, dicts, strings and bytes are prefixed with their
+length. Optional fields holding their default_optional_value are marked in a
+bitmap in front of each instance and not written at all.
+
+Supported annotations are bool, int (64 bit signed), float, str, bytes,
+Enums, dataclasses, List[X], Tuple[X, ...], Tuple[A, B], Set[X],
+FrozenSet[X], Dict[K, V], Optional[X] and Unions of non-generic types.
+"""
+import copy
+from dataclasses import fields, is_dataclass
+from enum import Enum
+import struct
+import typing as ty
+
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import new_instance
+from c11h.dataclassutils.util.plan_cache import PlanCache
+
+_BOOL = struct.Struct('<?')
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_SIZE = struct.Struct('<I')
+_TAG = struct.Struct('<B')
+
+_NONE_TYPE = type(None)
+# Raised by encoders for values which don't fit their annotation.
+_VALUE_ERRORS = (struct.error, TypeError, ValueError, KeyError,
+                 AttributeError, OverflowError)
+
+
+class _UnsupportedType(TypeError):
+    """An annotation which can't be encoded, found while encoding."""
+
+
+class _FieldError(ValueError):
+    """A value which can't be encoded, with the path of its field."""
+
+    def __init__(self, name, value, cause):
+        super().__init__(cause)
+        self.path = [name]
+        self.value = value
+        self.cause = cause
+
+
+def _scalar_codec(packer):
+    size = packer.size
+    pack = packer.pack
+    unpack_from = packer.unpack_from
+
+    def encode(value, out):
+        out += pack(value)
+
+    def decode(buf, pos):
+        return unpack_from(buf, pos)[0], pos + size
+    return encode, decode
+
+
+def _bytes_codec(to_bytes, from_bytes):
+    def encode(value, out):
+        data = to_bytes(value)
+        out += _SIZE.pack(len(data))
+        out += data
+
+    def decode(buf, pos):
+        size, = _SIZE.unpack_from(buf, pos)
+        pos += _SIZE.size
+        end = pos + size
+        if end > len(buf):
+            raise ValueError("The data is truncated.")
+        return from_bytes(buf[pos:end]), end
+    return encode, decode
+
+
+def _enum_codec(enum_type):
+    members = list(enum_type)
+    ordinals = {member: i for i, member in enumerate(members)}
+
+    def encode(value, out):
+        out += _SIZE.pack(ordinals[value])
+
+    def decode(buf, pos):
+        ordinal, = _SIZE.unpack_from(buf, pos)
+        return members[ordinal], pos + _SIZE.size
+    return encode, decode
+
+
+def _list_codec(item_type, container=list):
+    encode_item, decode_item = _codec(item_type)
+
+    def encode(value, out):
+        out += _SIZE.pack(len(value))
+        for item in value:
+            encode_item(item, out)
+
+    def decode(buf, pos):
+        size, = _SIZE.unpack_from(buf, pos)
+        pos += _SIZE.size
+        result = []
+        for _ in range(size):
+            item, pos = decode_item(buf, pos)
+            result.append(item)
+        if container is not list:
+            return container(result), pos
+        return result, pos
+    return encode, decode
+
+
+def _tuple_codec(item_types):
+    codecs = [_codec(t) for t in item_types]
+
+    def encode(value, out):
+        if len(value) != len(codecs):
+            raise ValueError(f"'{value}' does not have {len(codecs)} items.")
+        for (encode_item, _), item in zip(codecs, value):
+            encode_item(item, out)
+
+    def decode(buf, pos):
+        result = []
+        for _, decode_item in codecs:
+            item, pos = decode_item(buf, pos)
+            result.append(item)
+        return tuple(result), pos
+    return encode, decode
+
+
+def _dict_codec(key_type, value_type):
+    encode_key, decode_key = _codec(key_type)
+    encode_value, decode_value = _codec(value_type)
+
+    def encode(value, out):
+        out += _SIZE.pack(len(value))
+        for k, v in value.items():
+            encode_key(k, out)
+            encode_value(v, out)
+
+    def decode(buf, pos):
+        size, = _SIZE.unpack_from(buf, pos)
+        pos += _SIZE.size
+        result = {}
+        for _ in range(size):
+            k, pos = decode_key(buf, pos)
+            result[k], pos = decode_value(buf, pos)
+        return result, pos
+    return encode, decode
+
+
+def _optional_codec(item_type):
+    encode_item, decode_item = _codec(item_type)
+
+    def encode(value, out):
+        if value is None:
+            out += _BOOL.pack(False)
+        else:
+            out += _BOOL.pack(True)
+            encode_item(value, out)
+
+    def decode(buf, pos):
+        present, = _BOOL.unpack_from(buf, pos)
+        pos += _BOOL.size
+        if not present:
+            return None, pos
+        return decode_item(buf, pos)
+    return encode, decode
+
+
+def _union_codec(types):
+    for t in types:
+        if not isinstance(t, type):
+            raise TypeError(f"Unions of generic types like '{t}' can not be "
+                            f"encoded.")
+    codecs = [_codec(t) for t in types]
+
+    def encode(value, out):
+        # Exact matches first, else a bool would be encoded as int.
+        for tag, t in enumerate(types):
+            if type(value) is t:
+                break
+        else:
+            for tag, t in enumerate(types):
+                if isinstance(value, t):
+                    break
+            else:
+                raise TypeError(f"'{value}' does not match any of {types}.")
+        out += _TAG.pack(tag)
+        codecs[tag][0](value, out)
+
+    def decode(buf, pos):
+        tag, = _TAG.unpack_from(buf, pos)
+        return codecs[tag][1](buf, pos + _TAG.size)
+    return encode, decode
+
+
+def _dataclass_codec(cls):
+    # The plan of the class itself is looked up on first use, this way
+    # compiling it does not depend on the order the classes get used in.
+    def encode(value, out):
+        try:
+            encode_obj = _class_plan(cls)[0]
+        except TypeError as e:
+            raise _UnsupportedType(str(e)) from e
+        encode_obj(value, out)
+
+    def decode(buf, pos):
+        return _class_plan(cls)[1](buf, pos)
+    return encode, decode
+
+
+def _without_none(args):
+    """Return the type of a Union of the given types other than None."""
+    args = tuple(a for a in args if a is not _NONE_TYPE)
+    return args[0] if len(args) == 1 else ty.Union[args]
+
+
+def _compile_codec(t):  # noqa: C901
+    if t is bool:
+        return _scalar_codec(_BOOL)
+    if t is int:
+        return _scalar_codec(_INT)
+    if t is float:
+        return _scalar_codec(_FLOAT)
+    if t is str:
+        return _bytes_codec(str.encode, lambda b: b.decode())
+    if t is bytes:
+        return _bytes_codec(bytes, bytes)
+    if isinstance(t, type) and issubclass(t, Enum):
+        return _enum_codec(t)
+    if is_dataclass(t):
+        return _dataclass_codec(t)
+    origin = getattr(t, '__origin__', None)
+    args = getattr(t, '__args__', ())
+    if origin is list and repr(args[0]) != '~T':
+        return _list_codec(args[0])
+    if origin is dict and repr(args[1]) != '~T':
+        return _dict_codec(*args)
+    if origin in (set, frozenset) and not isinstance(args[0], ty.TypeVar):
+        return _list_codec(args[0], origin)
+    if origin is tuple and args:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return _list_codec(args[0], tuple)
+        return _tuple_codec(() if args == ((),) else args)
+    if origin is ty.Union:
+        if _NONE_TYPE in args:
+            return _optional_codec(_without_none(args))
+        return _union_codec(args)
+    raise TypeError(f"Type '{t}' can not be encoded.")
+
+
+# encoder: (value, out: bytearray) -> None
+# decoder: (buf: bytes, pos: int) -> (value, pos)
+_codecs = PlanCache(_compile_codec)
+
+
+def _codec(t):
+    return _codecs[t]
+
+
+def _field_type(f):
+    """Return the type the value of a field is encoded with.
+
+    Optional fields holding None are taken care of by the bitmap of their
+    instance, so Optional[X] does not need its own presence flag for them.
+    """
+    t = f.type
+    if (getattr(f, 'optional', False) and f.default_optional_value is None and
+            getattr(t, '__origin__', None) is ty.Union and
+            _NONE_TYPE in t.__args__):
+        return _without_none(t.__args__)
+    return t
+
+
+def _holds_dataclass(t):
+    """Check if values of a type may contain dataclass instances."""
+    if is_dataclass(t):
+        return True
+    return any(_holds_dataclass(a) for a in getattr(t, '__args__', ()))
+
+
+def _class_encoder(plan, optional, bitmap_size):
+    def encode(obj, out):
+        bitmap = 0
+        for bit, (name, default) in enumerate(optional):
+            if getattr(obj, name) == default:
+                bitmap |= 1 << bit
+        out += bitmap.to_bytes(bitmap_size, 'little')
+        for name, bit, encode_value, _ in plan:
+            if bit is None or not bitmap >> bit & 1:
+                value = getattr(obj, name)
+                try:
+                    encode_value(value, out)
+                except (_UnsupportedType, _FieldError) as e:
+                    if isinstance(e, _FieldError):
+                        e.path.insert(0, name)
+                    raise
+                except _VALUE_ERRORS as e:
+                    raise _FieldError(name, value, e) from e
+    return encode
+
+
+def _class_decoder(cls, plan, optional, bitmap_size):
+    def decode(buf, pos):
+        end = pos + bitmap_size
+        if end > len(buf):
+            raise ValueError("The data is truncated.")
+        bitmap = int.from_bytes(buf[pos:end], 'little')
+        pos = end
+        values = {}
+        for name, bit, _, decode_value in plan:
+            if bit is not None and bitmap >> bit & 1:
+                values[name] = copy.deepcopy(optional[bit][1])
+            else:
+                values[name], pos = decode_value(buf, pos)
+        return new_instance(cls, values), pos
+    return decode
+
+
+def _compile_class_plan(cls):
+    plan = []
+    optional = []
+    nested = []
+    for f in fields(cls):
+        t = _field_type(f)
+        encode_value, decode_value = _codec(t)
+        bit = None
+        if getattr(f, 'optional', False):
+            bit = len(optional)
+            optional.append((f.name, f.default_optional_value))
+        plan.append((f.name, bit, encode_value, decode_value))
+        if _holds_dataclass(t):
+            nested.append(f.name)
+    bitmap_size = (len(optional) + 7) // 8
+    return (_class_encoder(plan, optional, bitmap_size),
+            _class_decoder(cls, plan, optional, bitmap_size),
+            nested)
+
+
+_plans = PlanCache(_compile_class_plan)
+
+
+def _class_plan(cls):
+    return _plans[cls]
+
+
+def _validate_value(value):
+    if is_dataclass(value):
+        return _validate_tree(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = enumerate(value)
+    elif isinstance(value, dict):
+        items = value.items()  # type: ignore
+    else:
+        return None
+    errors = {}
+    for k, v in items:
+        item_errors = _validate_value(v)
+        if item_errors:
+            errors[k] = item_errors
+    return errors
+
+
+def _validate_tree(obj):
+    """Run the __post_init__ of decoded instances, bottom-up.
+
+    This is the same order regular nested initialization uses, and errors
+    of nested instances get gathered under their path in the same way.
+    """
+    errors = {}
+    for name in _class_plan(type(obj))[2]:
+        field_errors = _validate_value(getattr(obj, name))
+        if field_errors:
+            errors[name] = field_errors
+    if not errors and hasattr(obj, '__post_init__'):
+        try:
+            obj.__post_init__()
+        except NestedInitializationException as e:
+            errors.update(e.errors)
+    return errors
+
+
+def dumps(obj) -> bytes:
+    """Serialize a dataclass instance into the compact binary format.
+
+    Args:
+        obj: dataclass instance, all its annotations must be supported.
+
+    Raises:
+        TypeError: If the class holds annotations which can not be encoded.
+        ValueError: If a value does not fit its annotation.
+
+    Returns:
+        The serialized instance.
+
+    """
+    if not is_dataclass(obj) or isinstance(obj, type):
+        raise TypeError("dumps() should be called on dataclass instances")
+    out = bytearray()
+    try:
+        _class_plan(type(obj))[0](obj, out)
+    except _FieldError as e:
+        raise ValueError(f"The value '{e.value}' of the field "
+                         f"'{'.'.join(map(str, e.path))}' of "
+                         f"{type(obj).__name__} can not be encoded: "
+                         f"{e.cause}") from e.cause
+    except (struct.error, KeyError, AttributeError) as e:
+        raise ValueError(f"{obj} can not be encoded: {e}")
+    return bytes(out)
+
+
+def loads(cls, data: bytes, *, validate=True):
+    """Deserialize an instance of a dataclass from the binary format.
+
+    Instances are created directly, without running __init__ and therefore
+    without copying any value.
+
+    Args:
+        cls: dataclass the data has been serialized from.
+        data: Output of dumps.
+        validate: If set, the __post_init__ of each instance is run, which
+            validates it according to the flags of its class. Turn it off
+            for trusted input, instances are then restored like unpickled
+            ones.
+
+    Raises:
+        ValueError: If the data is malformed.
+        NestedInitializationException: If validate is set and a decoded
+            instance is invalid.
+
+    Returns:
+        The deserialized instance.
+
+    """
+    try:
+        obj, pos = _class_plan(cls)[1](data, 0)
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"The data is malformed: {e}")
+    if pos != len(data):
+        raise ValueError(f"The data has {len(data) - pos} trailing bytes.")
+    if validate:
+        errors = _validate_tree(obj)
+        if errors:
+            raise NestedInitializationException(errors)
+    return obj
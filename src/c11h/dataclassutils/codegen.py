@@ -0,0 +1,215 @@
+"""Generation of a specialized __init__ for each decorated class.
+
+The generated __init__ does in a single call what the stdlib __init__ and
+our wrappers around it would do otherwise: it fills in optional defaults,
+drops unknown keyword arguments if additional properties are ignored,
+copies the given values, sets the fields, and runs the nesting, the
+validation and the user's __post_init__.
+"""
+import copy
+from dataclasses import _FIELD_INITVAR, fields, MISSING  # type: ignore
+from enum import Enum
+
+from c11h.dataclassutils.coercion import convert_fields
+from c11h.dataclassutils.nesting import nest_dc, take_error_collector
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import user_post_init
+from c11h.dataclassutils.validation import (
+    error_limit_reached, validate_fields, validate_types)
+
+# Values which deepcopy returns as they are, no need to copy them.
+_ATOMIC_TYPES = (type(None), bool, int, float, complex, str, bytes, Enum)
+
+
+class _Marker:
+    """Default of parameters, telling how a value that is not given is got.
+
+    Markers survive deepcopy, so they can be copied along with the given
+    values.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+_REQUIRED = _Marker('REQUIRED')
+_FACTORY = _Marker('FACTORY')
+_OPTIONAL = _Marker('OPTIONAL')
+
+
+def can_generate_init(cls) -> bool:
+    """Check if the __init__ of a decorated class can be generated.
+
+    Classes with InitVars keep the stdlib __init__, since our __post_init__
+    does not take them.
+    """
+    return not any(f._field_type is _FIELD_INITVAR
+                   for f in cls.__dataclass_fields__.values())
+
+
+def _init_param(f, globs):
+    """Return the parameter of a field, and the line filling its default."""
+    name = f.name
+    if getattr(f, 'optional', False) and f.default is MISSING:
+        default = f.default_optional_value
+        globs[f'_opt_{name}'] = default
+        if isinstance(default, _ATOMIC_TYPES):
+            fill = f'_opt_{name}'
+        else:
+            fill = f'_deepcopy(_opt_{name})'
+        return (f'{name}=_OPTIONAL',
+                f'  if {name} is _OPTIONAL: {name} = {fill}')
+    if f.default is not MISSING:
+        globs[f'_dflt_{name}'] = f.default
+        return f'{name}=_dflt_{name}', None
+    if f.default_factory is not MISSING:  # type: ignore
+        globs[f'_dflt_{name}'] = f.default_factory  # type: ignore
+        return (f'{name}=_FACTORY',
+                f'  if {name} is _FACTORY: {name} = _dflt_{name}()')
+    return (f'{name}=_REQUIRED',
+            f'  if {name} is _REQUIRED: raise TypeError("__init__() '
+            f'missing required argument: \'{name}\'")')
+
+
+def _field_value(f, globs):
+    """Return the expression a field is set to, None if it is not set."""
+    if f.init:
+        return f.name
+    if f.default is not MISSING:
+        globs[f'_dflt_{f.name}'] = f.default
+        return f'_dflt_{f.name}'
+    if f.default_factory is not MISSING:  # type: ignore
+        globs[f'_dflt_{f.name}'] = f.default_factory  # type: ignore
+        return f'_dflt_{f.name}()'
+    return None
+
+
+def _collector_lines(validate, nest, coerce):
+    """Return the line taking the error collector, see nesting.
+
+    It comes before any default_factory runs, so that instances created in
+    those don't take it.
+    """
+    if validate or nest or coerce:
+        return ['  _collector = _take_error_collector(self)']
+    return []
+
+
+def _post_init_lines(validate, nest, coerce, post_init):
+    """Return the inlined body of _pre_post_init and the __post_init__."""
+    lines = []
+    if validate:
+        # A nested instance gathers its errors right in the dict of its
+        # parent, see _collector_lines.
+        lines.append('  _errors = {} if _collector is None else _collector')
+    elif nest or coerce:
+        lines.append('  _errors = {}')
+    if nest:
+        lines.append('  _nest_dc(self, _errors)')  # converts values as well
+    elif coerce:
+        lines.append('  _convert_fields(self, _errors)')
+    if validate:
+        lines += ['  _validate_types(self, _errors)',
+                  '  _validate_fields(self, _errors)',
+                  # Instances started after max_errors was reached are
+                  # not validated, they are not valid either.
+                  '  if _errors or _error_limit_reached():',
+                  '    if _collector is None:',
+                  '      raise _NestedInitializationException(_errors)',
+                  '    return']
+    # Subclasses which are not decorated themselves may override it.
+    if post_init is not None:
+        lines += ['  if type(self) is _cls: _post_init(self)',
+                  '  else: _user_post_init(type(self))(self)']
+    else:
+        lines.append('  if type(self) is not _cls: '
+                     '_user_post_init(type(self))(self)')
+    return lines
+
+
+def make_init(cls, validate, nest, ignore_additional_properties, post_init,
+              coerce=False):
+    """Generate the __init__ of a decorated class.
+
+    Args:
+        cls: dataclass, after the stdlib decorator and the optional field
+            post-processing ran.
+        validate: validate flag of the class.
+        nest: nest flag of the class.
+        ignore_additional_properties: Whether unknown keyword arguments get
+            dropped.
+        post_init: The __post_init__ of the user, or None.
+        coerce: Whether given values get converted, by the coerce flag or
+            converters of fields.
+
+    Returns:
+        The __init__ function.
+
+    """
+    globs = {
+        '_cls': cls,
+        '_deepcopy': copy.deepcopy,
+        '_object_setattr': object.__setattr__,
+        '_REQUIRED': _REQUIRED,
+        '_FACTORY': _FACTORY,
+        '_OPTIONAL': _OPTIONAL,
+        '_take_error_collector': take_error_collector,
+        '_nest_dc': nest_dc,
+        '_convert_fields': convert_fields,
+        '_validate_types': validate_types,
+        '_validate_fields': validate_fields,
+        '_error_limit_reached': error_limit_reached,
+        '_NestedInitializationException': NestedInitializationException,
+        '_post_init': post_init,
+        '_user_post_init': user_post_init,
+    }
+    frozen = cls.__dataclass_params__.frozen
+    params = ['self']
+    check_lines = []
+    fill_lines = []
+    set_lines = []
+    given = []
+    for f in fields(cls):
+        if f.init:
+            param, line = _init_param(f, globs)
+            params.append(param)
+            given.append(f.name)
+            if line is None:
+                pass
+            elif param.endswith('_REQUIRED'):
+                check_lines.append(line)
+            else:
+                fill_lines.append(line)
+        value = _field_value(f, globs)
+        if value is None:
+            continue
+        if frozen:
+            set_lines.append(f'  _object_setattr(self, {f.name!r}, {value})')
+        else:
+            set_lines.append(f'  self.{f.name} = {value}')
+    if ignore_additional_properties:
+        params.append('**_extra')
+    lines = [f'def __init__({", ".join(params)}):']
+    lines += check_lines
+    lines += _collector_lines(validate, nest, coerce)
+    if given:
+        # A single deepcopy, so references between the values are kept.
+        names = ''.join(f'{name}, ' for name in given)
+        lines.append(f'  {names}= _deepcopy(({names}))')
+    lines += fill_lines
+    lines += set_lines
+    lines += _post_init_lines(validate, nest, coerce, post_init)
+    namespace: dict = {}
+    exec('\n'.join(lines), globs, namespace)
+    __init__ = namespace['__init__']
+    __init__.__qualname__ = f'{cls.__qualname__}.__init__'
+    return __init__
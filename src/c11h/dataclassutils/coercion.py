@@ -0,0 +1,188 @@
+"""Conversion of given field values, e.g. numbers or dates sent as strings.
+
+The converter of each field is resolved once per class, from the converter
+given to its field or, for classes with the coerce flag, from its
+annotation. Converters run before the nesting and the validation, which
+then see the converted values.
+"""
+from dataclasses import fields
+from datetime import date, datetime
+from decimal import Decimal
+import typing as ty
+from uuid import UUID
+
+from c11h.dataclassutils.util.exceptions import _short, ErrorRecord
+
+_NONE_TYPE = type(None)
+# Raised by converters for values they can't convert.
+CONVERSION_ERRORS = (ValueError, TypeError, ArithmeticError)
+
+_TRUE = {'true', '1', 'yes', 'on'}
+_FALSE = {'false', '0', 'no', 'off'}
+
+
+def _to_int(value):
+    return int(value) if isinstance(value, str) else value
+
+
+def _to_float(value):
+    if isinstance(value, str) or (isinstance(value, int) and
+                                  not isinstance(value, bool)):
+        return float(value)
+    return value
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError(f"'{value}' is not a boolean")
+    if type(value) is int and value in (0, 1):
+        return bool(value)
+    return value
+
+
+def _to_decimal(value):
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        return Decimal(value)
+    if isinstance(value, float):
+        return Decimal(str(value))  # the value as it was written
+    return value
+
+
+def _to_uuid(value):
+    return UUID(value) if isinstance(value, str) else value
+
+
+def _to_datetime(value):
+    if isinstance(value, str):
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'  # not understood by fromisoformat
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _to_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+# Annotation -> conversion of the coerce flag. Values which don't need to
+# be converted, or can't be, are returned as they are and left to the
+# validation.
+COERCIONS: ty.Dict[ty.Any, ty.Callable] = {
+    int: _to_int,
+    float: _to_float,
+    bool: _to_bool,
+    Decimal: _to_decimal,
+    UUID: _to_uuid,
+    datetime: _to_datetime,
+    date: _to_date,
+}
+
+
+def _coercion(anno) -> ty.Optional[ty.Callable]:
+    """Resolve the conversion of an annotation, None if there is none."""
+    if anno in COERCIONS:
+        return COERCIONS[anno]
+    origin = getattr(anno, '__origin__', None)
+    if origin is ty.Union:
+        args = [a for a in anno.__args__ if a is not _NONE_TYPE]
+        if len(args) != 1:
+            return None  # which arm a value is meant for is unclear
+        return _coercion(args[0])
+    if origin is list:
+        item = _coercion(anno.__args__[0])
+        if item is None:
+            return None
+        return lambda value: ([item(v) for v in value]
+                              if isinstance(value, list) else value)
+    if origin is dict:
+        item = _coercion(anno.__args__[1])
+        if item is None:
+            return None
+        return lambda value: ({k: item(v) for k, v in value.items()}
+                              if isinstance(value, dict) else value)
+    return None
+
+
+def _skip_unset(converter, f):
+    """Leave optional fields which are not given alone."""
+    if not getattr(f, 'optional', False):
+        return converter
+    unset = f.default_optional_value
+
+    def convert(value):
+        if value is None or value == unset:
+            return value
+        return converter(value)
+    return convert
+
+
+def compile_converters(cls, coerce: bool,
+                       cls_fields=None) -> ty.Dict[str, ty.Callable]:
+    """Resolve the converter of each field of a dataclass.
+
+    Args:
+        cls: dataclass
+        coerce: coerce flag of the class.
+        cls_fields: Fields to resolve the converters of, instead of the ones
+            of the class, e.g. with resolved annotations.
+
+    Returns:
+        Dict mapping the names of the fields which get converted to their
+        converter.
+
+    """
+    converters = {}
+    for f in (fields(cls) if cls_fields is None else cls_fields):
+        if not f.init:
+            continue  # its value is not given
+        converter = getattr(f, 'converter', None)
+        if converter is None and coerce:
+            converter = _coercion(f.type)
+        if converter is not None:
+            converters[f.name] = _skip_unset(converter, f)
+    return converters
+
+
+def convert_value(name, value, converter, anno, nest_errors: ty.Dict):
+    """Convert a single value, putting its error under name on failure.
+
+    Returns:
+        The converted value, or the given one if it can't be converted.
+
+    """
+    try:
+        return converter(value)
+    except CONVERSION_ERRORS as e:
+        record_conversion_error(name, value, anno, e, nest_errors)
+        return value
+
+
+def record_conversion_error(name, value, anno, error, nest_errors: ty.Dict):
+    """Put the error of a value which could not be converted under name."""
+    nest_errors[name] = ErrorRecord(anno, value, (
+        f"'{_short(value)}' could not be converted to '{anno}': {error}"))
+
+
+def convert_fields(obj, nest_errors: ty.Dict):
+    """Convert the field values of an instance which nests nothing.
+
+    Classes with the nest flag convert their values in nesting.nest_dc.
+
+    Args:
+        obj: dataclass instance, its values get replaced.
+        nest_errors: Dict used to gather errors.
+
+    """
+    converters = getattr(obj, '__dataclass_converters__', None)
+    if not converters:
+        return
+    values = obj.__dict__
+    dc_fields = obj.__dataclass_fields__
+    for name, converter in converters.items():
+        values[name] = convert_value(name, values[name], converter,
+                                     dc_fields[name].type, nest_errors)
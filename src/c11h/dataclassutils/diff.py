@@ -0,0 +1,115 @@
+import copy
+from dataclasses import _is_dataclass_instance, fields  # type: ignore
+import typing as ty
+
+from c11h.dataclassutils.evolve import evolve
+from c11h.dataclassutils.nesting import _asdict_inner
+
+
+def _is_omitted(f, value):
+    """Check if a value would be left out of the serialization by asdict."""
+    return getattr(f, 'optional', False) and value == f.default_optional_value
+
+
+def _diff_inner(a, b, prefix, changes, removals):
+    for f in fields(a):
+        if not f.init:
+            continue  # can't be patched, they are derived in __post_init__
+        a_value = getattr(a, f.name)
+        b_value = getattr(b, f.name)
+        # Shared subtrees are equal by definition, don't walk them.
+        if a_value is b_value:
+            continue
+        path = prefix + f.name
+        if _is_omitted(f, b_value):
+            if not _is_omitted(f, a_value):
+                removals.append(path)
+        elif _is_omitted(f, a_value):
+            changes[path] = _asdict_inner(b_value, dict)
+        elif (_is_dataclass_instance(a_value) and
+              type(a_value) is type(b_value)):
+            _diff_inner(a_value, b_value, path + '.', changes, removals)
+        elif a_value != b_value:
+            changes[path] = _asdict_inner(b_value, dict)
+
+
+def diff(a, b) -> ty.Dict:
+    """Compute the changes which turn one dataclass instance into another.
+
+    Nested dataclass instances are compared field by field, all other values
+    are compared as a whole. Values are given as they would appear in the
+    output of asdict, so optional fields that are reset to their
+    default_optional_value show up as removed instead of changed.
+
+    Example usage:
+
+      @dataclass(nest=True, validate=True)
+      class C:
+          x: int
+          y: Optional[int]
+
+      delta = diff(C(1, 2), C(3, None))
+      assert delta == {'set': {'x': 3}, 'unset': ['y']}
+
+    Args:
+        a: dataclass instance to start from.
+        b: dataclass instance of the same class to end at.
+
+    Returns:
+        Dict with the dotted paths of changed values and their new value
+        under 'set', and the dotted paths of removed optional values under
+        'unset'. Both keys are left out if empty, so equal instances give an
+        empty dict.
+
+    """
+    if not _is_dataclass_instance(a) or type(a) is not type(b):
+        raise TypeError("diff() should be called on two dataclass instances "
+                        "of the same class")
+    changes: dict = {}
+    removals: list = []
+    _diff_inner(a, b, '', changes, removals)
+    delta: dict = {}
+    if changes:
+        delta['set'] = changes
+    if removals:
+        delta['unset'] = removals
+    return delta
+
+
+def _field_by_path(obj, path):
+    """Return the field object a dotted path points to."""
+    *parents, name = path.split('.')
+    for parent in parents:
+        obj = getattr(obj, parent)
+    try:
+        return obj.__dataclass_fields__[name]
+    except (AttributeError, KeyError):
+        raise TypeError(f"The path '{path}' does not lead to a field.")
+
+
+def patch(obj, delta: ty.Dict):
+    """Apply a delta as computed by diff to a dataclass instance.
+
+    Only the touched fields get nested and validated, the rest of the
+    instance is shared with the given one, see evolve. Changed values of
+    nested dataclasses or enums are only turned back into objects if the
+    owning class is set to nest=True.
+
+    Args:
+        obj: dataclass instance to apply the delta to, it does not get
+            mutated.
+        delta: Changes as returned by diff.
+
+    Raises:
+        NestedInitializationException: If the patched values are invalid.
+
+    Returns:
+        The patched instance.
+
+    """
+    changes = dict(delta.get('set', {}))
+    for path in delta.get('unset', ()):
+        f = _field_by_path(obj, path)
+        changes[path] = copy.deepcopy(getattr(f, 'default_optional_value',
+                                              None))
+    return evolve(obj, **changes)
@@ -0,0 +1,83 @@
+"""Encoding of leaf values for asdict(encode=True), e.g. for JSON output.
+
+Values of types which JSON has no notion of, like datetime, Decimal, UUID or
+bytes, are encoded to strings while the instance is deserialized, instead of
+in a second pass with a json.dumps(default=...) hook. The encoder of a type
+is looked up along its MRO once and cached, so subclasses, e.g. of
+datetime, use the encoder of their base unless they have one of their own.
+"""
+import base64
+import copy
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+import typing as ty
+from uuid import UUID
+
+from c11h.dataclassutils.util.plan_cache import PlanCache
+
+
+def _iso(value):
+    return value.isoformat()
+
+
+def _base64(value):
+    return base64.b64encode(value).decode('ascii')
+
+
+# Type -> function encoding its instances, see register_encoder.
+ENCODERS: ty.Dict[type, ty.Callable] = {
+    datetime: _iso,
+    date: _iso,
+    time: _iso,
+    timedelta: timedelta.total_seconds,
+    Decimal: str,
+    UUID: str,
+    bytes: _base64,
+    bytearray: _base64,
+}
+
+
+def _resolve(tp) -> ty.Optional[ty.Callable]:
+    for base in tp.__mro__:
+        if base in ENCODERS:
+            return ENCODERS[base]
+    return None
+
+
+# Type of a value -> its encoder, or None if it has none.
+_encoders = PlanCache(_resolve)
+
+
+def register_encoder(tp: type, encoder: ty.Callable):
+    """Set the encoder of a type, replacing a built-in one.
+
+    Example usage:
+
+      register_encoder(Decimal, float)
+      assert asdict(Price(Decimal('1.5')), encode=True) == {'amount': 1.5}
+
+    Args:
+        tp: Type whose instances, and those of its subclasses, get encoded.
+        encoder: Called with an instance, returns its encoding.
+
+    """
+    ENCODERS[tp] = encoder
+    _encoders.clear()
+
+
+def copy_leaf(value):
+    """Deserialize a value which is no dataclass instance or container."""
+    if isinstance(value, Enum):
+        return copy.deepcopy(value.value)
+    return copy.deepcopy(value)
+
+
+def encode_leaf(value):
+    """Like copy_leaf, but encode the value if its type has an encoder."""
+    if isinstance(value, Enum):
+        value = value.value
+    encoder = _encoders[type(value)]
+    if encoder is None:
+        return copy.deepcopy(value)
+    return encoder(value)
@@ -0,0 +1,112 @@
+from dataclasses import _FIELD, _is_dataclass_instance  # type: ignore
+import typing as ty
+
+from c11h.dataclassutils.re_wrap import _prepare_field, HASH_ATTR
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import user_post_init
+
+
+def _split_changes(changes: ty.Dict):
+    """Split changes into direct field changes and changes by nested path."""
+    direct: dict = {}
+    nested: dict = {}
+    for path, value in changes.items():
+        name, _, rest = path.partition('.')
+        if rest:
+            nested.setdefault(name, {})[rest] = value
+        else:
+            direct[name] = value
+    for name in nested:
+        if name in direct:
+            raise ValueError(f"The field '{name}' can not be changed as a "
+                             f"whole and by path at the same time.")
+    return direct, nested
+
+
+def _check_field_names(obj, names):
+    """Make sure that all names refer to fields which can be initialized."""
+    for name in names:
+        f = obj.__dataclass_fields__.get(name)
+        if f is None or f._field_type is not _FIELD:
+            raise TypeError(f"{type(obj).__name__} has no field called "
+                            f"'{name}'.")
+        if not f.init:
+            raise ValueError(f"The field '{name}' is declared with "
+                             f"init=False, it can not be changed.")
+
+
+def evolve(obj, **changes):
+    """Create a copy of a dataclass instance with some fields changed.
+
+    In contrast to dataclasses.replace, the __init__ is not called again.
+    Unchanged field values are shared with the given instance as they are,
+    and only the changed fields get nested and validated, according to the
+    flags of the class. The __post_init__ of the class is called on the new
+    instance, just like it would be during a regular initialization.
+
+    Example usage:
+
+      @dataclass(nest=True, validate=True)
+      class Address:
+          city: str
+
+      @dataclass(nest=True, validate=True, frozen=True)
+      class Person:
+          name: str
+          address: Address
+
+      p = Person(**{'name': 'a', 'address': {'city': 'b'}})
+      q = evolve(p, **{'address.city': 'c'})
+      assert q.name is p.name
+
+    Args:
+        obj: dataclass instance which will be used as template, it does not
+            get mutated.
+        **changes: New field values. Keys may be dotted paths to change a
+            field of a nested dataclass instance.
+
+    Raises:
+        TypeError: If a change does not refer to a field.
+        ValueError: If a change refers to a field with init=False.
+        NestedInitializationException: If the changed values are invalid.
+
+    Returns:
+        The new instance.
+
+    """
+    if not _is_dataclass_instance(obj):
+        raise TypeError("evolve() should be called on dataclass instances")
+    cls = type(obj)
+    direct, nested = _split_changes(changes)
+    _check_field_names(obj, (*direct, *nested))
+
+    nest_errors: dict = {}
+    values = {}
+    for name, sub_changes in nested.items():
+        try:
+            values[name] = evolve(getattr(obj, name), **sub_changes)
+        except NestedInitializationException as e:
+            nest_errors[name] = e.errors
+    # Regular dataclasses have neither checkers nor our custom flags.
+    extended = hasattr(cls, '__dataclass_checkers__')
+    nest = extended and cls.__dataclass_params__.nest
+    for name, value in direct.items():
+        if extended:
+            value = _prepare_field(obj, name, value, nest, nest_errors)
+        values[name] = value
+    # Failed nested changes can't be applied, whatever the flags of cls.
+    nested_failed = any(name in nest_errors for name in nested)
+    if nest_errors and (nested_failed or (
+            extended and cls.__dataclass_params__.validate)):
+        raise NestedInitializationException(nest_errors)
+
+    new = cls.__new__(cls)
+    new.__dict__.update(obj.__dict__)
+    new.__dict__.update(values)
+    # The cached hash of obj, if any, does not hold for the new instance.
+    new.__dict__.pop(HASH_ATTR, None)
+    # Our wrapper would validate the whole instance again, skip it.
+    post_init = user_post_init(cls)
+    if post_init is not None:
+        post_init(new)
+    return new
@@ -2,14 +2,35 @@ from dataclasses import _FIELD, Field  # type: ignore
 from typing import Union
 
 
+class _ExcludedType:
+    """Type of the value of fields which have been left out on purpose."""
+
+    def __repr__(self):
+        return 'EXCLUDED'
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+# Value of fields which have not been built, see projection.from_dict.
+EXCLUDED = _ExcludedType()
+
+
 class ExtendedField(Field):
     __slots__ = ('optional',
                  'default_optional_value',
-                 'validators'
+                 'validators',
+                 'batch',
+                 'cache',
+                 'converter'
                  )
 
     def __init__(self, default, default_factory, init, repr, hash, compare,
-                 metadata, optional, default_optional_value, validators):
+                 metadata, optional, default_optional_value, validators,
+                 batch=False, cache=None, converter=None):
         """Extension of dataclass object 'Field'.
 
         This class adds and extend python core dataclass field in order to
@@ -19,6 +40,9 @@ class ExtendedField(Field):
         self.optional = optional
         self.default_optional_value = default_optional_value
         self.validators = validators
+        self.batch = batch
+        self.cache = cache
+        self.converter = converter
         super().__init__(default, default_factory, init, repr, hash, compare,
                          metadata)
 
@@ -69,7 +93,12 @@ def optional_fields_postprocessing(cls):
                                            f.compare, f.metadata,
                                            optional=True,
                                            default_optional_value=None,
-                                           validators=None)
+                                           validators=getattr(
+                                               f, 'validators', None),
+                                           batch=getattr(f, 'batch', False),
+                                           cache=getattr(f, 'cache', None),
+                                           converter=getattr(f, 'converter',
+                                                             None))
             # Keep the name, type of the field and the real field identifier.
             extended_field.name = k
             extended_field._field_type = _FIELD
@@ -0,0 +1,131 @@
+"""Specialization of generic dataclasses, e.g. Page[Item] for a Page[T].
+
+Subscripting a decorated generic dataclass with concrete types returns a
+subclass of it whose fields are annotated with the TypeVars replaced. The
+subclass is a dataclass of its own, so nesting, validation and all plans
+which are cached per class, e.g. of the binary codec, work on the concrete
+types. Each specialization is created once and cached. Its instances
+pickle by the generic class and the concrete types, and compare equal to
+instances of the generic class with the same fields.
+"""
+import copy
+from dataclasses import _FIELD  # type: ignore
+import typing as ty
+
+from c11h.dataclassutils.coercion import compile_converters
+from c11h.dataclassutils.util.plan_cache import PlanCache
+from c11h.dataclassutils.validation import compile_checkers
+
+_generic_getitem = ty.Generic.__dict__['__class_getitem__'].__func__
+
+
+def _has_typevars(anno) -> bool:
+    if isinstance(anno, ty.TypeVar):
+        return True
+    return isinstance(anno, ty._GenericAlias) and bool(anno.__parameters__)
+
+
+def _substitute(anno, mapping):
+    """Replace the TypeVars of an annotation by the types they map to."""
+    if isinstance(anno, ty.TypeVar):
+        return mapping.get(anno, anno)
+    if not _has_typevars(anno):
+        return anno
+    origin = anno.__origin__
+    # Item by item, so generic dataclasses in e.g. List[Page[T]] get
+    # specialized as well.
+    args = tuple(_substitute(a, mapping) for a in anno.__args__)
+    getitem = getattr(origin, '__class_getitem__', None)
+    if getattr(getitem, '__func__', None) is _class_getitem:
+        return origin[args]
+    if origin is ty.Union:
+        return ty.Union[args]
+    return anno.copy_with(args)
+
+
+def _type_name(anno) -> str:
+    return anno.__qualname__ if isinstance(anno, type) else repr(anno)
+
+
+def _new_specialized(key):
+    """Create an uninitialized instance of a specialization, for pickle."""
+    spec = _specializations[key]
+    return spec.__new__(spec)
+
+
+def _reduce_wrapper(key):
+    """Pickle instances by their generic class and concrete types.
+
+    The qualified name of a specialization, e.g. Page[Item], can't be looked
+    up in its module, so its instances are recreated by specializing again.
+    """
+    def __reduce__(self):
+        getstate = getattr(self, '__getstate__', None)
+        state = self.__dict__ if getstate is None else getstate()
+        return _new_specialized, (key,), state
+    return __reduce__
+
+
+def _eq_wrapper(cls, spec):
+    """Compare instances of a specialization with those of its generic."""
+    __eq__ = cls.__eq__
+    names = [f.name for f in cls.__dataclass_fields__.values()
+             if f._field_type is _FIELD and f.compare]
+
+    def wrapper(self, other):
+        if (self.__class__ is not other.__class__ and
+                {self.__class__, other.__class__} == {cls, spec}):
+            return (tuple(getattr(self, n) for n in names) ==
+                    tuple(getattr(other, n) for n in names))
+        return __eq__(self, other)
+    return wrapper
+
+
+def _specialize(key):
+    cls, args = key
+    mapping = dict(zip(cls.__parameters__, args))
+    suffix = f'[{", ".join(_type_name(a) for a in args)}]'
+    spec = type(cls)(cls.__name__ + suffix, (cls,), {
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__ + suffix,
+        '__doc__': cls.__doc__,
+        '__reduce__': _reduce_wrapper(key),
+    })
+    if cls.__dataclass_params__.eq:
+        spec.__eq__ = _eq_wrapper(cls, spec)
+    spec_fields = {}
+    for name, f in cls.__dataclass_fields__.items():
+        f = copy.copy(f)
+        f.type = _substitute(f.type, mapping)
+        spec_fields[name] = f
+    spec.__dataclass_fields__ = spec_fields
+    spec.__dataclass_checkers__ = compile_checkers(spec)
+    spec.__dataclass_converters__ = compile_converters(
+        spec, getattr(cls.__dataclass_params__, 'coerce', False))
+    return spec
+
+
+# (generic dataclass, concrete types) -> specialized dataclass
+_specializations = PlanCache(_specialize)
+
+
+def _class_getitem(cls, params):
+    if not isinstance(params, tuple):
+        params = (params,)
+    parameters = getattr(cls, '__parameters__', ())
+    if (not parameters or len(params) != len(parameters) or
+            any(_has_typevars(p) for p in params)):
+        # Still generic, e.g. Page[T] in the fields of another generic.
+        return _generic_getitem(cls, params)
+    return _specializations[(cls, params)]
+
+
+def enable_specialization(cls):
+    """Make a generic dataclass specialize itself when subscripted.
+
+    Args:
+        cls: Decorated dataclass, it gets mutated if it is generic.
+
+    """
+    if getattr(cls, '__parameters__', ()):
+        cls.__class_getitem__ = classmethod(_class_getitem)
@@ -0,0 +1,383 @@
+"""Nesting, validation and asdict of deep, e.g. self-referencing, models.
+
+The regular initialization nests by calling the nested classes, which nest
+their own fields in turn, and asdict recurses into every value, so each
+level of a tree costs several Python frames and deep trees run into the
+recursion limit. The functions here walk the input with an explicit stack
+instead, which only holds the chain of instances from the root to the one
+being built, so the depth is limited by memory alone.
+
+Example usage:
+
+  @dataclass(nest=True, validate=True)
+  class Comment:
+      text: str
+      replies: List['Comment']
+
+  thread = build_deep(Comment, {'text': 'a', 'replies': [...]})
+  assert asdict_deep(thread) == asdict(thread)
+"""
+import copy
+from dataclasses import _is_dataclass_instance, fields  # type: ignore
+import typing as ty
+
+from c11h.dataclassutils.coercion import compile_converters, convert_value
+from c11h.dataclassutils.encoding import copy_leaf, encode_leaf
+from c11h.dataclassutils.field import EXCLUDED
+from c11h.dataclassutils.nesting import DICT_TYPES, nest_field
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import (default_getter,
+                                                       forward_ref_hints,
+                                                       new_instance,
+                                                       user_post_init)
+from c11h.dataclassutils.util.plan_cache import PlanCache
+from c11h.dataclassutils.validation import (compile_checkers,
+                                            error_limit_reached,
+                                            reset_error_budget)
+
+_NONE_TYPE = type(None)
+# How a field of a _DeepPlan gets its value.
+_NESTED = 'nested'
+_LIST = 'list'
+_DICT = 'dict'
+_VALUE = 'value'
+
+
+def _resolved_fields(cls):
+    """Return the fields of a class with their forward references resolved.
+
+    Forward references which could not be resolved when the class was
+    decorated, e.g. to classes defined after it, are resolved on copies of
+    the fields, so the class itself is left as it is.
+
+    Raises:
+        NameError: If a name can't be resolved.
+
+    Returns:
+        List of the fields, or None if there is nothing to resolve.
+
+    """
+    hints = forward_ref_hints(cls)
+    if not hints:
+        return None
+    resolved = []
+    for f in fields(cls):
+        if f.name in hints:
+            f = copy.copy(f)
+            f.type = hints[f.name]
+        resolved.append(f)
+    return resolved
+
+
+def _nestable(anno):
+    params = getattr(anno, '__dataclass_params__', None)
+    return isinstance(anno, type) and getattr(params, 'nest', False)
+
+
+def _field_kind(anno):
+    """Return how a field is walked, and the class of its instances."""
+    if _nestable(anno):
+        return _NESTED, anno
+    origin = getattr(anno, '__origin__', None)
+    if origin is ty.Union:
+        args = [a for a in anno.__args__ if a is not _NONE_TYPE]
+        if len(args) == 1 and _nestable(args[0]):
+            return _NESTED, args[0]  # Optional, None is kept as it is
+    elif isinstance(anno, ty._GenericAlias):
+        name = anno._name
+        if name == ty.List._name and _nestable(anno.__args__[0]):
+            return _LIST, anno.__args__[0]
+        if name in DICT_TYPES and _nestable(anno.__args__[1]):
+            return _DICT, anno.__args__[1]
+    return _VALUE, None
+
+
+class _DeepPlan:
+    """How instances of a class are built by build_deep.
+
+    Fields holding instances of nestable dataclasses, directly, in a list
+    or as dict values, are built on the explicit stack. Values of all other
+    fields are nested like by the regular initialization.
+    """
+
+    __slots__ = ('cls', 'fields', 'defaults', 'nest', 'validate', 'strict',
+                 'checkers', 'converters', 'post_init')
+
+    def __init__(self, cls):
+        self.cls = cls
+        params = cls.__dataclass_params__
+        self.nest = getattr(params, 'nest', False)
+        self.validate = getattr(params, 'validate', False)
+        self.strict = not getattr(params, 'ignore_additional_properties',
+                                  False)
+        cls_fields = _resolved_fields(cls)
+        if cls_fields is None:
+            cls_fields = fields(cls)
+            self.checkers = getattr(cls, '__dataclass_checkers__', {})
+            self.converters = getattr(cls, '__dataclass_converters__', {})
+        else:
+            # The checks and conversions of the resolved types.
+            self.checkers = compile_checkers(cls, cls_fields)
+            self.converters = compile_converters(
+                cls, getattr(params, 'coerce', False), cls_fields)
+        self.post_init = user_post_init(cls)
+        self.fields = []
+        self.defaults = []
+        for f in cls_fields:
+            if not f.init:
+                self.defaults.append((f.name, default_getter(f)))
+                continue
+            kind, target = _field_kind(f.type) if self.nest else (_VALUE,
+                                                                  None)
+            self.fields.append((f, kind, target, default_getter(f)))
+
+    def check_names(self, data):
+        if self.strict:
+            unknown = data.keys() - self.cls.__dataclass_fields__.keys()
+            if unknown:
+                raise TypeError(f"{self.cls.__name__} got unexpected fields "
+                                f"{sorted(unknown)}.")
+
+
+# dataclass -> _DeepPlan
+_plans = PlanCache(_DeepPlan)
+
+
+class _Frame:
+    """An instance which is being built, with the children it waits for.
+
+    Errors of a child end up under its field, and under its position or key
+    for the items of lists and dicts. Built children replace the dict they
+    are built from in the values of the frame.
+    """
+
+    __slots__ = ('plan', 'values', 'errors', 'children', 'slot')
+
+    def __init__(self, plan, data, slot):
+        """Take the values of an instance from its input.
+
+        Args:
+            plan: _DeepPlan of the class.
+            data: Dict of the keyword arguments of the instance.
+            slot: Tuple of the container and key the instance is put in,
+                and the errors and key its errors are put under.
+
+        """
+        self.plan = plan
+        self.slot = slot
+        self.values: dict = {}
+        self.errors: dict = {}
+        self.children: list = []
+        plan.check_names(data)
+        for f, kind, target, default in plan.fields:
+            if f.name in data:
+                self._take(f, kind, target, data[f.name])
+            elif default is not None:
+                self.values[f.name] = default()
+            else:
+                raise TypeError(f"{plan.cls.__name__} is missing the "
+                                f"required field '{f.name}'.")
+        for name, default in plan.defaults:
+            if default is not None:
+                self.values[name] = default()
+        self.children.reverse()  # popped in the order of the input
+
+    def _take(self, f, kind, target, value):
+        name = f.name
+        converter = self.plan.converters.get(name)
+        if converter is not None:
+            value = convert_value(name, value, converter, f.type,
+                                  self.errors)
+        if kind is _NESTED and isinstance(value, dict):
+            # The dict is kept if the child fails, see finish.
+            self.children.append((target, value, (self.values, name,
+                                                  self.errors, name)))
+        elif kind is _LIST and isinstance(value, list):
+            value = self._take_items(name, target, list(value),
+                                     enumerate(value))
+        elif kind is _DICT and isinstance(value, dict):
+            value = self._take_items(name, target, dict(value),
+                                     value.items())
+        elif kind is _VALUE and name not in self.errors:
+            value = copy.deepcopy(value)
+            if self.plan.nest:
+                self.values[name] = value
+                nest_field(self.values, name, f.type, self.errors)
+                return
+        self.values[name] = value
+
+    def _take_items(self, name, target, container, items):
+        item_errors: dict = {}
+        count = len(self.children)
+        for key, item in items:
+            if isinstance(item, dict):
+                self.children.append((target, item, (container, key,
+                                                     item_errors, key)))
+        if len(self.children) > count:
+            # Comes after the items, and puts their errors under the field.
+            self.children.append((None, None, (self.errors, name,
+                                               item_errors, None)))
+        return container
+
+    def finish(self):
+        """Validate and create the instance, once all children are built."""
+        plan = self.plan
+        values, errors = self.values, self.errors
+        if plan.validate:
+            checkers = plan.checkers
+            for name, value in values.items():
+                if name not in errors and name in checkers:
+                    checkers[name](value, errors)
+        else:
+            # Like cls(**data), invalid values are kept as they are given.
+            for name in errors.keys() & values.keys():
+                values[name] = copy.deepcopy(values[name])
+            errors.clear()
+        container, key, parent_errors, error_key = self.slot
+        if errors:
+            parent_errors[error_key] = errors
+            return
+        obj = new_instance(plan.cls, values)
+        if plan.post_init is not None:
+            plan.post_init(obj)
+        container[key] = obj
+
+
+def build_deep(cls, data: ty.Dict):
+    """Initialize a dataclass from nested dicts without recursing.
+
+    Behaves like cls(**data), but the nested instances are built on an
+    explicit stack, bottom-up, so e.g. trees of self-referencing
+    dataclasses can be any number of levels deep.
+
+    Notes:
+        - Nested instances in fields, lists and dict values of nestable
+          dataclasses are built on the stack, other fields are nested and
+          validated like by the regular initialization, e.g. enums.
+        - __post_init__ methods are run, children before their parents.
+        - Instances given instead of dicts are used as they are.
+        - Forward references to classes defined after cls are resolved for
+          build_deep only, the fields of the classes are not changed.
+
+    Args:
+        cls: dataclass to build.
+        data: Keyword arguments as they would be given to the class.
+
+    Raises:
+        TypeError: If a required field is missing, or unknown fields are
+            given and additional properties are not ignored, on any level.
+        NestedInitializationException: If the input is invalid, with the
+            errors cls(**data) would have.
+
+    Returns:
+        The new instance.
+
+    """
+    reset_error_budget()
+    result: dict = {}
+    errors: dict = {}
+    stack = [_Frame(_plans[cls], data, (result, None, errors, None))]
+    while stack:
+        frame = stack[-1]
+        if frame.children and error_limit_reached():
+            # see validation.max_errors, only the gathered errors are kept
+            frame.children = [c for c in frame.children if c[0] is None]
+        if not frame.children:
+            stack.pop().finish()
+            continue
+        target, child, slot = frame.children.pop()
+        if target is None:
+            # All items of a list or dict field are done.
+            parent_errors, name, item_errors, _ = slot
+            if item_errors:
+                parent_errors[name] = item_errors
+            continue
+        stack.append(_Frame(_plans[target], child, slot))
+    if errors:
+        raise NestedInitializationException(errors[None])
+    return result[None]
+
+
+def _expand(obj, leaf):
+    """Split a value into the keys and values of its children.
+
+    Returns:
+        Tuple of the keys, or None for sequences and sets, and a list of
+        the values, or None if the value has no children.
+
+    """
+    if _is_dataclass_instance(obj):
+        keys, values = [], []
+        for f in fields(obj):
+            value = getattr(obj, f.name)
+            # Optional fields with their default are not deserialized.
+            if (getattr(f, 'optional', False) and
+                    value == f.default_optional_value):
+                continue
+            if value is EXCLUDED:
+                continue  # not loaded, see projection.from_dict
+            keys.append(f.name)
+            values.append(value)
+        return keys, values
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return None, list(obj)
+    if isinstance(obj, dict):
+        return [leaf(k) for k in obj], list(obj.values())
+    return None, None
+
+
+def _collect(obj, keys, results, dict_factory):
+    """Build the deserialization of a value from the ones of its children."""
+    if _is_dataclass_instance(obj):
+        return dict_factory(zip(keys, results))
+    if isinstance(obj, dict):
+        return type(obj)(zip(keys, results))
+    try:
+        return type(obj)(results)
+    except TypeError:
+        # Deserialized dataclasses are unhashable.
+        return results
+
+
+def asdict_deep(obj, *, dict_factory=dict, encode: bool = False):
+    """Deserialize a dataclass instance without recursing.
+
+    Returns what nesting.asdict does, but walks the instance on an explicit
+    stack, so e.g. trees of self-referencing dataclasses can be any number
+    of levels deep.
+
+    Args:
+        obj: dataclass instance to be deserialized.
+        dict_factory: If given it will be used instead of built-in dict.
+        encode: Encode values which have an encoder, see nesting.asdict.
+
+    Raises:
+        TypeError: If obj is not a dataclass instance.
+
+    Returns:
+        Deserialized instance in the given dict_factory.
+
+    """
+    if not _is_dataclass_instance(obj):
+        raise TypeError("asdict_deep() should be called on dataclass "
+                        "instances")
+    leaf = encode_leaf if encode else copy_leaf
+    root: list = []
+    keys, values = _expand(obj, leaf)
+    # Frames of (value, keys of its children, iterator over the children,
+    # deserialized children, list to put its own deserialization in).
+    stack = [(obj, keys, iter(values), [], root)]
+    while stack:
+        value, keys, children, results, out = stack[-1]
+        for child in children:
+            child_keys, child_values = _expand(child, leaf)
+            if child_values is None:
+                results.append(leaf(child))
+                continue
+            stack.append((child, child_keys, iter(child_values), [],
+                          results))
+            break
+        else:
+            stack.pop()
+            out.append(_collect(value, keys, results, dict_factory))
+    return root[0]
@@ -1,24 +1,317 @@
 from collections.abc import Iterable
-import copy
+from contextvars import ContextVar
 from dataclasses import _is_dataclass_instance, fields  # type: ignore
 from enum import Enum
+from itertools import repeat
 from logging import getLogger
 import typing as ty
 
+from c11h.dataclassutils.coercion import (CONVERSION_ERRORS,
+                                          record_conversion_error)
+from c11h.dataclassutils.encoding import copy_leaf, encode_leaf
+from c11h.dataclassutils.field import EXCLUDED
 from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import path_tree
+from c11h.dataclassutils.util.plan_cache import PlanCache
+from c11h.dataclassutils.validation import (_spend_errors,
+                                            error_limit_reached,
+                                            reset_error_budget)
 
 log = getLogger(__name__)
 
-LIST_TYPES = {ty.Deque._name, ty.List._name, ty.Set._name,  # type: ignore
+LIST_TYPES = {ty.Deque._name, ty.List._name,  # type: ignore
               ty.Generator._name}  # type: ignore
 DICT_TYPES = {ty.Counter._name, ty.Dict._name,  # type: ignore
               ty.DefaultDict._name}  # type: ignore
 SET_TYPES = {ty.FrozenSet._name, ty.Set._name}  # type: ignore
 # no need to include NamedTuple here since it's not a _GenericAlias
 IMMUTABLE_TYPES = {ty.FrozenSet._name, ty.Tuple._name}  # type: ignore
+# containers which are built anew from their nested items
+COLLECTION_TYPES = SET_TYPES | IMMUTABLE_TYPES
 
+# Nested initializations gather their errors in a dict of the parent set
+# up in this, instead of raising (and catching) an exception on every level.
+# The dict becomes the node of the nested instance in the errors of the
+# parent, so no level copies the errors of the one below.
+_error_collector: ContextVar = ContextVar('error_collector', default=None)
+# Set in place of a taken collector, for the rest of the nested instance.
+_TAKEN = ('taken', None)
 
-def nest_dc(dc, nest_errors: ty.Dict):  # noqa: C901
+# Returned by _asdict_inner for instances below the maximum depth.
+_PRUNED = object()
+
+
+def take_error_collector(obj):
+    """Return the dict the errors of an initialization should be put in.
+
+    Only the instance the collector has been set up for gets it, and only
+    once, so that any other initialization going on in between (e.g. in a
+    default_factory or a __post_init__) keeps raising as usual. The error
+    budget of validation.max_errors is reset by the outermost
+    initialization only, the ones in between share it.
+
+    Args:
+        obj: dataclass instance being initialized.
+
+    Returns:
+        The dict the initialization gathers its errors in, or None if it
+        should use one of its own and raise.
+
+    """
+    collector = _error_collector.get()
+    if collector is None:
+        reset_error_budget()  # not within the nesting of another one
+        return None
+    if collector[0] is not type(obj):
+        return None
+    # _nest_instance restores the collector it replaced afterwards.
+    _error_collector.set(_TAKEN)
+    return collector[1]
+
+
+def _nest_instance(anno, kwargs):
+    """Initialize a nested dataclass without raising on invalid input.
+
+    Returns:
+        Tuple of the instance and the errors of its initialization, the
+        instance is only usable if there are none.
+
+    """
+    errors: dict = {}
+    token = _error_collector.set((anno, errors))
+    try:
+        obj = anno(**kwargs)
+    except NestedInitializationException as e:
+        return None, e.errors
+    finally:
+        _error_collector.reset(token)
+    return obj, errors
+
+
+def may_nest(anno):
+    """Check if nesting may change values of the given annotation.
+
+    Args:
+        anno: Type annotation of a value.
+
+    Returns:
+        True if nesting would turn a raw value of it into another object,
+        e.g. a dict into a dataclass or a list into a tuple.
+
+    """
+    if isinstance(anno, type) and issubclass(anno, Enum):
+        return True
+    if hasattr(anno, '__dataclass_params__'):
+        return True
+    if getattr(anno, '__origin__', None) in (tuple, set, frozenset):
+        return True
+    return any(may_nest(a) for a in getattr(anno, '__args__', ()))
+
+
+def _item_annotations(anno):
+    """Return the annotations of the items of a tuple or set annotation.
+
+    Args:
+        anno: Tuple, FrozenSet or Set annotation.
+
+    Returns:
+        None if the items are untyped, a tuple with one annotation per item
+        for fixed-length tuples, and an endless iterator otherwise.
+
+    """
+    args = anno.__args__
+    if not args or isinstance(args[0], ty.TypeVar):
+        return None
+    if anno.__origin__ is not tuple:
+        return repeat(args[0])
+    if len(args) == 2 and args[1] is Ellipsis:
+        return repeat(args[0])
+    if args == ((),):
+        return ()  # Tuple[()], the empty tuple
+    return args
+
+
+def _nest_items(items, types, container, errors):
+    """Yield the nested items of a tuple or set value.
+
+    Items which fail to nest, or which can't be put into a set, are left out
+    and their errors are put into errors under their position.
+    """
+    for pos, (item, t) in enumerate(zip(items, types)):
+        if errors and error_limit_reached():
+            return  # see validation.max_errors
+        slot = [item]
+        item_errors: dict = {}
+        _pack_nestables(slot, 0, t, item_errors)
+        if not item_errors and container is not tuple:
+            try:
+                hash(slot[0])
+            except TypeError as e:
+                item_errors[0] = str(e)
+                _spend_errors(1)
+        if item_errors:
+            errors[pos] = item_errors[0]
+        else:
+            yield slot[0]
+
+
+def _pack_collection(struct, ref, anno, nest_errors, idx=None):
+    """Nest the items of a tuple or a set.
+
+    These containers can't be changed in place, so a new one is built from
+    the nested items of whatever iterable was given, without any
+    intermediate list. If nesting any item fails, the value is left as it
+    is.
+
+    Args:
+        struct: Container which holds the value, it will get mutated.
+        ref: Key of the value in struct, or the field name if idx is given.
+        anno: Tuple, FrozenSet or Set annotation.
+        nest_errors: Dict used to gather errors.
+        idx: Position of the value in struct if it is a list element.
+
+    """
+    pos_ref = idx if idx is not None else ref
+    value = struct[pos_ref]
+    types = _item_annotations(anno)
+    if (types is None or not isinstance(value, Iterable) or
+            isinstance(value, (str, bytes, dict))):
+        return
+    # Fixed-length tuples of the wrong length are left to the validation.
+    if isinstance(types, tuple) and (not hasattr(value, '__len__') or
+                                     len(value) != len(types)):
+        return
+    errors: dict = {}
+    container = anno.__origin__
+    packed = container(_nest_items(value, types, container, errors))
+    if not errors:
+        struct[pos_ref] = packed
+    elif idx is not None:
+        nest_errors.setdefault(ref, {})[idx] = errors
+    else:
+        nest_errors[ref] = errors
+
+
+def _pack_nestables(struct, ref, anno, nest_errors, idx=None):  # noqa: C901
+    """Pack parameter dictionaries if they are annotated as nestable.
+
+    Args:
+        struct: Container which holds the value, it will get mutated.
+        ref: Key of the value in struct, or the field name if idx is given.
+        anno: Annotation of the value.
+        nest_errors: Dict used to gather errors.
+        idx: Position of the value in struct if it is a list element.
+
+    """
+    try:
+        nestable = anno.__dataclass_params__.nest
+    except AttributeError:
+        pass
+    else:
+        pos_ref = idx if idx is not None else ref
+        if nestable and isinstance(struct[pos_ref], dict):
+            obj, errors = _nest_instance(anno, struct[pos_ref])
+            if not errors:
+                struct[pos_ref] = obj
+            # To preserve the index in nested list initialization
+            # we need to check if we are given and index and if so,
+            # append the nested key.
+            elif idx is not None:
+                # Safe guard
+                if ref not in nest_errors:
+                    nest_errors[ref] = {}
+                nest_errors[ref][idx] = errors
+            else:
+                nest_errors[ref] = errors
+    # Instantiate Enums
+    if type(anno) is type(Enum):
+        try:
+            struct[ref] = anno(struct[ref])
+        except ValueError:
+            pass
+        finally:
+            return
+
+    # skip over builtins, 'ty.Any', and 'ty.NamedTuple' ...
+    if not isinstance(anno, ty._GenericAlias):
+        return
+    # ... which means that accessing '_name' is now safe to do
+    name = anno._name
+
+    # handle typed lists
+    if name in LIST_TYPES:
+        t = anno.__args__[0]
+        if repr(t) == '~T':
+            return  # untyped list, nothing to do
+        # If the given value to the list is not Iterable
+        # we can not instantiate it.
+        if not isinstance(struct[ref], Iterable):
+            return
+        for idx in range(len(struct[ref])):
+            _pack_nestables(struct[ref], ref, t, nest_errors, idx)
+            if nest_errors and error_limit_reached():
+                break  # see validation.max_errors
+        return
+
+    # handle typed dictionaries
+    if name in DICT_TYPES:
+        t = anno.__args__[1]
+        if repr(t) == '~T':
+            return  # untyped dict values, nothing to do
+        for key in struct[ref]:
+            _pack_nestables(struct[ref], key, t, nest_errors)
+            if nest_errors and error_limit_reached():
+                break  # see validation.max_errors
+        return
+
+    # handle typed tuples and sets
+    if name in COLLECTION_TYPES:
+        _pack_collection(struct, ref, anno, nest_errors, idx)
+        return
+
+    # log debug messages for fallthrough
+    log.debug(f"Can't handle type {anno} yet.")
+
+
+def nest_field(struct, field, annotation, nest_errors: ty.Dict):
+    """Nest the value of a single field.
+
+    Args:
+        struct: Dict holding the value under the key field, it will get
+            mutated.
+        field: Name of the field.
+        annotation: Type annotation of the field.
+        nest_errors: Dict used to gather errors.
+
+    """
+    # We need to handle union types.
+    annotation_list: list = []
+    try:
+        if annotation.__origin__ is ty.Union:
+            annotation_list = annotation.__args__
+    except AttributeError:
+        pass
+    for union_annotation in annotation_list:
+        _pack_nestables(struct, field, union_annotation, nest_errors)
+    _pack_nestables(struct, field, annotation, nest_errors)
+
+
+def _nest_plan(cls) -> ty.List[tuple]:
+    """Return the name, annotation and converter of each field of a class.
+
+    Along with whether nesting may change its values at all, the others
+    skip the nesting, e.g. fields of str or Decimal.
+    """
+    converters = getattr(cls, '__dataclass_converters__', None) or {}
+    return [(name, f.type, converters.get(name), may_nest(f.type))
+            for name, f in cls.__dataclass_fields__.items()]
+
+
+# dataclass -> its _nest_plan
+_nest_plans = PlanCache(_nest_plan)
+
+
+def nest_dc(dc, nest_errors: ty.Dict):
     """If a field is annotated as nestable, turn its dictionary into a class.
 
     This function makes annotation relevant by parsing it during object
@@ -46,88 +339,99 @@ def nest_dc(dc, nest_errors: ty.Dict):  # noqa: C901
             initialization.
 
     """
-    def pack_nestables(struct, ref, anno, idx=None):
-        # pack parameter dictionaries if they are annotated as nestable
-        try:
-            nestable = anno.__dataclass_params__.nest
-        except AttributeError:
-            pass
-        else:
-            pos_ref = idx if idx is not None else ref
-            if nestable and isinstance(struct[pos_ref], dict):
-                try:
-                    struct[pos_ref] = anno(**struct[pos_ref])
-                except NestedInitializationException as e:
-                    # To preserve the index in nested list initialization
-                    # we need to check if we are given and index and if so,
-                    # append the nested key.
-                    if idx is not None:
-                        # Safe guard
-                        if ref not in nest_errors:
-                            nest_errors[ref] = {}
-                        nest_errors[ref][idx] = e.errors
-                    else:
-                        nest_errors[ref] = e.errors
-        # Instantiate Enums
-        if type(anno) is type(Enum):
+    # call the nesting once for each attribute
+    # Given values are converted in the same pass, see coercion.
+    values = dc.__dict__
+    for field, anno, converter, nests in _nest_plans[type(dc)]:
+        if nest_errors and error_limit_reached():
+            break  # see validation.max_errors
+        if converter is not None:
             try:
-                struct[ref] = anno(struct[ref])
-            except ValueError:
-                pass
-            finally:
-                return
-
-        # skip over builtins, 'ty.Any', and 'ty.NamedTuple' ...
-        if not isinstance(anno, ty._GenericAlias):
-            return
-        # ... which means that accessing '_name' is now safe to do
-        name = anno._name
-
-        # handle typed lists
-        if name in LIST_TYPES:
-            t = anno.__args__[0]
-            if repr(t) == '~T':
-                return  # untyped list, nothing to do
-            # If the given value to the list is not Iterable
-            # we can not instantiate it.
-            if not isinstance(struct[ref], Iterable):
-                return
-            for idx in range(len(struct[ref])):
-                pack_nestables(struct[ref], ref, t, idx)
-            return
+                values[field] = converter(values[field])
+            except CONVERSION_ERRORS as e:
+                record_conversion_error(field, values[field], anno, e,
+                                        nest_errors)
+                continue
+        if nests:
+            nest_field(values, field, anno, nest_errors)
 
-        # handle typed dictionaries
-        if name in DICT_TYPES:
-            t = anno.__args__[1]
-            if repr(t) == '~T':
-                return  # untyped dict values, nothing to do
-            for key in struct[ref]:
-                pack_nestables(struct[ref], key, t)
-            return
 
-        # log debug messages for fallthrough and exceptions
-        if name in SET_TYPES or name in IMMUTABLE_TYPES:
-            log.debug(f"Halting the packing of {anno} since potential "
-                      f"parameter lists would be unhashable or immutable.")
-        else:
-            log.debug(f"Can't handle type {anno} yet.")
+def _freeze_tree(tree):
+    """Turn a tree of field names into a hashable one, see path_tree."""
+    if tree is None:
+        return None
+    return tuple(sorted((name, _freeze_tree(sub)) for name, sub in
+                        tree.items()))
 
-    # call the nesting once for each attribute
-    for field, field_annotation in dc.__dataclass_fields__.items():
-        # We need to handle union types.
-        annotation = field_annotation.type
-        annotation_list: list = []
+
+def _freeze_paths(paths):
+    return _freeze_tree(path_tree(paths))
+
+
+def _compile_view(key):
+    """List the fields a view of a class contains, with their subviews.
+
+    Args:
+        key: Tuple of the class, its frozen tree of selected field names,
+            and whether the tree holds the included or the excluded fields.
+
+    Returns:
+        List of (field, view) pairs, the view of a field is None if all of
+        it is contained.
+
+    """
+    cls, tree, include = key
+    selected = dict(tree)
+    unknown = selected.keys() - cls.__dataclass_fields__.keys()
+    if unknown:
+        raise TypeError(f"{cls.__name__} has no fields called "
+                        f"{sorted(unknown)}.")
+    view = []
+    for f in fields(cls):
+        if f.name not in selected:
+            if not include:
+                view.append((f, None))
+            continue
+        subtree = selected[f.name]
+        if subtree is not None:
+            view.append((f, (subtree, include)))
+        elif include:
+            view.append((f, None))
+    return view
+
+
+# Paths given to asdict -> their frozen tree.
+_trees = PlanCache(_freeze_paths)
+# (class, frozen tree, include) -> fields of the view, see _compile_view.
+_views = PlanCache(_compile_view)
+
+
+def _asdict_fields(obj, dict_factory, view, depth, leaf):
+    """Deserialize the fields of a dataclass instance, see _asdict_inner."""
+    if view is None:
+        selected = [(f, None) for f in fields(obj)]
+    else:
+        selected = _views[(type(obj), *view)]
+    result = []
+    for f, subview in selected:
+        value = getattr(obj, f.name)
         try:
-            if annotation.__origin__ is ty.Union:
-                annotation_list = annotation.__args__
+            # Optional fields which have the default_optional_value are
+            # considered not defined and therefore they should not appear
+            # on the deserialization.
+            if f.optional and value == f.default_optional_value:
+                continue
         except AttributeError:
-            pass
-        for union_annotation in annotation_list:
-            pack_nestables(dc.__dict__, field, union_annotation)
-        pack_nestables(dc.__dict__, field, annotation)
+            log.debug("A standard dataclass field is being deserialized")
+        if value is EXCLUDED:
+            continue  # not loaded, see projection.from_dict
+        value = _asdict_inner(value, dict_factory, subview, depth, leaf)
+        if value is not _PRUNED:
+            result.append((f.name, value))
+    return dict_factory(result)
 
 
-def _asdict_inner(obj, dict_factory):
+def _asdict_inner(obj, dict_factory, view=None, depth=None, leaf=copy_leaf):
     """Deserialize a dataclass into a dict_factory.
 
     It is still called _asdict_inner because it actually extends the
@@ -141,40 +445,50 @@ def _asdict_inner(obj, dict_factory):
     Args:
         obj: dataclass instance to be deserialized.
         dict_factory: If given it will be used instead of buildt-in dict.
+        view: Tuple of the frozen tree of selected field names, and whether
+            they are included or excluded, None to select all fields. It
+            applies to the items of containers as well.
+        depth: How many levels of nested dataclass instances are left to
+            deserialize, None for all of them.
+        leaf: Deserializes values which are neither dataclass instances nor
+            containers, see encoding.
 
     Returns:
-        Deserialized class in the given dict_factory.
+        Deserialized class in the given dict_factory, or _PRUNED if it is a
+        dataclass instance below the maximum depth.
 
     """
     if _is_dataclass_instance(obj):
-        result = []
-        for f in fields(obj):
-            try:
-                # Optional fields which have the default_optional_value are
-                # considered not defined and therefore they should not appear
-                # on the deserialization.
-                if f.optional and getattr(
-                        obj, f.name) == f.default_optional_value:
-                    continue
-            except AttributeError:
-                log.debug("A standard dataclass field is being deserialized")
-            value = _asdict_inner(getattr(obj, f.name), dict_factory)
-            result.append((f.name, value))
-        return dict_factory(result)
+        if depth is not None:
+            if depth < 0:
+                return _PRUNED
+            depth -= 1
+        return _asdict_fields(obj, dict_factory, view, depth, leaf)
     elif isinstance(obj, (list, tuple)):
-        return type(obj)(_asdict_inner(v, dict_factory) for v in obj)
+        return type(obj)(v for v in (_asdict_inner(
+            v, dict_factory, view, depth, leaf) for v in obj)
+            if v is not _PRUNED)
+    elif isinstance(obj, (set, frozenset)):
+        items = [_asdict_inner(v, dict_factory, view, depth, leaf)
+                 for v in obj]
+        items = [v for v in items if v is not _PRUNED]
+        try:
+            return type(obj)(items)
+        except TypeError:
+            # Deserialized dataclasses are unhashable.
+            return items
     elif isinstance(obj, dict):
-        return type(obj)(
-            (_asdict_inner(k, dict_factory), _asdict_inner(v, dict_factory))
-            for k, v in obj.items())
+        items = ((_asdict_inner(k, dict_factory, leaf=leaf),
+                  _asdict_inner(v, dict_factory, view, depth, leaf))
+                 for k, v in obj.items())
+        return type(obj)((k, v) for k, v in items if v is not _PRUNED)
     else:
-        if isinstance(obj, Enum):
-            return copy.deepcopy(obj.value)
-        else:
-            return copy.deepcopy(obj)
+        return leaf(obj)
 
 
-def asdict(obj, *, dict_factory=dict):
+def asdict(obj, *, dict_factory=dict, include: ty.Iterable[str] = None,
+           exclude: ty.Iterable[str] = None, max_depth: int = None,
+           encode: bool = False):
     """Deserialize a dataclass instance.
 
     Return the fields of a dataclass instance as a new dictionary mapping
@@ -193,8 +507,51 @@ def asdict(obj, *, dict_factory=dict):
     If given, 'dict_factory' will be used instead of built-in dict.
     The function applies recursively to field values that are
     dataclass instances. This will also look into built-in containers:
-    tuples, lists, and dicts.
+    tuples, lists, dicts and sets. Sets of dataclass instances are turned
+    into lists, since their dicts are unhashable.
+
+    Only a part of the instance can be deserialized by selecting fields
+    with dotted paths, the same way as for projection.from_dict, e.g.
+    asdict(order, include=['id', 'items[*].sku']). Unselected values are
+    not visited at all. The selected fields of each class are computed
+    once per view and cached.
+
+    Args:
+        obj: dataclass instance to be deserialized.
+        dict_factory: If given it will be used instead of built-in dict.
+        include: Paths of the fields to deserialize, all others are left
+            out.
+        exclude: Paths of the fields to leave out, all others are
+            deserialized.
+        max_depth: How many levels of nested dataclass instances to
+            deserialize, 0 for the fields of obj only. Deeper instances are
+            left out, along with the fields holding them, and they are
+            dropped from containers.
+        encode: Encode values of types which have an encoder, e.g. datetime,
+            Decimal, UUID and bytes, to strings, see
+            encoding.register_encoder. They are kept as they are otherwise.
+
+    Raises:
+        TypeError: If obj is not a dataclass instance, include or exclude is
+            a single str instead of paths, or a path does not lead to a
+            field.
+        ValueError: If both include and exclude are given.
+
+    Returns:
+        Deserialized instance in the given dict_factory.
+
     """
     if not _is_dataclass_instance(obj):
         raise TypeError("asdict() should be called on dataclass instances")
-    return _asdict_inner(obj, dict_factory)
+    if include is not None and exclude is not None:
+        raise ValueError("Only one of include and exclude can be given.")
+    if isinstance(include, str) or isinstance(exclude, str):
+        raise TypeError("include and exclude take an iterable of paths, "
+                        "not a single str.")
+    view = None
+    if include is not None:
+        view = (_trees[tuple(include)], True)
+    elif exclude is not None:
+        view = (_trees[tuple(exclude)], False)
+    leaf = encode_leaf if encode else copy_leaf
+    return _asdict_inner(obj, dict_factory, view, max_depth, leaf)
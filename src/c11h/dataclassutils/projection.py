@@ -0,0 +1,180 @@
+import copy
+from dataclasses import fields, is_dataclass, MISSING
+import typing as ty
+
+from c11h.dataclassutils.field import EXCLUDED
+from c11h.dataclassutils.re_wrap import _prepare_field
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import new_instance, path_tree
+
+_NONE_TYPE = type(None)
+
+
+def _path_target(anno):
+    """Return the dataclass a path may lead into, and if it is in a list."""
+    origin = getattr(anno, '__origin__', None)
+    if origin is ty.Union:
+        args = [a for a in anno.__args__ if a is not _NONE_TYPE]
+        if len(args) == 1:
+            return _path_target(args[0])
+    elif origin is list:
+        target, _ = _path_target(anno.__args__[0])
+        return target, True
+    elif is_dataclass(anno) and isinstance(anno, type):
+        return anno, False
+    return None, False
+
+
+def _raw_value(cls, f, data):
+    """Return the given value of a field, or the one it defaults to."""
+    if f.name in data:
+        return data[f.name]
+    if getattr(f, 'optional', False):
+        return copy.deepcopy(f.default_optional_value)
+    if f.default is not MISSING:
+        return f.default
+    if f.default_factory is not MISSING:  # type: ignore
+        return f.default_factory()  # type: ignore
+    raise TypeError(f"{cls.__name__} is missing the required field "
+                    f"'{f.name}'.")
+
+
+def _check_items(cls, f, items, item_errors):
+    """Type check the items of a list which have not been projected."""
+    checker = getattr(cls, '__dataclass_checkers__', {}).get(f.name)
+    if checker is None:
+        return
+    type_errors: dict = {}
+    checker.check_type(items, type_errors)
+    for i, e in type_errors.get(f.name, {}).items():
+        item_errors.setdefault(i, e)
+
+
+def _project_field(cls, f, value, tree, include, nest, errors):
+    """Build the value of a field of which only some subfields are loaded.
+
+    Values which can't be projected, i.e. neither dicts nor lists of them,
+    are nested and validated like the field would be without a path.
+    """
+    target, many = _path_target(f.type)
+    if target is None:
+        raise TypeError(f"The field '{f.name}' holds no dataclass, paths "
+                        f"can't lead into it.")
+    if many and isinstance(value, list):
+        items = []
+        item_errors = {}
+        for i, item in enumerate(value):
+            if isinstance(item, dict):
+                item, e = _project(target, item, tree, include)
+                if e:
+                    item_errors[i] = e
+            items.append(item)
+        _check_items(cls, f, items, item_errors)
+        if item_errors:
+            errors[f.name] = item_errors
+        return items
+    if not many and isinstance(value, dict):
+        obj, e = _project(target, value, tree, include)
+        if e:
+            errors[f.name] = e
+        return obj
+    # e.g. None, an instance which is built already, or an invalid value
+    return _prepare_field(cls, f.name, value, nest, errors)
+
+
+def _project(cls, data, tree, include):
+    """Build an instance of cls from the selected fields of data.
+
+    Returns:
+        Tuple of the instance and its errors.
+
+    """
+    unknown = tree.keys() - cls.__dataclass_fields__.keys()
+    if unknown:
+        raise TypeError(f"{cls.__name__} has no fields called "
+                        f"{sorted(unknown)}.")
+    params = cls.__dataclass_params__
+    if not getattr(params, 'ignore_additional_properties', False):
+        unknown = data.keys() - cls.__dataclass_fields__.keys()
+        if unknown:
+            raise TypeError(f"{cls.__name__} got unexpected fields "
+                            f"{sorted(unknown)}.")
+    nest = getattr(params, 'nest', False)
+    values = {}
+    errors: dict = {}
+    for f in fields(cls):
+        subtree = tree.get(f.name)
+        excluded = (f.name not in tree) if include else (
+            f.name in tree and subtree is None)
+        if excluded or not f.init:
+            values[f.name] = EXCLUDED
+        elif subtree:
+            values[f.name] = _project_field(
+                cls, f, _raw_value(cls, f, data), subtree, include, nest,
+                errors)
+        else:
+            values[f.name] = _prepare_field(
+                cls, f.name, _raw_value(cls, f, data), nest, errors)
+    if not getattr(params, 'validate', False):
+        errors.clear()
+    return new_instance(cls, values), errors
+
+
+def from_dict(cls, data: ty.Dict, *, include: ty.Iterable[str] = None,
+              exclude: ty.Iterable[str] = None):
+    """Initialize a dataclass from a dict, loading only some of its fields.
+
+    Fields are selected by dotted paths, the items of a list are selected
+    by the path of the list, e.g. 'items[*].sku'. Unselected fields are
+    neither nested nor validated, they are set to EXCLUDED and left out by
+    asdict. The selected fields are nested and validated according to the
+    flags of their class, just like they would be during an initialization.
+
+    Example usage:
+
+      @dataclass(nest=True, validate=True)
+      class Item:
+          sku: str
+          price: float
+
+      @dataclass(nest=True, validate=True)
+      class Order:
+          id: int
+          items: List[Item]
+
+      order = from_dict(Order, data, include=['items[*].sku'])
+      assert order.id is EXCLUDED
+      assert asdict(order) == {'items': [{'sku': 'a'}]}
+
+    Notes:
+        - Instances are created without running __init__ or __post_init__,
+          since those would need every field. Fields with init=False are
+          set to EXCLUDED as well.
+        - Along a path, dicts are turned into instances regardless of the
+          nest flag of the owning class.
+
+    Args:
+        cls: dataclass to initialize.
+        data: Keyword arguments as they would be given to the class.
+        include: Paths of the fields to load, all others are excluded.
+        exclude: Paths of the fields to exclude, all others are loaded.
+
+    Raises:
+        ValueError: If both include and exclude are given.
+        TypeError: If a path does not lead to a field, or a loaded field
+            is missing.
+        NestedInitializationException: If the loaded values are invalid.
+
+    Returns:
+        The new instance.
+
+    """
+    if include is not None and exclude is not None:
+        raise ValueError("Only one of include and exclude can be given.")
+    if include is None and exclude is None:
+        return cls(**data)
+    tree = path_tree(include if include is not None else exclude)
+    obj, errors = _project(cls, data, tree, include is not None)
+    if errors:
+        raise NestedInitializationException(errors)
+    return obj
@@ -0,0 +1,239 @@
+from collections.abc import Iterable
+from dataclasses import fields, is_dataclass, MISSING
+from enum import Enum
+from itertools import repeat
+import typing as ty
+
+from c11h.dataclassutils.coercion import convert_value
+from c11h.dataclassutils.nesting import _item_annotations, may_nest
+from c11h.dataclassutils.util.exceptions import ErrorRecord
+from c11h.dataclassutils.validation import _type_walker
+
+
+def _type_error(value, t):
+    return ErrorRecord(t, value)
+
+
+def _walk_type(value, anno):
+    """Check a value which nesting keeps as it is, like its checker does."""
+    mistakes: list = []
+    _type_walker(None, None, anno, value, mistakes)
+    if not mistakes:
+        return None
+    _, actual, t = mistakes[0]
+    return _type_error(actual, t)
+
+
+def _check_items(items, types, nest):
+    """Check the items of a container, return their errors by position."""
+    errors = {}
+    for pos, (item, t) in enumerate(zip(items, types)):
+        error = _check_value(item, t, nest)
+        if error is not None:
+            errors[pos] = error
+    return errors or None
+
+
+def _check_collection(value, anno, origin, nest):
+    """Check a tuple or set value, which nesting builds from any iterable."""
+    if nest:
+        if (not isinstance(value, Iterable) or
+                isinstance(value, (str, bytes, dict))):
+            return _type_error(value, origin)
+    elif not isinstance(value, origin):
+        return _type_error(value, origin)
+    types = _item_annotations(anno)
+    if types is None:
+        return None
+    if isinstance(types, tuple) and (not hasattr(value, '__len__') or
+                                     len(value) != len(types)):
+        return _type_error(value, anno)
+    return _check_items(value, types, nest)
+
+
+def _check_dict_items(value, anno, nest):
+    if not isinstance(value, dict):
+        return _type_error(value, dict)
+    t_key, t_value = anno.__args__
+    if isinstance(t_key, ty.TypeVar):
+        return None  # untyped dict, nothing to do
+    errors = {}
+    for k, v in value.items():
+        error = _check_value(k, t_key, nest)
+        if error is None:
+            error = _check_value(v, t_value, nest)
+        if error is not None:
+            errors[k] = error
+    return errors or None
+
+
+def _check_union(value, anno, nest):
+    """Check a value against the arms of a Union, the way nesting does.
+
+    A dict is nested into each nestable dataclass arm in turn, until one
+    takes it. The errors of the last arm which didn't are the ones the
+    initialization reports.
+    """
+    errors = None
+    if nest and isinstance(value, dict):
+        for arm in anno.__args__:
+            if (is_dataclass(arm) and
+                    getattr(arm.__dataclass_params__, 'nest', False)):
+                arm_errors = _check_dict(arm, value)
+                if not arm_errors:
+                    return errors
+                errors = arm_errors
+    if errors is not None:
+        return errors
+    for arm in anno.__args__:
+        if _check_value(value, arm, nest) is None:
+            return None
+    return _type_error(value, anno)
+
+
+def _check_value(value, anno, nest):  # noqa: C901
+    """Check a raw value against an annotation.
+
+    Args:
+        value: Raw value, as it would be given to the owning class.
+        anno: Annotation of the value.
+        nest: Whether the owning class nests its fields.
+
+    Returns:
+        None if the value is valid, its errors otherwise.
+
+    """
+    if is_dataclass(anno):
+        if isinstance(value, anno):
+            return None  # it has been validated during its initialization
+        nestable = getattr(anno.__dataclass_params__, 'nest', False)
+        if nest and nestable and isinstance(value, dict):
+            return _check_dict(anno, value) or None
+        return _type_error(value, anno)
+    if isinstance(anno, type) and issubclass(anno, Enum):
+        if type(value) is anno:
+            return None
+        if nest:
+            try:
+                anno(value)
+                return None
+            except ValueError:
+                pass
+        return _type_error(value, anno)
+    if isinstance(anno, (ty._SpecialForm, ty.TypeVar)):
+        return None
+    if not may_nest(anno):
+        return _walk_type(value, anno)
+    origin = getattr(anno, '__origin__', None)
+    if origin is ty.Union:
+        return _check_union(value, anno, nest)
+    if origin is list:
+        if not isinstance(value, list):
+            return _type_error(value, list)
+        return _check_items(value, repeat(anno.__args__[0]), nest)
+    if origin is dict:
+        return _check_dict_items(value, anno, nest)
+    if origin in (tuple, set, frozenset):
+        return _check_collection(value, anno, origin, nest)
+    return None  # not supported by the type validation either
+
+
+def _check_missing(cls, f):
+    """Make sure that a field which is not given does not need to be."""
+    if not f.init or getattr(f, 'optional', False):
+        return
+    if f.default is MISSING and f.default_factory is MISSING:  # type: ignore
+        raise TypeError(f"{cls.__name__} is missing the required field "
+                        f"'{f.name}'.")
+
+
+def _check_field(f, value, nest, checker, converter, errors):
+    if converter is not None:
+        value = convert_value(f.name, value, converter, f.type, errors)
+        if f.name in errors:
+            return
+    if getattr(f, 'optional', False) and value == f.default_optional_value:
+        return
+    if not (nest and may_nest(f.type)):
+        # The value is kept as it is, so its checker can run as it would
+        # during the initialization.
+        if checker is not None:
+            checker(value, errors)
+        return
+    # Validators get the nested value, which is not built here.
+    error = _check_value(value, f.type, nest)
+    if error is not None:
+        errors[f.name] = error
+
+
+def _check_dict(cls, data: ty.Dict) -> ty.Dict:
+    params = cls.__dataclass_params__
+    if not getattr(params, 'ignore_additional_properties', False):
+        unknown = data.keys() - cls.__dataclass_fields__.keys()
+        if unknown:
+            raise TypeError(f"{cls.__name__} got unexpected fields "
+                            f"{sorted(unknown)}.")
+    nest = getattr(params, 'nest', False)
+    checkers = getattr(cls, '__dataclass_checkers__', {})
+    converters = getattr(cls, '__dataclass_converters__', {})
+    errors: dict = {}
+    for f in fields(cls):
+        # Defaults are part of the class, not of the input.
+        if f.name not in data:
+            _check_missing(cls, f)
+            continue
+        if not f.init:
+            raise TypeError(f"The field '{f.name}' of {cls.__name__} is "
+                            f"declared with init=False, it can't be given.")
+        _check_field(f, data[f.name], nest, checkers.get(f.name),
+                     converters.get(f.name), errors)
+    return errors if getattr(params, 'validate', False) else {}
+
+
+def validate_dict(cls, data: ty.Dict) -> ty.Dict:
+    """Check raw input against a dataclass without initializing it.
+
+    The input is walked along the field annotations, following the same
+    nesting rules and type checks an initialization with cls(**data) would
+    apply, but neither any dataclass instance is created nor the input
+    copied. This is useful if input only needs to be accepted or rejected.
+
+    Example usage:
+
+      @dataclass(nest=True, validate=True)
+      class Address:
+          city: str
+
+      @dataclass(nest=True, validate=True)
+      class Person:
+          name: str
+          address: Address
+
+      errors = validate_dict(Person, {'name': 'a', 'address': {'city': 1}})
+      assert list(errors) == ['address']
+
+    Notes:
+        - __post_init__ methods are not run.
+        - Validators of fields whose values would be changed by nesting,
+          e.g. into dataclass instances, enums or tuples, are skipped.
+        - Defaults of the class are not checked, only the input.
+
+    Args:
+        cls: dataclass to check the input against.
+        data: Keyword arguments as they would be given to the class.
+
+    Raises:
+        TypeError: If data is not a dict, a required field is missing, or
+            unknown fields are given and additional properties are not
+            ignored, on any level of nesting.
+
+    Returns:
+        The errors, in the form a NestedInitializationException would hold
+        them, or an empty dict if the input is valid.
+
+    """
+    if not is_dataclass(cls) or not isinstance(cls, type):
+        raise TypeError("validate_dict() should be called on dataclasses")
+    if not isinstance(data, dict):
+        raise TypeError(f"'{data}' is not a dict.")
+    return _check_dict(cls, data)
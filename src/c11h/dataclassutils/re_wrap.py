@@ -3,23 +3,42 @@ from dataclasses import (  # type: ignore
     _DataclassParams, dataclass as old_dataclass, MISSING)
 from functools import wraps
 
+from c11h.dataclassutils.accounting import enable_accounting
+from c11h.dataclassutils.codegen import can_generate_init, make_init
+from c11h.dataclassutils.coercion import (compile_converters, convert_fields,
+                                          convert_value)
 from c11h.dataclassutils.field import (ExtendedField,
                                        optional_fields_postprocessing)
-from c11h.dataclassutils.nesting import nest_dc
+from c11h.dataclassutils.generics import enable_specialization
+from c11h.dataclassutils.nesting import (
+    nest_dc, nest_field, take_error_collector)
 from c11h.dataclassutils.util.exceptions import NestedInitializationException
-from c11h.dataclassutils.util.helper_functions import ignore_additional_kwargs
+from c11h.dataclassutils.util.helper_functions import (
+    forward_ref_hints, ignore_additional_kwargs)
 from c11h.dataclassutils.validation import (
-    check_validators, validate_fields, validate_types)
+    check_validators, compile_checkers, error_limit_reached, validate_fields,
+    validate_types)
+
+VALIDATE_MODES = (False, True, 'assign')
+# Attribute holding the hash of instances of classes with cache_hash=True.
+HASH_ATTR = '__dataclass_hash__'
+# Marks instances whose __init__ is running, see _setattr_wrapper.
+INIT_ATTR = '__dataclass_initializing__'
 
 
 # we need to extend this class in order to add our custom flags
 class _ExtendedDCParams(_DataclassParams):
-    __slots__ = ('validate', 'nest', 'ignore_additional_properties')
+    __slots__ = ('validate', 'nest', 'ignore_additional_properties', 'account',
+                 'cache_hash', 'coerce')
 
-    def __init__(self, validate, nest, ignore_additional_properties, **kwargs):
+    def __init__(self, validate, nest, ignore_additional_properties,
+                 account=False, cache_hash=False, coerce=False, **kwargs):
         self.validate = validate
         self.nest = nest
         self.ignore_additional_properties = ignore_additional_properties
+        self.account = account
+        self.cache_hash = cache_hash
+        self.coerce = coerce
         super().__init__(**kwargs)
 
     def __repr__(self):
@@ -33,7 +52,10 @@ class _ExtendedDCParams(_DataclassParams):
                 f'validate={self.validate!r},'
                 f'nest={self.nest!r}'
                 f'ignore_additional_properties'
-                f'={self.ignore_additional_properties!r}'
+                f'={self.ignore_additional_properties!r},'
+                f'account={self.account!r},'
+                f'cache_hash={self.cache_hash!r},'
+                f'coerce={self.coerce!r}'
                 ')')
 
 
@@ -95,32 +117,183 @@ def _pre_post_init(self, validate, nest):
     Notes:
       - Nesting needs to happen before validation.
       - nest_errors will be collected from nesting and appended to its field.
+      - If this instance is nested in another one, the errors are handed to
+        the parent instead of being raised, only the outermost
+        initialization raises a NestedInitializationException.
+
+    Returns:
+        Whether the instance is valid.
 
     """
-    nest_errors = {}
+    collector = take_error_collector(self)
+    # A nested instance gathers its errors right in the dict of its parent.
+    nest_errors = {} if collector is None or not validate else collector
     if nest:
         nest_dc(self, nest_errors)
+    else:
+        convert_fields(self, nest_errors)
     if validate:
         # type validation
         validate_types(self, nest_errors)
         # custom field validation
         validate_fields(self, nest_errors)
-        if nest_errors:
-            raise NestedInitializationException(nest_errors)
+        if nest_errors or error_limit_reached():
+            if collector is None:
+                raise NestedInitializationException(nest_errors)
+            return False
+    return True
 
 
 def _post_init_wrapper(__post_init__, validate, nest):
     """Wrap the existing __post_init__ so that our code gets executed first."""
     @wraps(__post_init__)
     def wrapper(self):
-        _pre_post_init(self, validate, nest)
-        __post_init__(self)
+        if _pre_post_init(self, validate, nest):
+            __post_init__(self)
+    return wrapper
+
+
+def _prepare_field(self, name, value, nest, nest_errors):
+    """Nest and validate a single new field value of an instance.
+
+    Only the checks of the given field are run, the rest of the instance is
+    considered valid already.
+
+    Args:
+        self: dataclass instance the value is meant for.
+        name: Name of the field.
+        value: New value of the field.
+        nest: Whether dictionaries should be nested into dataclasses.
+        nest_errors: Dict used to gather errors.
+
+    Returns:
+        The value as it should be stored in the instance.
+
+    """
+    converter = getattr(self, '__dataclass_converters__', {}).get(name)
+    if converter is not None:
+        value = convert_value(name, value, converter,
+                              self.__dataclass_fields__[name].type,
+                              nest_errors)
+        if name in nest_errors:
+            return value
+    if nest:
+        # Same as in _pre_init, nesting must not mutate the given value.
+        struct = {name: copy.deepcopy(value)}
+        nest_field(struct, name, self.__dataclass_fields__[name].type,
+                   nest_errors)
+        value = struct[name]
+    if self.__dataclass_params__.validate and name not in nest_errors:
+        self.__dataclass_checkers__[name](value, nest_errors)
+    return value
+
+
+def _resolve_forward_refs(cls):
+    """Resolve the annotations which name the class itself or earlier ones.
+
+    Names which are not defined yet are left as they are, build_deep
+    resolves them for its own use later on.
+    """
+    try:
+        hints = forward_ref_hints(cls)
+    except NameError:
+        return
+    for name, anno in hints.items():
+        cls.__dataclass_fields__[name].type = anno
+
+
+def _setattr_wrapper(__setattr__, nest):
+    """Wrap __setattr__ so that assigned field values get validated.
+
+    Values set during __init__ are skipped, since they are validated as a
+    whole in the __post_init__ afterwards. Once __init__ is done, every
+    assignment is validated, also of fields which have been deleted.
+    """
+    @wraps(__setattr__)
+    def wrapper(self, name, value):
+        if name in self.__dataclass_checkers__ and (
+                name in self.__dict__ or INIT_ATTR not in self.__dict__):
+            nest_errors: dict = {}
+            value = _prepare_field(self, name, value, nest, nest_errors)
+            if nest_errors:
+                raise NestedInitializationException(nest_errors)
+        __setattr__(self, name, value)
     return wrapper
 
 
+def _assign_init_wrapper(__init__):
+    """Wrap __init__ to mark the instance as initializing while it runs."""
+    @wraps(__init__)
+    def wrapper(self, *args, **kwargs):
+        self.__dict__[INIT_ATTR] = True
+        try:
+            __init__(self, *args, **kwargs)
+        finally:
+            self.__dict__.pop(INIT_ATTR, None)
+    return wrapper
+
+
+def _hash_wrapper(__hash__):
+    """Wrap __hash__ so that the hash is computed once per instance.
+
+    The hash is stored as an attribute of the instance. Classes with
+    __slots__ need a HASH_ATTR slot for that, else it is computed each time.
+    """
+    @wraps(__hash__)
+    def wrapper(self):
+        try:
+            return object.__getattribute__(self, HASH_ATTR)
+        except AttributeError:
+            pass
+        h = __hash__(self)
+        try:
+            object.__setattr__(self, HASH_ATTR, h)
+        except AttributeError:
+            pass
+        return h
+    return wrapper
+
+
+def _eq_wrapper(__eq__):
+    """Wrap __eq__ to decide by identity and cached hashes where possible."""
+    @wraps(__eq__)
+    def wrapper(self, other):
+        if self is other:
+            return True
+        if other.__class__ is self.__class__:
+            h = getattr(self, HASH_ATTR, None)
+            if h is not None:
+                other_h = getattr(other, HASH_ATTR, None)
+                if other_h is not None and other_h != h:
+                    return False
+        return __eq__(self, other)
+    return wrapper
+
+
+def _getstate_wrapper(cls):
+    """Leave the cached hash out of pickles, hashes of str differ per run."""
+    __getstate__ = getattr(cls, '__getstate__', None)
+
+    def wrapper(self):
+        state = self.__dict__ if __getstate__ is None else __getstate__(self)
+        if isinstance(state, dict) and HASH_ATTR in state:
+            state = {k: v for k, v in state.items() if k != HASH_ATTR}
+        return state
+    return wrapper
+
+
+def _enable_hash_cache(cls, eq):
+    """Make a frozen class store the hash of its instances, see cache_hash."""
+    cls.__hash__ = _hash_wrapper(cls.__hash__)
+    if eq:
+        cls.__eq__ = _eq_wrapper(cls.__eq__)
+    cls.__getstate__ = _getstate_wrapper(cls)
+
+
 def field(*, default=MISSING, default_factory=MISSING, init=True, repr=True,
           hash=None, compare=True, metadata=None, optional=False,
-          default_optional_value=None, validators=None):
+          default_optional_value=None, validators=None, batch=False,
+          cache=None, converter=None):
     """Object to identify dataclass fields.
 
     Args:
@@ -143,6 +316,21 @@ def field(*, default=MISSING, default_factory=MISSING, init=True, repr=True,
             (not given) and therefore missing.
         validators: A list of callable validator functions which are used to
             validate the field.
+        batch: If true, the validators are batch validators. Instead of a
+            single value they get a list of values and return the positions
+            of the invalid ones, or a dict mapping those to error messages.
+            For list fields the values are the items of the list, else they
+            are the values of the field across many instances, so each
+            validator runs once per list or column instead of once per value.
+        cache: If given, the outcome of the validators is memorized for that
+            many distinct values, in a least recently used cache. Only use it
+            for validators that are pure functions of the value. Values that
+            can't be hashed are always validated.
+        converter: If given, a callable turning a given value into the one
+            the field holds, e.g. a str into a number. It runs before the
+            nesting and the validation, and replaces the conversion of the
+            coerce flag. Raising a ValueError or TypeError marks the value
+            as invalid.
 
     Notes:
         - It is an error to specify both default and default_factory.
@@ -155,12 +343,26 @@ def field(*, default=MISSING, default_factory=MISSING, init=True, repr=True,
         raise ValueError('cannot specify both default and default_factory.')
 
     return ExtendedField(default, default_factory, init, repr, hash, compare,
-                         metadata, optional, default_optional_value, validators)
+                         metadata, optional, default_optional_value, validators,
+                         batch, cache, converter)
+
+
+def _check_flags(validate, frozen, cache_hash):
+    if validate not in VALIDATE_MODES:
+        raise ValueError(f"validate must be one of {VALIDATE_MODES}, "
+                         f"got {validate!r}.")
+    if validate == 'assign' and frozen:
+        raise ValueError("validate='assign' cannot be used with frozen=True, "
+                         "the fields of frozen instances are not assigned.")
+    if cache_hash and not frozen:
+        raise ValueError("cache_hash=True requires frozen=True, the hash of "
+                         "mutable instances can change.")
 
 
 def dataclass(_cls=None, *, init=True, repr=True, eq=True, order=False,
               unsafe_hash=False, frozen=False, validate=False, nest=False,
-              ignore_additional_properties=False):
+              ignore_additional_properties=False, account=False,
+              cache_hash=False, coerce=False):
     """Wrap dataclass decorator to perform validation and nesting.
 
     This wrapper is made in top of python dataclass wrapper to be able to
@@ -199,41 +401,82 @@ def dataclass(_cls=None, *, init=True, repr=True, eq=True, order=False,
             instantiated will read to an exception. This emulates read-only
             frozen instances.
         validate: Custom flag -- if true, an automatic validation will be
-            performed on all values, given their annotation.
+            performed on all values, given their annotation. If set to
+            'assign', fields which get assigned after the initialization
+            will be nested and validated as well, one field at a time.
+            'assign' cannot be combined with frozen=True.
         nest: Custom flag -- if set to true, the constructor will also accept
             dictionaries in stead of nestable dataclasses.
         ignore_additional_properties: if set, additional properties (attributes)
             given to the __init__ constructor will be ignored.
+        account: If set, the instances of the class are counted, see
+            accounting.instance_counts.
+        cache_hash: If set, the hash of an instance is computed once and
+            stored on it, and __eq__ compares the stored hashes of two
+            instances before their fields. Requires frozen=True.
+        coerce: If set, given values are converted to the annotated type
+            where that is unambiguous, e.g. '1' to an int or an ISO string
+            to a datetime, see coercion.COERCIONS. Conversion happens before
+            nesting and validation.
 
     """
+    _check_flags(validate, frozen, cache_hash)
+
     @wraps(old_dataclass)
     def wrapper(cls):
         # wrap post_init (supply a dummy if there is none) with pre_post_init
         try:
-            __post_init__ = cls.__post_init__
+            __post_init__ = user_post_init_ = cls.__post_init__
         except AttributeError:
             __post_init__ = lambda *args: None  # noqa: E731
+            user_post_init_ = None
         cls.__post_init__ = _post_init_wrapper(__post_init__, validate, nest)
+        # An __init__ of the class itself is kept, and wrapped below.
+        own_init = '__init__' in cls.__dict__
 
         # this is essentially super().__init__
         old_dataclass(_cls=cls, init=init, repr=repr, eq=eq, order=order,
                       unsafe_hash=unsafe_hash, frozen=frozen)
 
+        _resolve_forward_refs(cls)
+
         # validation of custom validator functions
         check_validators(cls)
 
         # Get optional fields.
         optional_fields_postprocessing(cls)
 
-        # Wrap the __init__ method to support optional params.
-        cls.__init__ = _init_wrapper(cls.__init__, cls,
-                                     ignore_additional_properties)
+        # Precompute the checks of each field, optional fields are final now.
+        cls.__dataclass_checkers__ = compile_checkers(cls)
+        cls.__dataclass_converters__ = compile_converters(cls, coerce)
+        if validate == 'assign':
+            cls.__setattr__ = _setattr_wrapper(cls.__setattr__, nest)
+
+        if init and not own_init and can_generate_init(cls):
+            # One __init__ doing everything, instead of the wrappers.
+            cls.__init__ = make_init(cls, validate, nest,
+                                     ignore_additional_properties,
+                                     user_post_init_,
+                                     coerce or bool(
+                                         cls.__dataclass_converters__))
+        else:
+            # Wrap the __init__ method to support optional params.
+            cls.__init__ = _init_wrapper(cls.__init__, cls,
+                                         ignore_additional_properties)
+        if validate == 'assign':
+            cls.__init__ = _assign_init_wrapper(cls.__init__)
 
         # extend the dataclass parameter object last, else it gets overwritten
         dc_params = {attr: getattr(cls.__dataclass_params__, attr) for attr in
                      cls.__dataclass_params__.__slots__}
         cls.__dataclass_params__ = _ExtendedDCParams(
-            validate, nest, ignore_additional_properties, **dc_params)
+            validate, nest, ignore_additional_properties, account,
+            cache_hash, coerce, **dc_params)
+        if account:
+            enable_accounting(cls)
+        if cache_hash:
+            _enable_hash_cache(cls, eq)
+        enable_specialization(cls)
         return cls
 
     if _cls is None:
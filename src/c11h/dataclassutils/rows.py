@@ -0,0 +1,382 @@
+"""Conversion between dataclass instances and flat tuples, e.g. DB rows.
+
+Rows are read straight from the attributes of the instances, in the order
+of their columns, without building a dict for each instance or copying its
+values, and instances are built from rows the same way. The plans to do so
+are computed once per class and selection of columns, and cached.
+"""
+import copy
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from operator import attrgetter
+import typing as ty
+
+from c11h.dataclassutils.coercion import convert_value
+from c11h.dataclassutils.nesting import may_nest, nest_field
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import (default_getter,
+                                                       new_instance)
+from c11h.dataclassutils.util.plan_cache import PlanCache
+
+_NONE_TYPE = type(None)
+
+
+def _unwrap_optional(anno):
+    """Return the annotation an Optional wraps, or the annotation itself."""
+    if getattr(anno, '__origin__', None) is ty.Union:
+        args = [a for a in anno.__args__ if a is not _NONE_TYPE]
+        if len(args) == 1:
+            return args[0]
+    return anno
+
+
+def _flat_dataclass(anno):
+    """Return the dataclass a field holds on its own, if any."""
+    anno = _unwrap_optional(anno)
+    if is_dataclass(anno) and isinstance(anno, type):
+        return anno
+    return None
+
+
+def _default_columns(cls, flatten, prefix=''):
+    columns = []
+    for f in fields(cls):
+        target = _flat_dataclass(f.type) if flatten else None
+        if target is None:
+            columns.append(prefix + f.name)
+        else:
+            columns += _default_columns(target, flatten, f'{prefix}{f.name}.')
+    return columns
+
+
+def _column_getter(cls, column, enum_values):
+    """Return the function reading a column from an instance of cls.
+
+    Returns:
+        Tuple of the getter, and whether it is a plain attribute lookup.
+
+    """
+    names = column.split('.')
+    anno = cls
+    for name in names:
+        target = _flat_dataclass(anno)
+        if target is None or name not in target.__dataclass_fields__:
+            raise TypeError(f"{cls.__name__} has no column '{column}'.")
+        anno = target.__dataclass_fields__[name].type
+    anno = _unwrap_optional(anno)
+    convert = (enum_values and isinstance(anno, type) and
+               issubclass(anno, Enum))
+    if len(names) == 1 and not convert:
+        return attrgetter(names[0]), True
+
+    def get(obj):
+        for name in names:
+            if obj is None:
+                return None  # an Optional instance along the path is unset
+            obj = getattr(obj, name)
+        if convert and isinstance(obj, Enum):
+            return obj.value
+        return obj
+    return get, False
+
+
+def _compile_rows(key):
+    """Compile the function turning an instance into its row.
+
+    Args:
+        key: Tuple of the class, its columns or None for the default ones,
+            whether nested instances are flattened, and whether enum
+            members are turned into their values.
+
+    Returns:
+        Tuple of the column names and the function.
+
+    """
+    cls, columns, flatten, enum_values = key
+    if columns is None:
+        columns = tuple(_default_columns(cls, flatten))
+    getters = [_column_getter(cls, column, enum_values)
+               for column in columns]
+    if all(plain for _, plain in getters):
+        # A single attrgetter reads all columns at C speed.
+        if len(columns) == 1:
+            name = columns[0]
+            return columns, lambda obj: (getattr(obj, name),)
+        return columns, attrgetter(*columns)
+    funcs = [getter for getter, _ in getters]
+    return columns, lambda obj: tuple([func(obj) for func in funcs])
+
+
+# (class, columns, flatten, enum_values) -> (columns, row function)
+_rows = PlanCache(_compile_rows)
+
+
+def row_columns(cls, columns: ty.Iterable[str] = None, *,
+                flatten: bool = False) -> ty.Tuple[str, ...]:
+    """Return the column names of the rows of a dataclass.
+
+    Useful as the header of a CSV file, or for the column list of an
+    INSERT statement.
+
+    Args:
+        cls: dataclass
+        columns: See iter_rows.
+        flatten: See iter_rows.
+
+    Returns:
+        Tuple of the column names, in the order of the row values.
+
+    """
+    key = (cls, None if columns is None else tuple(columns), flatten, True)
+    return _rows[key][0]
+
+
+def iter_rows(instances: ty.Iterable, columns: ty.Iterable[str] = None, *,
+              flatten: bool = False,
+              enum_values: bool = True) -> ty.Iterator[tuple]:
+    """Stream dataclass instances as flat tuples.
+
+    Example usage:
+
+      @dataclass
+      class Point:
+          x: int
+          y: int
+
+      rows = iter_rows(points)
+      connection.executemany('INSERT INTO point VALUES (?, ?)', rows)
+      csv.writer(f).writerows(iter_rows(points, ['y']))
+
+    Notes:
+        - Values are neither copied nor deserialized, lists or instances
+          which are not flattened end up in the rows as they are.
+        - All instances should be of the same class, or share the columns.
+
+    Args:
+        instances: Iterable of dataclass instances.
+        columns: Names of the columns, in the order they should appear in
+            the rows, defaults to all fields in their declared order.
+            Dotted names read fields of nested instances, e.g.
+            'address.city', they are None if an instance along the way is.
+        flatten: Whether fields holding a dataclass instance are split into
+            the dotted columns of its fields, for the default columns.
+        enum_values: Whether enum members of fields annotated with an Enum
+            are turned into their values.
+
+    Raises:
+        TypeError: If a column does not lead to a field.
+
+    Yields:
+        A tuple of the column values of each instance.
+
+    """
+    if columns is not None:
+        columns = tuple(columns)
+    cls = None
+    row = None
+    for obj in instances:
+        if type(obj) is not cls:
+            cls = type(obj)
+            row = _rows[(cls, columns, flatten, enum_values)][1]
+        yield row(obj)
+
+
+def astuples(instances: ty.Iterable, columns: ty.Iterable[str] = None, *,
+             flatten: bool = False, enum_values: bool = True) -> ty.List:
+    """Return dataclass instances as a list of flat tuples, see iter_rows."""
+    return list(iter_rows(instances, columns, flatten=flatten,
+                          enum_values=enum_values))
+
+
+# Values which need no copy before they are nested.
+_ATOMIC_TYPES = (type(None), bool, int, float, complex, str, bytes, Enum)
+# How a field of a _RowPlan gets its value.
+_COLUMN = 'column'
+_NESTED = 'nested'
+_DEFAULT = 'default'
+
+
+class _RowPlan:
+    """How instances of a class are built from the values of a row.
+
+    Each field either takes the value of a column, is a nested instance
+    built from columns by a plan of its own, or gets its default.
+    """
+
+    __slots__ = ('cls', 'fields', 'indices', 'validate', 'checkers',
+                 'converters')
+
+    def __init__(self, cls, columns):
+        """Map columns to the fields of cls.
+
+        Args:
+            cls: dataclass to build.
+            columns: List of (column name, remaining path, index) triples,
+                the path of a column being relative to cls.
+
+        """
+        self.cls = cls
+        params = cls.__dataclass_params__
+        self.validate = getattr(params, 'validate', False)
+        self.checkers = getattr(cls, '__dataclass_checkers__', {})
+        self.converters = getattr(cls, '__dataclass_converters__', {})
+        self.indices = [index for _, _, index in columns]
+        groups: dict = {}
+        for column, path, index in columns:
+            groups.setdefault(path[0], []).append((column, path[1:], index))
+        unknown = groups.keys() - cls.__dataclass_fields__.keys()
+        if unknown:
+            column = next(c for c, p, _ in columns if p[0] in unknown)
+            raise TypeError(f"{cls.__name__} has no column '{column}'.")
+        nest = getattr(params, 'nest', False)
+        self.fields: list = []
+        for f in fields(cls):
+            if f.name in groups:
+                self.fields.append(self._column_field(f, groups[f.name],
+                                                      nest))
+                continue
+            default = default_getter(f)
+            if default is not None:
+                self.fields.append((f.name, _DEFAULT, default, None))
+            elif f.init:
+                raise TypeError(f"{cls.__name__} is missing the required "
+                                f"field '{f.name}'.")
+
+    def _column_field(self, f, columns, nest):
+        column, path, index = columns[0]
+        if not f.init:
+            raise TypeError(f"The field '{f.name}' of {self.cls.__name__} "
+                            f"is declared with init=False, it can't be "
+                            f"given.")
+        if not path:
+            if len(columns) > 1:
+                raise TypeError(f"The column '{column}' is given along with "
+                                f"columns of its fields.")
+            anno = f.type if nest and may_nest(f.type) else None
+            return f.name, _COLUMN, index, anno
+        target = _flat_dataclass(f.type)
+        if target is None:
+            raise TypeError(f"{self.cls.__name__} has no column "
+                            f"'{column}'.")
+        optional = _unwrap_optional(f.type) is not f.type
+        return f.name, _NESTED, _RowPlan(target, columns), optional
+
+    def build(self, row, validate, errors):
+        """Build an instance from a row, gathering its errors."""
+        values = {}
+        for name, kind, arg, extra in self.fields:
+            if kind is _COLUMN:
+                value = row[arg]
+                if name in self.converters:
+                    value = self._convert(name, value, errors)
+                if extra is not None and name not in errors:
+                    value = _nest_value(name, value, extra, errors)
+            elif kind is _NESTED:
+                value = self._build_nested(name, row, arg, extra, validate,
+                                           errors)
+            else:
+                value = arg()
+            values[name] = value
+        if validate and self.validate:
+            checkers = self.checkers
+            for name, value in values.items():
+                if name not in errors and name in checkers:
+                    checkers[name](value, errors)
+        elif not self.validate:
+            # Like cls(**row), invalid values are kept as they are given.
+            errors.clear()
+        return new_instance(self.cls, values)
+
+    def _convert(self, name, value, errors):
+        anno = self.cls.__dataclass_fields__[name].type
+        return convert_value(name, value, self.converters[name], anno, errors)
+
+    @staticmethod
+    def _build_nested(name, row, plan, optional, validate, errors):
+        # e.g. a LEFT JOIN without a match, or a flattened None.
+        if optional and all(row[i] is None for i in plan.indices):
+            return None
+        nested_errors: dict = {}
+        value = plan.build(row, validate, nested_errors)
+        if nested_errors:
+            errors[name] = nested_errors
+        return value
+
+
+def _nest_value(name, value, anno, errors):
+    """Nest a column value, e.g. into an enum member."""
+    if not isinstance(value, _ATOMIC_TYPES):
+        value = copy.deepcopy(value)  # nesting must not mutate the row
+    struct = {name: value}
+    nest_field(struct, name, anno, errors)
+    return struct[name]
+
+
+def _compile_row_plan(key):
+    cls, columns = key
+    if columns is None:
+        columns = _default_columns(cls, True)
+    return _RowPlan(cls, [(column, column.split('.'), index)
+                          for index, column in enumerate(columns)])
+
+
+# (class, columns) -> _RowPlan
+_row_plans = PlanCache(_compile_row_plan)
+
+
+def from_rows(cls, rows: ty.Iterable[ty.Sequence],
+              columns: ty.Iterable[str] = None, *,
+              validate: bool = True) -> ty.List:
+    """Build dataclass instances from flat tuples, e.g. rows of a DB cursor.
+
+    The columns are mapped to the fields once, after which the values are
+    taken from each row by position, without building keyword arguments or
+    copying them.
+
+    Example usage:
+
+      @dataclass(nest=True, validate=True)
+      class Person:
+          name: str
+          address: Optional[Address]
+
+      cursor = connection.execute('SELECT name, city FROM person')
+      people = from_rows(Person, cursor, ['name', 'address.city'])
+
+    Notes:
+        - Instances are created without running __init__ or __post_init__.
+        - Values are nested according to the flags of their class, e.g.
+          into enum members.
+        - An Optional nested instance is None if all of its columns are.
+        - Fields without a column get their defaults.
+
+    Args:
+        cls: dataclass to build.
+        rows: Iterable of sequences holding the values of the columns.
+        columns: Names of the columns, dotted ones for the fields of nested
+            instances, e.g. 'address.city'. Defaults to the ones of
+            iter_rows with flatten=True.
+        validate: Whether the values are validated according to the flags
+            of their class, False for trusted rows.
+
+    Raises:
+        TypeError: If a column does not lead to a field, or a required
+            field has no column.
+        NestedInitializationException: With the errors of each invalid row
+            under its position in rows.
+
+    Returns:
+        List of the instances.
+
+    """
+    plan = _row_plans[(cls, None if columns is None else tuple(columns))]
+    instances = []
+    errors: dict = {}
+    for i, row in enumerate(rows):
+        row_errors: dict = {}
+        instances.append(plan.build(row, validate, row_errors))
+        if row_errors:
+            errors[i] = row_errors
+    if errors:
+        raise NestedInitializationException(errors)
+    return instances
@@ -0,0 +1,346 @@
+from array import array
+from collections.abc import Mapping
+import copy
+from dataclasses import _is_dataclass_instance, fields, is_dataclass, MISSING
+from enum import Enum
+import typing as ty
+
+from c11h.dataclassutils.coercion import convert_value
+from c11h.dataclassutils.encoding import copy_leaf, encode_leaf
+from c11h.dataclassutils.nesting import _asdict_inner, may_nest, nest_field
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import new_instance
+from c11h.dataclassutils.util.plan_cache import PlanCache
+
+# typecodes of the array backed columns
+_ARRAY_TYPES = {int: 'q', float: 'd', bool: 'b'}
+# Range of the 'q' typecode.
+_INT_MIN, _INT_MAX = -2 ** 63, 2 ** 63 - 1
+# Values which need no copy, they are immutable.
+_ATOMIC_TYPES = (type(None), bool, int, float, complex, str, bytes, Enum)
+
+
+def _copy(value):
+    return value if isinstance(value, _ATOMIC_TYPES) else copy.deepcopy(value)
+
+
+class _Column:
+    """Storage plan of a single field of a table."""
+
+    __slots__ = ('name', 'field', 'typecode', 'members', 'ordinals',
+                 'nestable')
+
+    def __init__(self, f):
+        self.name = f.name
+        self.field = f
+        self.nestable = may_nest(f.type)
+        self.typecode: ty.Optional[str] = None
+        self.members: ty.Optional[list] = None
+        self.ordinals: ty.Optional[dict] = None
+        # Optional fields may hold values an array can't store.
+        if getattr(f, 'optional', False):
+            return
+        if isinstance(f.type, type) and issubclass(f.type, Enum):
+            self.typecode = 'I'
+            self.members = list(f.type)
+            self.ordinals = {m: i for i, m in enumerate(self.members)}
+        elif f.type in _ARRAY_TYPES:
+            self.typecode = _ARRAY_TYPES[f.type]
+
+    def new(self, values=()):
+        if self.typecode is None:
+            return list(values)
+        return array(self.typecode, values)
+
+    def fits(self, values) -> bool:
+        """Check if an array stores field values without changing them.
+
+        Values of another type, e.g. True in an int field, ints out of the
+        64 bit range, or values of classes without validation which are no
+        members of an Enum, can only be stored in a list.
+        """
+        if self.typecode is None:
+            return True
+        exact = self.field.type
+        if self.members is not None:
+            return all(type(v) is exact for v in values)
+        if any(type(v) is not exact for v in values):
+            return False
+        return exact is not int or not values or (
+            min(values) >= _INT_MIN and max(values) <= _INT_MAX)
+
+    def encode_all(self, values):
+        """Turn field values into what is stored in the column."""
+        if self.members is not None:
+            ordinals = self.ordinals
+            return [ordinals[v] for v in values]
+        return values
+
+    def decode(self, column, idx):
+        """Turn a stored value back into a copy of the field value."""
+        value = column[idx]
+        if type(column) is not array:
+            return _copy(value)
+        if self.members is not None:
+            return self.members[value]
+        if self.typecode == 'b':
+            return bool(value)
+        return value
+
+    def decode_all(self, column):
+        if type(column) is not array:
+            return [_copy(v) for v in column]
+        if self.members is not None:
+            members = self.members
+            return [members[v] for v in column]
+        if self.typecode == 'b':
+            return [bool(v) for v in column]
+        return column
+
+
+class Table:
+    """Column-oriented container for instances of a single dataclass.
+
+    Instead of one object per row, each field is stored in a column: an
+    array for int, float and bool fields, an array of ordinals for Enum
+    fields and a list for everything else. A column falls back to a list if
+    it is given values its array can't store as they are, e.g. ints beyond
+    64 bit. Rows are only turned into
+    instances of the dataclass when they get accessed.
+
+    Example usage:
+
+      @dataclass(nest=True, validate=True)
+      class Point:
+          x: int
+          y: int
+
+      points = Table[Point]([{'x': 1, 'y': 2}, {'x': 3, 'y': 4}])
+      assert points[1] == Point(3, 4)
+      assert points.asdict() == [{'x': 1, 'y': 2}, {'x': 3, 'y': 4}]
+
+    Notes:
+        - Instances are materialized without calling __init__ or
+          __post_init__, fields with init=False are set to their default.
+        - Rows are copies, changing a materialized instance does not change
+          the table.
+
+    """
+
+    _cls: ty.Any = None
+    _columns: ty.List[_Column] = []
+
+    def __class_getitem__(cls, dc):
+        if not is_dataclass(dc) or not isinstance(dc, type):
+            raise TypeError(f"Table can only hold dataclasses, not {dc}.")
+        return _specializations[dc]
+
+    def __init__(self, rows: ty.Iterable = ()):
+        """Create a table, optionally filled with rows, see extend."""
+        if self._cls is None:
+            raise TypeError("Table needs to be specialized, e.g. Table[A].")
+        self._data = [c.new() for c in self._columns]
+        if rows:
+            self.extend(rows)
+
+    def __len__(self):
+        return len(self._data[0]) if self._data else 0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(<{len(self)} rows>)'
+
+    def __iter__(self):
+        cls = self._cls
+        names = [c.name for c in self._columns]
+        decoded = [c.decode_all(d) for c, d in zip(self._columns, self._data)]
+        for values in zip(*decoded):
+            yield new_instance(cls, dict(zip(names, values)))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            table = self.__class__()
+            table._data = [d[idx] for d in self._data]
+            return table
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("Table index out of range")
+        return new_instance(self._cls, {
+            c.name: c.decode(d, idx)
+            for c, d in zip(self._columns, self._data)})
+
+    def column(self, name: str):
+        """Return the values of a field for all rows, as a list."""
+        for c, d in zip(self._columns, self._data):
+            if c.name == name:
+                return list(c.decode_all(d))
+        raise KeyError(f"{self._cls.__name__} has no field called '{name}'.")
+
+    def append(self, row):
+        """Add a single row, see extend."""
+        self.extend([row])
+
+    def extend(self, rows: ty.Iterable):
+        """Add rows to the table.
+
+        Rows may be instances of the dataclass, whose values are copied, or
+        dictionaries, which are handled like the keyword arguments of the
+        class: optional fields get defaulted, and nesting and validation
+        happen according to the flags of the class. Validation is done column
+        by column. If any row is invalid, none of them get added.
+
+        Args:
+            rows: Instances or dictionaries.
+
+        Raises:
+            NestedInitializationException: With the errors of each invalid
+                row under its position in rows.
+            TypeError: If a row is neither an instance nor a dictionary,
+                misses a required field, or holds unknown fields and
+                additional properties are not ignored.
+
+        """
+        columns = [[] for _ in self._columns]  # type: ty.List[list]
+        dict_rows = []
+        for i, row in enumerate(rows):
+            if _is_dataclass_instance(row) and type(row) is self._cls:
+                for c, values in zip(self._columns, columns):
+                    values.append(_copy(getattr(row, c.name)))
+            else:
+                dict_rows.append(i)
+                self._append_dict(row, columns)
+        errors: dict = {}
+        if dict_rows:
+            self._prepare_columns(columns, dict_rows, errors)
+        if errors:
+            raise NestedInitializationException(errors)
+        # Convert every column first, so a failure can't leave the columns
+        # with different lengths.
+        converted = []
+        for c, data, values in zip(self._columns, self._data, columns):
+            if type(data) is array and not c.fits(values):
+                data = list(c.decode_all(data))
+            if type(data) is array:
+                values = c.new(c.encode_all(values))
+            converted.append((data, values))
+        for k, (data, values) in enumerate(converted):
+            data.extend(values)
+            self._data[k] = data
+
+    def _append_dict(self, row, columns):
+        if not isinstance(row, Mapping):
+            raise TypeError(f"The rows of a table of {self._cls.__name__} "
+                            f"must be instances of it or dicts, not "
+                            f"'{type(row)}'.")
+        params = self._cls.__dataclass_params__
+        if not getattr(params, 'ignore_additional_properties', False):
+            unknown = row.keys() - {c.name for c in self._columns}
+            if unknown:
+                raise TypeError(f"{self._cls.__name__} got unexpected "
+                                f"fields {sorted(unknown)}.")
+        for c, values in zip(self._columns, columns):
+            f = c.field
+            if c.name in row and f.init:
+                values.append(row[c.name])
+            elif getattr(f, 'optional', False) and f.init:
+                values.append(copy.deepcopy(f.default_optional_value))
+            elif f.default is not MISSING:
+                values.append(f.default)
+            elif f.default_factory is not MISSING:  # type: ignore
+                values.append(f.default_factory())  # type: ignore
+            else:
+                raise TypeError(f"{self._cls.__name__} is missing the "
+                                f"required field '{c.name}'.")
+
+    def _prepare_columns(self, columns, dict_rows, errors):
+        """Nest and validate the values of dictionary rows, column-wise."""
+        params = self._cls.__dataclass_params__
+        nest = getattr(params, 'nest', False)
+        validate = getattr(params, 'validate', False)
+        checkers = getattr(self._cls, '__dataclass_checkers__', {})
+        converters = getattr(self._cls, '__dataclass_converters__', {})
+        for c, values in zip(self._columns, columns):
+            rows = dict_rows
+            if c.name in converters:
+                rows = _convert_column(c, converters[c.name], values, rows,
+                                       errors)
+            if nest and c.nestable:
+                converted, rows = rows, []
+                for i in converted:
+                    row_errors: dict = {}
+                    # Same as in _pre_init, nesting must not mutate the input.
+                    struct = {c.name: copy.deepcopy(values[i])}
+                    nest_field(struct, c.name, c.field.type, row_errors)
+                    values[i] = struct[c.name]
+                    if row_errors:
+                        errors.setdefault(i, {}).update(row_errors)
+                    else:
+                        rows.append(i)
+            check = checkers.get(c.name)
+            if not validate or check is None:
+                continue
+            column_errors = check.check_column([values[i] for i in rows])
+            for pos, field_errors in column_errors.items():
+                errors.setdefault(rows[pos], {})[c.name] = field_errors
+        if not validate:
+            errors.clear()
+
+    def asdict(self, *, dict_factory=dict, encode=False) -> ty.List:
+        """Export all rows like nesting.asdict would export each instance.
+
+        The export happens column by column, without materializing any
+        instances of the dataclass.
+        """
+        leaf = encode_leaf if encode else copy_leaf
+        exported = []
+        for c, data in zip(self._columns, self._data):
+            # Lists get copied by _asdict_inner.
+            values = c.decode_all(data) if type(data) is array else data
+            if c.members is not None:
+                converted = [leaf(v) for v in values]
+            elif type(data) is array:
+                converted = list(values)
+            else:
+                converted = [_asdict_inner(v, dict_factory, leaf=leaf)
+                             for v in values]
+            omit = None
+            if getattr(c.field, 'optional', False):
+                default = c.field.default_optional_value
+                omit = [v == default for v in values]
+            exported.append((c.name, converted, omit))
+        return [
+            dict_factory([(name, converted[i])
+                          for name, converted, omit in exported
+                          if omit is None or not omit[i]])
+            for i in range(len(self))]
+
+
+def _convert_column(c, converter, values, rows, errors):
+    """Convert the values of dictionary rows, see coercion.
+
+    Returns:
+        The rows whose values could be converted.
+
+    """
+    converted = []
+    for i in rows:
+        row_errors: dict = {}
+        values[i] = convert_value(c.name, values[i], converter, c.field.type,
+                                  row_errors)
+        if row_errors:
+            errors.setdefault(i, {}).update(row_errors)
+        else:
+            converted.append(i)
+    return converted
+
+
+def _specialize(dc):
+    return type(f'Table[{dc.__name__}]', (Table,), {
+        '_cls': dc,
+        '_columns': [_Column(f) for f in fields(dc)],
+    })
+
+
+# Specializations are created once, so that Table[A] is Table[A] holds even
+# if many threads use it for the first time at once.
+_specializations = PlanCache(_specialize)
@@ -1,4 +1,78 @@
-from typing import Dict
+import reprlib
+from typing import Dict, List
+
+# Longest rendering of a value in an error message.
+MAX_VALUE_LENGTH = 80
+
+_repr = reprlib.Repr()
+_repr.maxstring = _repr.maxother = MAX_VALUE_LENGTH
+
+
+def _short(value) -> str:
+    """Render a value for a message, without rendering all of a big one."""
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, (list, tuple, dict, set, frozenset)):
+        text = _repr.repr(value)
+    else:
+        text = str(value)
+    if len(text) > MAX_VALUE_LENGTH:
+        text = text[:MAX_VALUE_LENGTH - 3] + '...'
+    return text
+
+
+class ErrorRecord:
+    """A single error of a value, its message is only rendered on demand.
+
+    Records stand in for the message strings in the errors of a
+    NestedInitializationException, and compare equal to their message.
+    """
+
+    __slots__ = ('path', 'expected', 'value', '_message')
+
+    def __init__(self, expected=None, value=None, message: str = None,
+                 path: tuple = ()):
+        """Create a record.
+
+        Args:
+            expected: Type the value should have had, if it had the wrong
+                one.
+            value: The invalid value itself, not a copy of it.
+            message: Message of the error, rendered from the rest if None.
+            path: Keys leading to the value, see
+                NestedInitializationException.records.
+
+        """
+        self.expected = expected
+        self.value = value
+        self._message = message
+        self.path = path
+
+    @property
+    def actual(self):
+        """Type of the invalid value."""
+        return type(self.value)
+
+    def at(self, path: tuple) -> 'ErrorRecord':
+        """Return a copy of the record with the given path."""
+        return ErrorRecord(self.expected, self.value, self._message, path)
+
+    def __str__(self):
+        if self._message is None:
+            self._message = (f"'{_short(self.value)}' is of type "
+                             f"'{self.actual}' instead of '{self.expected}'")
+        return self._message
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        if isinstance(other, (str, ErrorRecord)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
 
 
 class NestedInitializationException(Exception):
@@ -11,3 +85,37 @@ class NestedInitializationException(Exception):
         recursively.
         """
         self.errors = errors
+
+    @property
+    def records(self) -> List[ErrorRecord]:
+        """Return all errors as records, with the path of each of them.
+
+        The path holds the keys leading to the error in errors, e.g.
+        ('items', 3, 'sku') for the sku of the fourth item.
+        """
+        records = []
+        stack = [((), self.errors)]
+        while stack:
+            path, errors = stack.pop()
+            for key, error in errors.items():
+                if isinstance(error, dict):
+                    stack.append((path + (key,), error))
+                elif isinstance(error, ErrorRecord):
+                    records.append(error.at(path + (key,)))
+                else:
+                    records.append(ErrorRecord(message=str(error),
+                                               path=path + (key,)))
+        return records
+
+    def messages(self) -> Dict:
+        """Return the errors with every record rendered to its message.
+
+        This is the form errors had before records were introduced, plain
+        nested dicts of strings, e.g. to be serialized as JSON.
+        """
+        return _render(self.errors)
+
+
+def _render(errors: Dict) -> Dict:
+    return {key: _render(error) if isinstance(error, dict) else str(error)
+            for key, error in errors.items()}
@@ -1,4 +1,6 @@
 from copy import deepcopy
+from dataclasses import fields, MISSING
+import typing as ty
 
 
 def ignore_additional_kwargs(cls, **kwargs):
@@ -9,3 +11,102 @@ def ignore_additional_kwargs(cls, **kwargs):
         if key not in expected_args:
             cleaned_kwargs.pop(key)
     return cleaned_kwargs
+
+
+def user_post_init(cls):
+    """Return the __post_init__ of a class without our wrapper, if any."""
+    post_init = getattr(cls, '__post_init__', None)
+    return getattr(post_init, '__wrapped__', post_init)
+
+
+def default_getter(f):
+    """Return the function producing the default of a field, or None."""
+    if getattr(f, 'optional', False):
+        return lambda: deepcopy(f.default_optional_value)
+    if f.default is not MISSING:
+        return lambda: f.default
+    if f.default_factory is not MISSING:  # type: ignore
+        return f.default_factory  # type: ignore
+    return None
+
+
+def _has_forward_refs(anno) -> bool:
+    if isinstance(anno, (str, ty.ForwardRef)):
+        return True
+    return any(_has_forward_refs(a) for a in getattr(anno, '__args__', ()))
+
+
+def forward_ref_hints(cls) -> ty.Dict:
+    """Resolve the forward references in the field annotations of a class.
+
+    Self-referencing dataclasses, e.g. a Node with children: List['Node'],
+    can only name themselves in strings. These are resolved in the globals
+    of the module of the class, or to the class itself.
+
+    Args:
+        cls: dataclass
+
+    Raises:
+        NameError: If a name can't be resolved.
+
+    Returns:
+        Dict mapping the names of the fields with forward references to
+        their resolved annotations.
+
+    """
+    unresolved = [f.name for f in fields(cls) if _has_forward_refs(f.type)]
+    if not unresolved:
+        return {}
+    hints = ty.get_type_hints(cls, localns={cls.__name__: cls})
+    return {name: hints[name] for name in unresolved}
+
+
+def new_instance(cls, values):
+    """Create a dataclass instance from its field values without __init__.
+
+    Neither __init__ nor __post_init__ are run, so the values are used as
+    they are, without being copied, nested or validated.
+
+    Args:
+        cls: dataclass
+        values: Dict with the value of each field.
+
+    Returns:
+        The new instance.
+
+    """
+    obj = cls.__new__(cls)
+    obj.__dict__.update(values)
+    return obj
+
+
+def path_tree(paths):
+    """Turn dotted field paths into a tree of field names.
+
+    List items are selected by the path of their list, a '[*]' may be used
+    to make that explicit, e.g. 'items[*].sku' and 'items.sku' are the same.
+
+    Example usage:
+
+      assert path_tree(['a.b', 'a.c', 'd']) == {'a': {'b': None, 'c': None},
+                                                'd': None}
+
+    Args:
+        paths: Iterable of dotted paths.
+
+    Returns:
+        Dict mapping each field name to the tree of its selected subfields,
+        or to None if the field is selected as a whole.
+
+    """
+    tree: dict = {}
+    for path in paths:
+        *parents, last = path.replace('[*]', '').split('.')
+        node = tree
+        for name in parents:
+            node = node.setdefault(name, {})
+            if node is None:
+                break  # the whole parent is selected already
+        else:
+            node[last] = None
+    return tree
@@ -0,0 +1,60 @@
+import threading
+import typing as ty
+
+# One lock for all caches: computing a value may fill other caches, e.g. the
+# codec of a list fills the one of its items, and a single reentrant lock
+# can't deadlock on that.
+_LOCK = threading.RLock()
+
+
+class PlanCache:
+    """Cache of values which are computed once per key, on first use.
+
+    Lookups of cached values don't take any lock. On a miss, the value is
+    computed under a lock, so it is computed at most once per key even if
+    many threads ask for it at the same time, and all of them get the same
+    object.
+
+    Example usage:
+
+      plans = PlanCache(compile_plan)
+      plan = plans[cls]
+
+    """
+
+    __slots__ = ('_factory', '_values')
+
+    def __init__(self, factory: ty.Callable):
+        """Create an empty cache.
+
+        Args:
+            factory: Called with a missing key, returns its value.
+
+        """
+        self._factory = factory
+        self._values: ty.Dict = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        with _LOCK:
+            # Another thread may have filled it while we were waiting.
+            try:
+                return self._values[key]
+            except KeyError:
+                value = self._factory(key)
+                self._values[key] = value
+                return value
+
+    def clear(self):
+        """Drop all values, e.g. after what they are computed from changed."""
+        with _LOCK:
+            self._values = {}
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __len__(self):
+        return len(self._values)
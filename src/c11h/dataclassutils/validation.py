@@ -1,10 +1,80 @@
+from asyncio import iscoroutinefunction
 from collections.abc import Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import fields
 from enum import Enum
+from functools import lru_cache
+from itertools import islice, repeat
 from logging import getLogger
-from typing import _SpecialForm, Callable, Dict, List, Union
+from typing import (_SpecialForm, Any, Callable, Dict, List, TypeVar,
+                    Union)
+
+from c11h.dataclassutils.util.exceptions import _short, ErrorRecord
 
 log = getLogger(__name__)
 
+# [limit, remaining] of the errors of the current initialization, if any.
+_error_budget: ContextVar = ContextVar('error_budget', default=None)
+
+
+@contextmanager
+def max_errors(limit: int):
+    """Stop validating once a number of errors has been found.
+
+    Applies to each initialization inside the block, including its nested
+    ones. Once the limit is reached, the values left are neither nested nor
+    validated, and the initialization fails with the errors found so far.
+    This bounds the time spent on rejecting huge, badly broken input.
+
+    Example usage:
+
+      with max_errors(10):
+          order = Order(**payload)
+
+    Args:
+        limit: Number of errors after which validation stops.
+
+    """
+    token = _error_budget.set([limit, limit])
+    try:
+        yield
+    finally:
+        _error_budget.reset(token)
+
+
+def reset_error_budget():
+    """Give a new outermost initialization the full error budget."""
+    budget = _error_budget.get()
+    if budget is not None:
+        budget[1] = budget[0]
+
+
+def _spend_errors(count):
+    budget = _error_budget.get()
+    if budget is not None:
+        budget[1] -= count
+
+
+def _within_budget(failures: Dict) -> Dict:
+    """Cut errors down to what is left of the budget, and spend it."""
+    budget = _error_budget.get()
+    if budget is not None and len(failures) > budget[1]:
+        failures = dict(islice(failures.items(), max(budget[1], 1)))
+    _spend_errors(len(failures))
+    return failures
+
+
+def error_limit_reached() -> bool:
+    """Check if the current initialization found max_errors errors."""
+    budget = _error_budget.get()
+    return budget is not None and budget[1] <= 0
+
+
+def _walk_limit_reached(mistakes) -> bool:
+    budget = _error_budget.get()
+    return budget is not None and len(mistakes) >= budget[1]
+
 
 def _type_walker(obj, f_name, f_type, actual_value,  # noqa: C901
                  mistakes, f_meta=None):
@@ -102,6 +172,8 @@ def _type_walker(obj, f_name, f_type, actual_value,  # noqa: C901
         try:
             for i in actual_value:
                 _type_walker(obj, f_name, l_type, i, mistakes)
+                if mistakes and _walk_limit_reached(mistakes):
+                    break
         except TypeError:
             # If object is not iterable just one more check will be applied.
             return _type_walker(obj, f_name, l_type, actual_value, mistakes)
@@ -122,6 +194,29 @@ def _type_walker(obj, f_name, f_type, actual_value,  # noqa: C901
             else:
                 if not isinstance(v, t_value):
                     mistakes.append((f_name, v, t_value))
+    elif given_type is tuple:
+        if not isinstance(actual_value, tuple):
+            mistakes.append((f_name, actual_value, tuple))
+            return
+        t_items = _tuple_item_types(f_type, actual_value)
+        if t_items is None:
+            mistakes.append((f_name, actual_value, f_type))
+            return
+        for t, i in zip(t_items, actual_value):
+            _type_walker(obj, f_name, t, i, mistakes)
+            if mistakes and _walk_limit_reached(mistakes):
+                break
+    elif given_type in (set, frozenset):
+        if not isinstance(actual_value, given_type):
+            mistakes.append((f_name, actual_value, given_type))
+            return
+        t_item = f_type.__args__[0]
+        if isinstance(t_item, TypeVar):
+            return  # untyped set, nothing to do
+        for i in actual_value:
+            _type_walker(obj, f_name, t_item, i, mistakes)
+            if mistakes and _walk_limit_reached(mistakes):
+                break
     elif given_type is Union:
         types = list(f_type.__args__)
         # Preprocessing to handle List as list
@@ -157,6 +252,24 @@ def _type_walker(obj, f_name, f_type, actual_value,  # noqa: C901
                   f"Field: '{f_name}', Type: '{f_type}'")
 
 
+def _tuple_item_types(f_type, actual_value):
+    """Return the annotations to check the items of a tuple value with.
+
+    Returns:
+        One annotation per item, or None if the value has the wrong length
+        for a fixed-length tuple annotation.
+
+    """
+    args = f_type.__args__
+    if not args:
+        return repeat(Any)  # untyped tuple
+    if len(args) == 2 and args[1] is Ellipsis:
+        return repeat(args[0])
+    if args == ((),):
+        args = ()
+    return args if len(args) == len(actual_value) else None
+
+
 def validate_types(obj, nest_errors: Dict):  # noqa: C901
     """Validate whether data field types are correct.
 
@@ -178,12 +291,15 @@ def validate_types(obj, nest_errors: Dict):  # noqa: C901
 
     """
     invalid_fields = nest_errors.keys()
-    type_errors: list = []
+    if error_limit_reached():
+        return
 
     for f_name, f_field in obj.__dataclass_fields__.items():
         # If the field to be validated has already failed in nesting we
         # should skip it.
         if f_name in invalid_fields:
+            if error_limit_reached():
+                return
             continue
         actual_value = getattr(obj, f_name)
         # Optional values with 'None' value must be skipped.
@@ -193,26 +309,64 @@ def validate_types(obj, nest_errors: Dict):  # noqa: C901
                 continue
         except AttributeError:
             pass  # The field is a regular field.
+        type_errors: list = []
         _type_walker(obj, f_name, f_field.type, actual_value, type_errors)
-    # Gather found errors
+        _record_type_errors(actual_value, type_errors, nest_errors)
+
+
+def _record_type_errors(value, type_errors, nest_errors: Dict):
+    """Gather the typing errors found for a field value into nest_errors.
+
+    Args:
+        value: Value of the field which has been checked.
+        type_errors: Errors as gathered by _type_walker.
+        nest_errors: Dict used to gather errors.
+
+    """
+    positions = None
     for n, a, t in type_errors:
-        # If the error happened in a list, we retrieve the position.
-        if isinstance(getattr(obj, n), list):
+        # If the error happened in a list or tuple, we retrieve the position.
+        if isinstance(value, (list, tuple)) and a is not value:
+            if positions is None:
+                # One pass over the value, instead of one per error.
+                positions = {}
+                for i, item in enumerate(value):
+                    positions.setdefault(id(item), i)
             try:
-                pos = getattr(obj, n).index(a)
-            except ValueError:
-                log.warning(f"The field {n} which contains the value {a} "
-                            f"could not be found in {getattr(obj, n)}. "
-                            f"The list path will not be collected.")
-                nest_errors[n] = (f"'{a}' is of type '{type(a)}'instead "
-                                  f"of '{t}' in a non retrievable position")
+                pos = positions[id(a)]
+            except KeyError:
+                log.warning(f"The field {n} which contains the value "
+                            f"{_short(a)} could not be found in "
+                            f"{_short(value)}. The list path will not be "
+                            f"collected.")
+                nest_errors[n] = ErrorRecord(t, a, (
+                    f"'{_short(a)}' is of type '{type(a)}' instead of "
+                    f"'{t}' in a non retrievable position"))
                 continue
             if n not in nest_errors:
                 nest_errors[n] = {}
-            nest_errors[n][pos] = (f"'{a}' is of type '{type(a)}'"
-                                   f"instead of '{t}'")
+            nest_errors[n][pos] = ErrorRecord(t, a)
         else:
-            nest_errors[n] = f"'{a}' is of type '{type(a)}' instead of '{t}'"
+            nest_errors[n] = ErrorRecord(t, a)
+    _spend_errors(len(type_errors))
+
+
+def _validator_list(f_field) -> List:
+    """Return the custom validators of a field as a list."""
+    validators = getattr(f_field, 'validators', None)
+    if not validators:
+        return []
+    return validators if isinstance(validators, List) else [validators]
+
+
+def _run_validators(f_name, validators, actual_value, nest_errors: Dict):
+    """Run custom validators on a field value and gather their errors."""
+    for validator in validators:
+        try:
+            validator(actual_value)
+        except AttributeError as e:
+            nest_errors[f_name] = str(e)
+            _spend_errors(1)
 
 
 def validate_fields(obj, nest_errors: Dict):
@@ -227,24 +381,19 @@ def validate_fields(obj, nest_errors: Dict):
 
     """
     invalid_fields = nest_errors.keys()
+    checkers = getattr(obj, '__dataclass_checkers__', None)
+    if checkers is None:
+        checkers = compile_checkers(type(obj))
 
-    for f_name, f_field in obj.__dataclass_fields__.items():
+    for f_name, checker in checkers.items():
+        if nest_errors and error_limit_reached():
+            return
         # If the field to be validated has already failed in nesting we
         # should skip it.
         if f_name in invalid_fields:
             continue
-        if getattr(f_field, 'validators', False):
-            actual_value = getattr(obj, f_name)
-            validators = (f_field.validators
-                          if isinstance(f_field.validators, List)
-                          else [f_field.validators])
-            for validator in validators:
-                try:
-                    validator(actual_value)
-                except AttributeError as e:
-                    if f_name not in nest_errors:
-                        nest_errors[f_name] = {}
-                    nest_errors[f_name] = str(e)
+        if checker.has_validators:
+            checker.run_validators(getattr(obj, f_name), nest_errors)
 
 
 def check_validators(cls):
@@ -264,9 +413,249 @@ def check_validators(cls):
                 if not isinstance(validator, Callable):  # type: ignore
                     e = f"The validator '{validator}' is not a callable."
                     errors.append((f_name, e))
+                elif (getattr(f_field, 'batch', False) and
+                      iscoroutinefunction(validator)):
+                    e = (f"The validator '{validator}' is a coroutine "
+                         f"function, those can't be batch validators.")
+                    errors.append((f_name, e))
+            cache = getattr(f_field, 'cache', None)
+            if cache is not None and (getattr(f_field, 'batch', False) or
+                                      not isinstance(cache, int) or
+                                      cache < 1):
+                e = (f"The cache size '{cache}' is invalid, it must be a "
+                     f"positive integer and can't be used with batch "
+                     f"validators.")
+                errors.append((f_name, e))
     if errors:
         msg = [f"{cls.__name__} contains faulty validators for "
                f"fields:"]
         for n, e in errors:
             msg.append(f"\t{n}: '{e}'")
         raise TypeError('\n'.join(msg))
+
+
+def _batch_failures(validator, values) -> Dict:
+    """Run a batch validator and return the errors by position in values.
+
+    A batch validator gets a list of values and returns the positions of
+    the invalid ones, or a dict mapping them to an error message. Raising an
+    AttributeError rejects all of them.
+    """
+    try:
+        failed = validator(values)
+    except AttributeError as e:
+        return {i: str(e) for i in range(len(values))}
+    if isinstance(failed, dict):
+        return {i: str(msg) for i, msg in failed.items()}
+    name = getattr(validator, '__name__', repr(validator))
+    return {i: f"'{_short(values[i])}' was rejected by '{name}'"
+            for i in failed}
+
+
+def _is_list_type(f_type):
+    """Check if an annotation is a typed list, or an optional one."""
+    if getattr(f_type, '__origin__', None) is Union:
+        return any(_is_list_type(t) for t in f_type.__args__)
+    return getattr(f_type, '__origin__', None) is list
+
+
+class _FieldChecker:
+    """Validation of a single field, with all lookups done up front.
+
+    Calling it runs the same checks as validate_types and validate_fields
+    do, but only for one field.
+    """
+
+    __slots__ = ('cls', 'name', 'type', 'optional', 'default_optional_value',
+                 'validators', 'async_validators', 'batch', 'per_item',
+                 'cached')
+
+    def __init__(self, cls, f_name, f_field):
+        self.cls = cls
+        self.name = f_name
+        self.type = f_field.type
+        self.optional = getattr(f_field, 'optional', False)
+        self.default_optional_value = getattr(f_field,
+                                              'default_optional_value', None)
+        validators = _validator_list(f_field)
+        # Coroutine validators can only run on the async construction path.
+        self.validators = [v for v in validators
+                           if not iscoroutinefunction(v)]
+        self.async_validators = [v for v in validators
+                                 if iscoroutinefunction(v)]
+        self.batch = getattr(f_field, 'batch', False)
+        # Batch validators of list fields validate the items of the list.
+        self.per_item = self.batch and _is_list_type(self.type)
+        self.cached = None
+        cache = getattr(f_field, 'cache', None)
+        if cache and self.validators:
+            self.cached = lru_cache(maxsize=cache, typed=True)(
+                self._last_error)
+
+    @property
+    def has_validators(self):
+        return bool(self.validators)
+
+    def __call__(self, actual_value, nest_errors: Dict):
+        """Gather the errors of a field value into nest_errors."""
+        self.check_type(actual_value, nest_errors)
+        if self.name not in nest_errors:
+            self.run_validators(actual_value, nest_errors)
+
+    def is_unset(self, actual_value) -> bool:
+        """Check if the value is the default of an optional field."""
+        return self.optional and actual_value == self.default_optional_value
+
+    def check_type(self, actual_value, nest_errors: Dict):
+        # Optional values with their default value are not type checked.
+        if self.is_unset(actual_value):
+            return
+        type_errors: list = []
+        _type_walker(self.cls, self.name, self.type, actual_value,
+                     type_errors)
+        _record_type_errors(actual_value, type_errors, nest_errors)
+
+    def _last_error(self, actual_value):
+        """Run the validators like _run_validators, without gathering.
+
+        Returns:
+            Tuple of the message of the last failure, which is the one
+            _run_validators keeps, or None, and the number of failures. The
+            error budget is spent by the caller, also for cached results.
+
+        """
+        msg = None
+        failures = 0
+        for validator in self.validators:
+            try:
+                validator(actual_value)
+            except AttributeError as e:
+                msg = str(e)
+                failures += 1
+        return msg, failures
+
+    def cache_info(self):
+        """Return hit and miss statistics of the cache, if there is one."""
+        return self.cached.cache_info() if self.cached is not None else None
+
+    def run_validators(self, actual_value, nest_errors: Dict):
+        # Nor are they validated, validators can't be expected to take them.
+        if self.is_unset(actual_value):
+            return
+        if self.cached is not None:
+            self._run_cached(actual_value, nest_errors)
+        elif not self.batch:
+            _run_validators(self.name, self.validators, actual_value,
+                            nest_errors)
+        else:
+            self._run_batch(actual_value, nest_errors)
+
+    def _run_cached(self, actual_value, nest_errors: Dict):
+        try:
+            hash(actual_value)
+        except TypeError:
+            msg, failures = self._last_error(actual_value)
+        else:
+            msg, failures = self.cached(actual_value)
+        if msg is not None:
+            nest_errors[self.name] = msg
+            _spend_errors(failures)
+
+    def _run_batch(self, actual_value, nest_errors: Dict):
+        for validator in self.validators:
+            if nest_errors and error_limit_reached():
+                return  # see max_errors
+            if self.per_item and isinstance(actual_value, list):
+                failures = _within_budget(_batch_failures(validator,
+                                                          actual_value))
+                for i, msg in failures.items():
+                    nest_errors.setdefault(self.name, {})[i] = msg
+            else:
+                failures = _batch_failures(validator, [actual_value])
+                if failures:
+                    nest_errors[self.name] = failures[0]
+                    _spend_errors(1)
+
+    def check_column(self, values: List) -> Dict:
+        """Validate the values of this field for many instances at once.
+
+        Batch validators are called once for the whole column, instead of
+        once per instance.
+
+        Args:
+            values: Field values, one per instance.
+
+        Returns:
+            Dict mapping the position of each invalid value to its errors,
+            in the form they would have under the field name in nest_errors.
+
+        """
+        errors: dict = {}
+        valid = []
+        for i, value in enumerate(values):
+            value_errors: dict = {}
+            self.check_type(value, value_errors)
+            if value_errors:
+                errors[i] = value_errors[self.name]
+            elif not self.batch:
+                self.run_validators(value, value_errors)
+                if value_errors:
+                    errors[i] = value_errors[self.name]
+            elif not self.is_unset(value):
+                valid.append(i)
+        if self.batch and valid:
+            self._check_batch_column(values, valid, errors)
+        return errors
+
+    def _check_batch_column(self, values, valid, errors):
+        if not self.per_item:
+            column = [values[i] for i in valid]
+            for validator in self.validators:
+                for pos, msg in _batch_failures(validator, column).items():
+                    errors[valid[pos]] = msg
+            return
+        # Flatten the lists of all instances into a single column.
+        column = []
+        owners = []
+        for i in valid:
+            if isinstance(values[i], list):
+                column.extend(values[i])
+                owners.extend((i, idx) for idx in range(len(values[i])))
+        for validator in self.validators:
+            for pos, msg in _batch_failures(validator, column).items():
+                i, idx = owners[pos]
+                errors.setdefault(i, {})[idx] = msg
+
+
+def compile_checkers(cls, cls_fields=None) -> Dict:
+    """Build the field checkers of a dataclass.
+
+    Args:
+        cls: dataclass
+        cls_fields: Fields to build the checkers of, instead of the ones of
+            the class, e.g. with resolved annotations.
+
+    Returns:
+        Dict mapping each field name to its checker. A checker is called
+        with a field value and a dict which its errors get gathered in.
+
+    """
+    if cls_fields is None:
+        cls_fields = fields(cls)
+    return {f.name: _FieldChecker(cls, f.name, f) for f in cls_fields}
+
+
+def validator_cache_info(cls) -> Dict:
+    """Return the statistics of the validator caches of a dataclass.
+
+    Args:
+        cls: dataclass
+
+    Returns:
+        Dict mapping the name of each field with a validator cache to the
+        functools.lru_cache statistics of it.
+
+    """
+    return {name: checker.cache_info()
+            for name, checker in cls.__dataclass_checkers__.items()
+            if checker.cached is not None}
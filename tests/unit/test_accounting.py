@@ -0,0 +1,70 @@
+import gc
+import json
+import subprocess
+import sys
+from typing import List
+
+from c11h.dataclassutils import dataclass, evolve
+from c11h.dataclassutils.accounting import (
+    construction_phases, deep_size, instance_counts)
+
+
+@dataclass(nest=True, validate=True, account=True)
+class Line:
+    sku: str
+    tags: List[str]
+
+
+@dataclass(nest=True, validate=True, account=True)
+class Invoice:
+    lines: List[Line]
+
+
+def test_instance_counts():
+    gc.collect()
+    before = instance_counts().get(Line, {'created': 0, 'live': 0})
+    invoice = Invoice(**{'lines': [{'sku': 'a', 'tags': []},
+                                   {'sku': 'b', 'tags': []}]})
+    changed = evolve(invoice.lines[0], sku='c')
+    counts = instance_counts()[Line]
+    assert counts['created'] - before['created'] == 3
+    assert counts['live'] - before['live'] == 3
+    del invoice, changed
+    gc.collect()
+    assert instance_counts()[Line]['live'] == before['live']
+
+
+def test_deep_size_counts_shared_objects_once():
+    def tags():
+        return [''.join(['x'] * 100)]
+    shared_tags = tags()
+    shared = Invoice([Line('a', shared_tags), Line('b', shared_tags)])
+    separate = Invoice([Line('a', tags()), Line('b', tags())])
+    shared_size = deep_size(shared)
+    assert shared_size['classes'][Line]['instances'] == 2
+    assert shared_size['classes'][Invoice]['instances'] == 1
+    assert shared_size['bytes'] < deep_size(separate)['bytes']
+    assert shared_size['bytes'] == sum(
+        entry['bytes'] for entry in shared_size['classes'].values())
+
+
+def test_construction_phases():
+    phases = construction_phases(
+        Invoice, {'lines': [{'sku': 'a', 'tags': ['t']}]}, number=5)
+    assert set(phases) == {'copy', 'nest', 'validate', 'init', 'other'}
+    assert phases['copy'] > 0
+
+
+def test_memory_report(tmpdir):
+    sample = tmpdir.join('sample.json')
+    sample.write(json.dumps([{'lines': [{'sku': 'a', 'tags': []}]}]))
+    # In a subprocess, since the CLI configures the logging on import.
+    result = subprocess.run(
+        [sys.executable, '-m', 'c11h.dataclassutils', 'memory-report',
+         str(sample), '--cls', 'tests.unit.test_accounting:Invoice',
+         '--number', '2'],
+        stdout=subprocess.PIPE, universal_newlines=True)
+    assert result.returncode == 0
+    assert '1 Invoice instances hold' in result.stdout
+    assert 'Line' in result.stdout
+    assert 'validate' in result.stdout
@@ -0,0 +1,112 @@
+import asyncio
+from typing import List
+
+import pytest
+from tests.unit.util.validator_functions import is_greater_0
+
+from c11h.dataclassutils import acreate, dataclass, field
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+KNOWN_SKUS = {'a', 'b'}
+running = {'now': 0, 'max': 0}
+
+
+async def known_sku(sku):
+    running['now'] += 1
+    running['max'] = max(running['max'], running['now'])
+    await asyncio.sleep(0.01)
+    running['now'] -= 1
+    if sku not in KNOWN_SKUS:
+        raise AttributeError(f"Unknown SKU {sku}.")
+
+
+async def never_answers(value):
+    await asyncio.sleep(10)
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str = field(validators=[known_sku])
+    amount: int = field(validators=is_greater_0, default=1)
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    items: List[Item]
+
+
+async def rejects_all(value):
+    raise AttributeError("Rejected.")
+
+
+@dataclass(nest=True, validate=True)
+class Shipment:
+    item: Item = field(validators=rejects_all)
+
+
+@dataclass(nest=True, validate=True)
+class Slow:
+    a: int = field(validators=never_answers)
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+@pytest.fixture(autouse=True)
+def reset_running():
+    running.update(now=0, max=0)
+
+
+def test_sync_construction_skips_async_validators():
+    assert Item('unknown')
+
+
+def test_acreate():
+    order = run(acreate(Order, items=[{'sku': 'a'}, {'sku': 'b'}]))
+    assert order.items[1].sku == 'b'
+    assert running['max'] == 2
+
+
+def test_acreate_errors():
+    items = [{'sku': 'a'}, {'sku': 'x'}, {'sku': 'y'}]
+    with pytest.raises(NestedInitializationException) as e:
+        run(acreate(Order, items=items))
+    assert set(e.value.errors['items']) == {1, 2}
+    assert e.value.errors['items'][1]['sku'] == 'Unknown SKU x.'
+
+
+def test_acreate_sync_and_async_errors():
+    with pytest.raises(NestedInitializationException) as e:
+        run(acreate(Order, items=[{'sku': 'x', 'amount': -1},
+                                  {'sku': 1}, {'sku': 'y'}]))
+    errors = e.value.errors['items']
+    assert sorted(errors[0]) == ['amount', 'sku']
+    assert errors[0]['sku'] == 'Unknown SKU x.'
+    assert list(errors[1]) == ['sku']  # the type error, not validated
+    assert errors[2]['sku'] == 'Unknown SKU y.'
+
+
+def test_acreate_parent_and_child_errors():
+    with pytest.raises(NestedInitializationException) as e:
+        run(acreate(Shipment, item={'sku': 'x'}))
+    assert e.value.errors == {'item': {'sku': 'Unknown SKU x.'}}
+
+
+def test_acreate_concurrency_limit():
+    items = [{'sku': 'a'}] * 10
+    run(acreate(Order, items=items, max_concurrency=3))
+    assert running['max'] == 3
+
+
+def test_acreate_timeout():
+    with pytest.raises(NestedInitializationException) as e:
+        run(acreate(Slow, a=1, timeout=0.01))
+    assert 'never_answers' in e.value.errors['a']
+
+
+def test_async_batch_validators_are_rejected():
+    with pytest.raises(TypeError):
+        @dataclass(validate=True)
+        class Invalid:
+            a: int = field(validators=known_sku, batch=True)
@@ -0,0 +1,57 @@
+from typing import List
+from unittest import mock
+
+import pytest
+from tests.unit.util.validator_functions import all_greater_0
+
+from c11h.dataclassutils import dataclass, field
+from c11h.dataclassutils.table import Table
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+counting_validator = mock.Mock(side_effect=all_greater_0)
+
+
+def odd_with_messages(values):
+    return {i: f'{v} is even' for i, v in enumerate(values) if v % 2 == 0}
+
+
+@dataclass(nest=True, validate=True)
+class Batched:
+    a: int = field(validators=counting_validator, batch=True)
+    b: List[int] = field(validators=[all_greater_0, odd_with_messages],
+                         batch=True)
+
+
+@pytest.fixture(autouse=True)
+def reset_counter():
+    counting_validator.reset_mock()
+
+
+def test_single_instance():
+    assert Batched(1, [1, 3])
+    counting_validator.assert_called_once_with([1])
+    with pytest.raises(NestedInitializationException) as e:
+        Batched(-1, [1, -1, 2])
+    assert e.value.errors['a']
+    assert set(e.value.errors['b']) == {1, 2}
+    assert e.value.errors['b'][2] == '2 is even'
+
+
+def test_column():
+    rows = [{'a': i, 'b': [1, 3]} for i in range(-1, 100)]
+    rows[2]['b'] = [1, -1]
+    with pytest.raises(NestedInitializationException) as e:
+        Table[Batched](rows)
+    counting_validator.assert_called_once()
+    assert set(e.value.errors) == {0, 2}
+    assert e.value.errors[0]['a']
+    assert e.value.errors[2]['b'][1]
+
+
+def test_column_type_errors():
+    rows = [{'a': 'x', 'b': [1]}, {'a': 1, 'b': [1]}]
+    with pytest.raises(NestedInitializationException) as e:
+        Table[Batched](rows)
+    # the value with the wrong type never reaches the validator
+    counting_validator.assert_called_once_with([1])
+    assert list(e.value.errors) == [0]
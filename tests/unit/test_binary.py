@@ -0,0 +1,161 @@
+from enum import Enum
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass, field
+from c11h.dataclassutils.binary import dumps, loads
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+class Color(Enum):
+    red = 'r'
+    blue = 'b'
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    price: float
+    amount: int
+    color: Color
+    tags: List[str]
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+    paid: bool
+    items: List[Item]
+    meta: Dict[str, int]
+    note: Optional[str]
+    code: Union[int, str]
+    raw: bytes = field(optional=True, default_optional_value=b'')
+
+
+@pytest.fixture
+def order():
+    return Order(**{'id': 1, 'paid': True, 'meta': {'a': 1},
+                    'code': 'x', 'raw': b'\x00\x01',
+                    'items': [{'sku': 'a', 'price': 1.5, 'amount': 2,
+                               'color': 'r', 'tags': []},
+                              {'sku': 'b', 'price': 0.0, 'amount': -1,
+                               'color': 'b', 'tags': ['t']}]})
+
+
+def test_roundtrip(order):
+    data = dumps(order)
+    assert isinstance(data, bytes)
+    assert loads(Order, data) == order
+    assert loads(Order, data, validate=False) == order
+
+
+def test_optional_bitmap(order):
+    full = dumps(order)
+    empty = Order(**{'id': 1, 'paid': True, 'meta': {}, 'code': 1,
+                     'items': []})
+    data = dumps(empty)
+    assert len(data) < len(full)
+    decoded = loads(Order, data)
+    assert decoded == empty
+    assert asdict(decoded) == asdict(empty)
+
+
+def test_malformed(order):
+    data = dumps(order)
+    with pytest.raises(ValueError):
+        loads(Order, data[:-3])
+    with pytest.raises(ValueError):
+        loads(Order, data + b'\x00')
+
+
+def test_unencodable_values(order):
+    order.items[1].amount = 2 ** 70
+    with pytest.raises(ValueError):
+        dumps(order)
+    order.items[1].amount = 'not an int'
+    with pytest.raises(ValueError):
+        dumps(order)
+    order.items[1].amount = 1
+    order.items[0].sku = 5
+    with pytest.raises(ValueError, match="'items.sku' of Order"):
+        dumps(order)
+
+
+def test_unsupported_nested():
+    @dataclass
+    class Untyped:
+        a: List
+
+    @dataclass
+    class Holder:
+        inner: Untyped
+
+    with pytest.raises(TypeError):
+        dumps(Holder(Untyped([])))
+
+
+def test_decoded_validation():
+    @dataclass(nest=True, validate=True)
+    class Positive:
+        a: int = field(validators=_is_positive)
+
+    @dataclass(nest=True, validate=True)
+    class Holder:
+        items: List[Positive]
+
+    data = dumps(Holder([Positive(1), Positive(2)]))
+    # -1 and 1 have the same size, so the data stays well-formed
+    tampered = data.replace((2).to_bytes(8, 'little'),
+                            (-2).to_bytes(8, 'little', signed=True))
+    assert loads(Holder, tampered, validate=False).items[1].a == -2
+    with pytest.raises(NestedInitializationException) as e:
+        loads(Holder, tampered)
+    assert e.value.errors['items'][1]['a']
+
+
+def test_unsupported():
+    @dataclass
+    class Untyped:
+        a: List
+
+    with pytest.raises(TypeError):
+        dumps(Untyped([]))
+
+
+def _is_positive(i):
+    if i < 0:
+        raise AttributeError("negative")
+
+
+@dataclass(nest=True, validate=True, frozen=True)
+class Tag:
+    name: str
+
+
+@dataclass(nest=True, validate=True)
+class Tagged:
+    tags: FrozenSet[Tag]
+    scores: Tuple[int, ...]
+    pair: Tuple[str, float]
+    ids: Set[int]
+
+
+def test_immutable_collections():
+    obj = Tagged(**{'tags': [{'name': 'a'}, {'name': 'b'}],
+                    'scores': [1, 2], 'pair': ['x', 1.5], 'ids': [3]})
+    decoded = loads(Tagged, dumps(obj))
+    assert decoded == obj
+    assert isinstance(decoded.scores, tuple)
+    assert isinstance(decoded.tags, frozenset)
+
+
+@dataclass(nest=True, validate=True)
+class Coded:
+    code: Optional[Union[int, str]]
+    alt: Union[None, int, str] = field(optional=True)
+
+
+def test_optional_unions():
+    for obj in (Coded(1, 'a'), Coded('x'), Coded(None, 2)):
+        assert loads(Coded, dumps(obj)) == obj
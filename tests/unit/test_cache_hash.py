@@ -0,0 +1,78 @@
+import copy
+import pickle
+from typing import Tuple
+
+import pytest
+
+from c11h.dataclassutils import dataclass, evolve
+from c11h.dataclassutils.re_wrap import HASH_ATTR
+
+
+@dataclass(nest=True, validate=True, frozen=True, cache_hash=True)
+class Leaf:
+    name: str
+
+
+@dataclass(nest=True, validate=True, frozen=True, cache_hash=True)
+class Node:
+    value: int
+    leaves: Tuple[Leaf, ...]
+
+
+@pytest.fixture
+def node():
+    return Node(**{'value': 1, 'leaves': [{'name': 'a'}, {'name': 'b'}]})
+
+
+def test_hash_is_cached(node, monkeypatch):
+    h = hash(node)
+    assert getattr(node, HASH_ATTR) == h
+    assert getattr(node.leaves[0], HASH_ATTR) == hash(node.leaves[0])
+    monkeypatch.setattr(Node, 'value', property(lambda self: 1 / 0),
+                        raising=False)
+    assert hash(node) == h  # the fields are not read again
+
+
+def test_equality(node):
+    other = Node(**{'value': 1, 'leaves': [{'name': 'a'}, {'name': 'b'}]})
+    assert node == other
+    hash(node)
+    assert node == other  # only one side has a hash
+    hash(other)
+    assert node == other
+    assert node != Node(**{'value': 2, 'leaves': []})
+    assert len({node, other}) == 1
+
+
+def test_differing_hashes_short_circuit(node):
+    other = Node(**{'value': 1, 'leaves': [{'name': 'a'}, {'name': 'b'}]})
+    object.__setattr__(node, HASH_ATTR, 1)
+    object.__setattr__(other, HASH_ATTR, 2)
+    assert node != other
+
+
+def test_evolve_and_copies_drop_the_hash(node):
+    hash(node)
+    changed = evolve(node, value=2)
+    assert not hasattr(changed, HASH_ATTR)
+    assert hash(changed) == hash(Node(value=2, leaves=node.leaves))
+    assert not hasattr(copy.deepcopy(node), HASH_ATTR)
+    restored = pickle.loads(pickle.dumps(node))
+    assert not hasattr(restored, HASH_ATTR)
+    assert restored == node
+
+
+def test_slots_without_room():
+    @dataclass(frozen=True, cache_hash=True)
+    class Slotted:
+        __slots__ = ('a',)
+        a: int
+
+    assert hash(Slotted(1)) == hash(Slotted(1))
+
+
+def test_requires_frozen():
+    with pytest.raises(ValueError, match='frozen'):
+        @dataclass(cache_hash=True)
+        class A:
+            a: int
@@ -0,0 +1,120 @@
+from typing import Dict, List, Tuple
+from unittest import mock
+
+import pytest
+from tests.unit.util.validator_functions import is_greater_0
+
+from c11h.dataclassutils import dataclass, field, max_errors
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.validation import validator_cache_info
+
+expensive = mock.Mock(side_effect=is_greater_0)
+
+
+def not_empty(values):
+    if not values:
+        raise AttributeError("The list is empty.")
+
+
+@dataclass(validate=True)
+class Cached:
+    a: int = field(validators=expensive, cache=2)
+    b: List[int] = field(validators=not_empty, cache=10,
+                         default_factory=lambda: [1])
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    expensive.reset_mock()
+    Cached.__dataclass_checkers__['a'].cached.cache_clear()
+
+
+def test_cache_hits():
+    for _ in range(3):
+        Cached(1)
+    assert expensive.call_count == 1
+    info = validator_cache_info(Cached)['a']
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_cache_remembers_failures():
+    for _ in range(2):
+        with pytest.raises(NestedInitializationException) as e:
+            Cached(-1)
+        assert e.value.errors['a']
+    assert expensive.call_count == 1
+
+
+def test_cache_is_bounded():
+    for i in (1, 2, 3, 1):
+        Cached(i)
+    assert expensive.call_count == 4
+
+
+def test_unhashable_values_skip_the_cache():
+    Cached(1, [1])
+    with pytest.raises(NestedInitializationException):
+        Cached(1, [])
+    info = validator_cache_info(Cached)['b']
+    assert (info.hits, info.misses) == (0, 0)
+
+
+def test_unhashable_values():
+    @dataclass(validate=True)
+    class Unhashable:
+        a: Dict[str, List[int]] = field(validators=not_empty, cache=2)
+        b: Tuple[List[int], ...] = field(validators=not_empty, cache=2)
+
+    Unhashable({'x': [1]}, ([1],))
+    with pytest.raises(NestedInitializationException) as e:
+        Unhashable({}, ())
+    assert list(e.value.errors) == ['a', 'b']
+    info = validator_cache_info(Unhashable)
+    assert (info['a'].hits, info['a'].misses) == (0, 0)
+    assert info['b'].misses == 1  # only the empty tuple is hashable
+
+
+def test_cached_failures_spend_the_error_budget():
+    for _ in range(2):
+        with max_errors(1):
+            with pytest.raises(NestedInitializationException) as e:
+                Cached(-1, [])
+        assert list(e.value.errors) == ['a']
+    assert validator_cache_info(Cached)['a'].hits == 1
+
+
+def too_long(values):
+    if len(values) > 2:
+        raise AttributeError("The list is too long.")
+
+
+def no_duplicates(values):
+    if len(set(values)) < len(values):
+        raise AttributeError("The list has duplicates.")
+
+
+@dataclass(validate=True)
+class Twice:
+    cached: Tuple[int, ...] = field(validators=[too_long, no_duplicates],
+                                    cache=10)
+    uncached: Tuple[int, ...] = field(validators=[too_long, no_duplicates])
+
+
+def test_two_failing_validators():
+    for _ in range(2):
+        with pytest.raises(NestedInitializationException) as e:
+            Twice((1, 1, 1), (1, 1, 1))
+        assert e.value.errors['cached'] == e.value.errors['uncached'] == (
+            "The list has duplicates.")
+        assert len(e.value.records) == 2
+    with max_errors(2):
+        with pytest.raises(NestedInitializationException) as e:
+            Twice((1, 1, 1), (1, 1, 1))
+    assert list(e.value.errors) == ['cached']
+
+
+def test_invalid_cache():
+    with pytest.raises(TypeError):
+        @dataclass(validate=True)
+        class Invalid:
+            a: int = field(validators=is_greater_0, cache=0)
@@ -0,0 +1,123 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional
+from uuid import UUID
+
+import pytest
+
+from c11h.dataclassutils import dataclass, evolve, field, from_rows
+from c11h.dataclassutils.raw_validation import validate_dict
+from c11h.dataclassutils.table import Table
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+ID = '12345678-1234-5678-1234-567812345678'
+
+
+@dataclass(nest=True, validate=True, coerce=True)
+class Line:
+    sku: str
+    quantity: int
+    price: Decimal
+
+
+@dataclass(nest=True, validate=True, coerce=True)
+class Order:
+    id: UUID
+    created: datetime
+    due: date
+    paid: bool
+    total: float
+    lines: List[Line]
+    counts: Dict[str, int]
+    note: Optional[int] = field(optional=True)
+
+
+@dataclass(validate=True, coerce=True)
+class Flat:
+    a: int
+    b: bool
+
+
+@pytest.fixture
+def data():
+    return {'id': ID, 'created': '2024-01-02T03:04:05Z', 'due': '2024-02-01',
+            'paid': 'yes', 'total': '9.5', 'counts': {'a': '1'},
+            'lines': [{'sku': 'x', 'quantity': '2', 'price': '4.75'}]}
+
+
+def test_coerce(data):
+    order = Order(**data)
+    assert order.id == UUID(ID)
+    assert order.created == datetime(2024, 1, 2, 3, 4, 5,
+                                     tzinfo=timezone.utc)
+    assert order.due == date(2024, 2, 1)
+    assert order.paid is True
+    assert order.total == 9.5
+    assert order.lines == [Line('x', 2, Decimal('4.75'))]
+    assert order.counts == {'a': 1}
+    assert order.note is None
+
+
+def test_optional(data):
+    assert Order(**data, note='3').note == 3
+    assert Order(**data, note=None).note is None
+
+
+def test_conversion_errors(data):
+    data['total'] = 'much'
+    data['lines'][0]['quantity'] = 'two'
+    with pytest.raises(NestedInitializationException) as e:
+        Order(**data)
+    errors = e.value.messages()
+    assert "could not be converted" in errors['total']
+    assert list(errors['lines'][0]) == ['quantity']
+
+
+def test_without_nesting():
+    assert Flat('1', 'off') == Flat(1, False)
+    with pytest.raises(NestedInitializationException) as e:
+        Flat('1', 'maybe')
+    assert list(e.value.errors) == ['b']
+
+
+def test_values_which_are_left_to_validation():
+    with pytest.raises(NestedInitializationException) as e:
+        Flat(1.5, 2)
+    assert list(e.value.errors) == ['a', 'b']
+
+
+def test_converter():
+    @dataclass(validate=True)
+    class Ids:
+        ids: List[int] = field(
+            converter=lambda v: [int(i) for i in v.split(',')])
+
+    assert Ids('1,2').ids == [1, 2]
+    with pytest.raises(NestedInitializationException):
+        Ids('1,a')
+
+
+def test_converters_are_resolved_once():
+    assert set(Flat.__dataclass_converters__) == {'a', 'b'}
+    assert set(Line.__dataclass_converters__) == {'quantity', 'price'}
+
+
+def test_validate_dict(data):
+    assert validate_dict(Order, data) == {}
+    data['due'] = 'soon'
+    assert list(validate_dict(Order, data)) == ['due']
+
+
+def test_evolve(data):
+    order = evolve(Order(**data), paid='no', total='1')
+    assert order.paid is False
+    assert order.total == 1.0
+
+
+def test_rows_and_table():
+    assert from_rows(Flat, [('1', 'true')], ['a', 'b']) == [Flat(1, True)]
+    table = Table[Line]([{'sku': 'x', 'quantity': '2', 'price': '1'}])
+    assert table[0] == Line('x', 2, Decimal(1))
+    with pytest.raises(NestedInitializationException) as e:
+        table.append({'sku': 'x', 'quantity': 'a', 'price': '1'})
+    assert list(e.value.errors[0]) == ['quantity']
@@ -0,0 +1,76 @@
+from typing import FrozenSet, Set, Tuple
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+@dataclass(nest=True, validate=True, frozen=True)
+class Point:
+    x: int
+
+
+@dataclass(nest=True, validate=True)
+class Shape:
+    points: Tuple[Point, ...]
+    pair: Tuple[Point, int]
+    marks: FrozenSet[Point]
+    seen: Set[Point]
+
+
+def test_nesting():
+    shape = Shape(**{'points': [{'x': 1}, {'x': 2}],
+                     'pair': [{'x': 3}, 4],
+                     'marks': [{'x': 1}, {'x': 1}],
+                     'seen': iter([{'x': 5}])})
+    assert shape.points == (Point(1), Point(2))
+    assert shape.pair == (Point(3), 4)
+    assert shape.marks == frozenset([Point(1)])
+    assert shape.seen == {Point(5)}
+
+
+def test_already_built():
+    shape = Shape((Point(1),), (Point(2), 3), frozenset(), set())
+    assert shape.points == (Point(1),)
+
+
+def test_nested_errors():
+    with pytest.raises(NestedInitializationException) as e:
+        Shape(**{'points': [{'x': 1}, {'x': 'a'}], 'pair': [{'x': 3}, 4],
+                 'marks': [], 'seen': []})
+    assert list(e.value.errors) == ['points']
+    assert 'x' in e.value.errors['points'][1]
+
+
+def test_wrong_item_type():
+    with pytest.raises(NestedInitializationException) as e:
+        Shape((Point(1), 2), (Point(2), '3'), frozenset(), {1})
+    errors = e.value.errors
+    assert set(errors['points']) == {1}
+    assert set(errors['pair']) == {1}
+    assert 'seen' in errors
+
+
+def test_fixed_length():
+    with pytest.raises(NestedInitializationException) as e:
+        Shape((), [{'x': 1}], frozenset(), set())
+    assert 'pair' in e.value.errors
+
+
+def test_wrong_container():
+    with pytest.raises(NestedInitializationException) as e:
+        Shape(Point(1), (Point(2), 3), frozenset(), set())
+    assert 'points' in e.value.errors
+
+
+def test_unhashable_items():
+    with pytest.raises(NestedInitializationException) as e:
+        Shape((), (Point(2), 3), [[1]], set())
+    assert 0 in e.value.errors['marks']
+
+
+def test_asdict():
+    shape = Shape((Point(1),), (Point(2), 3), frozenset([Point(4)]), set())
+    assert asdict(shape) == {'points': ({'x': 1},), 'pair': ({'x': 2}, 3),
+                             'marks': [{'x': 4}], 'seen': set()}
@@ -0,0 +1,83 @@
+from enum import Enum
+from typing import List, Optional
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass, diff, field, patch
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+class Color(Enum):
+    red = 'r'
+    blue = 'b'
+
+
+@dataclass(nest=True, validate=True)
+class Address:
+    city: str
+    zip: Optional[str]
+
+
+@dataclass(nest=True, validate=True)
+class Person:
+    name: str
+    color: Color
+    address: Address
+    friends: List[Address]
+    nick: str = field(optional=True, default_optional_value='')
+
+
+@pytest.fixture
+def data():
+    return {'name': 'pepe', 'color': 'r',
+            'address': {'city': 'a', 'zip': '1'},
+            'friends': [{'city': 'b'}], 'nick': 'frog'}
+
+
+def test_diff_equal(data):
+    assert diff(Person(**data), Person(**data)) == {}
+
+
+def test_diff_paths(data):
+    a = Person(**data)
+    data['color'] = 'b'
+    data['address']['city'] = 'c'
+    data['friends'].append({'city': 'd'})
+    b = Person(**data)
+    assert diff(a, b) == {'set': {'color': 'b',
+                                  'address.city': 'c',
+                                  'friends': [{'city': 'b'},
+                                              {'city': 'd'}]}}
+
+
+def test_diff_optional(data):
+    a = Person(**data)
+    del data['nick']
+    del data['address']['zip']
+    b = Person(**data)
+    assert diff(a, b) == {'unset': ['address.zip', 'nick']}
+    assert diff(b, a) == {'set': {'address.zip': '1', 'nick': 'frog'}}
+
+
+def test_patch_roundtrip(data):
+    a = Person(**data)
+    data['color'] = 'b'
+    data['address'] = {'city': 'c'}
+    del data['nick']
+    b = Person(**data)
+    patched = patch(a, diff(a, b))
+    assert patched == b
+    assert asdict(patched) == asdict(b)
+    assert patched.friends is a.friends
+
+
+def test_patch_invalid(data):
+    a = Person(**data)
+    with pytest.raises(NestedInitializationException) as e:
+        patch(a, {'set': {'address.city': 1}})
+    assert e.value.errors['address']['city']
+
+
+def test_diff_wrong_types(data):
+    with pytest.raises(TypeError):
+        diff(Person(**data), Address('a', None))
@@ -0,0 +1,77 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+import json
+from typing import Dict, List
+from uuid import UUID
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass
+from c11h.dataclassutils.encoding import ENCODERS, register_encoder
+from c11h.dataclassutils.table import Table
+
+ID = UUID('12345678-1234-5678-1234-567812345678')
+
+
+class Kind(Enum):
+    a = ID
+
+
+class Stamp(datetime):
+    pass
+
+
+@dataclass(nest=True, validate=True)
+class Entry:
+    id: UUID
+    at: datetime
+    day: date
+    amount: Decimal
+    blob: bytes
+    kind: Kind
+
+
+@dataclass(nest=True, validate=True)
+class Ledger:
+    entries: List[Entry]
+    by_id: Dict[UUID, Decimal]
+
+
+@pytest.fixture
+def entry():
+    return Entry(ID, datetime(2024, 1, 2, 3, 4, tzinfo=timezone.utc),
+                 date(2024, 1, 2), Decimal('1.50'), b'\x00\xff', Kind.a)
+
+
+def test_encode(entry):
+    ledger = Ledger([entry], {ID: Decimal('2')})
+    encoded = asdict(ledger, encode=True)
+    assert encoded == {
+        'entries': [{'id': str(ID), 'at': '2024-01-02T03:04:00+00:00',
+                     'day': '2024-01-02', 'amount': '1.50', 'blob': 'AP8=',
+                     'kind': str(ID)}],
+        'by_id': {str(ID): '2'}}
+    json.dumps(encoded)
+
+
+def test_native_objects_by_default(entry):
+    assert asdict(entry)['id'] == ID
+    assert asdict(entry)['amount'] == Decimal('1.50')
+
+
+def test_subclasses(entry):
+    entry.at = Stamp(2024, 1, 2)
+    assert asdict(entry, encode=True)['at'] == '2024-01-02T00:00:00'
+
+
+def test_register_encoder(entry, monkeypatch):
+    monkeypatch.setitem(ENCODERS, Decimal, ENCODERS[Decimal])
+    assert asdict(entry, encode=True)['amount'] == '1.50'
+    register_encoder(Decimal, float)
+    assert asdict(entry, encode=True)['amount'] == 1.5
+
+
+def test_table(entry):
+    table = Table[Entry]([entry])
+    assert table.asdict(encode=True) == [asdict(entry, encode=True)]
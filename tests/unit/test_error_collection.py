@@ -0,0 +1,57 @@
+from typing import List
+
+import pytest
+from tests.unit.util.validator_functions import is_greater_0
+
+from c11h.dataclassutils import dataclass, field
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+post_inits: List[int] = []
+
+
+@dataclass(nest=True, validate=True)
+class Leaf:
+    a: int = field(validators=is_greater_0)
+
+    def __post_init__(self):
+        post_inits.append(self.a)
+
+
+@dataclass(nest=True, validate=True)
+class Branch:
+    leaves: List[Leaf]
+
+
+@dataclass(nest=True, validate=True)
+class Tree:
+    branch: Branch
+    leaf: Leaf
+
+
+def test_errors_of_all_levels():
+    with pytest.raises(NestedInitializationException) as e:
+        Tree(**{'branch': {'leaves': [{'a': 1}, {'a': -1}, {'a': 'x'}]},
+                'leaf': {'a': -1}})
+    errors = e.value.errors
+    assert set(errors) == {'branch', 'leaf'}
+    assert set(errors['branch']['leaves']) == {1, 2}
+    assert 'a' in errors['leaf']
+
+
+def test_post_init_skipped_for_invalid_children():
+    post_inits.clear()
+    with pytest.raises(NestedInitializationException):
+        Branch(**{'leaves': [{'a': 1}, {'a': -1}, {'a': 2}]})
+    assert post_inits == [1, 2]
+
+
+def test_direct_initialization_still_raises():
+    with pytest.raises(NestedInitializationException) as e:
+        Leaf(-1)
+    assert 'a' in e.value.errors
+
+
+def test_valid_tree():
+    tree = Tree(**{'branch': {'leaves': [{'a': 1}]}, 'leaf': {'a': 2}})
+    assert tree.branch.leaves == [Leaf(1)]
+    assert tree.leaf == Leaf(2)
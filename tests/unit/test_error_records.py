@@ -0,0 +1,147 @@
+import json
+from typing import FrozenSet, List
+
+import pytest
+from tests.unit.util.validator_functions import all_greater_0, is_greater_0
+
+from c11h.dataclassutils import dataclass, field, max_errors
+from c11h.dataclassutils.util.exceptions import (ErrorRecord,
+                                                 NestedInitializationException)
+
+post_inits = []
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    amount: int = 0
+
+    def __post_init__(self):
+        post_inits.append(self)
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+    items: List[Item]
+    notes: List[str] = field(default_factory=list)
+
+
+def test_records():
+    with pytest.raises(NestedInitializationException) as e:
+        Order(**{'id': 'x', 'items': [{'sku': 'a'}, {'sku': 1}]})
+    records = sorted(e.value.records, key=lambda r: str(r.path))
+    assert [r.path for r in records] == [('id',), ('items', 1, 'sku')]
+    assert records[0].expected is int
+    assert records[0].actual is str
+    assert records[0].value == 'x'
+    assert e.value.errors['id'] == (
+        "'x' is of type '<class 'str'>' instead of '<class 'int'>'")
+
+
+def test_messages_are_lazy_and_truncated():
+    huge = list(range(100000))
+    record = ErrorRecord(str, huge)
+    assert record._message is None
+    message = str(record)
+    assert len(message) < 200
+    assert record.value is huge
+
+
+def test_compatibility_view():
+    with pytest.raises(NestedInitializationException) as e:
+        Order(**{'id': 1, 'items': [], 'notes': [1]})
+    messages = e.value.messages()
+    json.dumps(messages)  # records are not serializable, strings are
+    assert messages == {'notes': {0: "'1' is of type '<class 'int'>' "
+                                     "instead of '<class 'str'>'"}}
+
+
+def test_max_errors():
+    payload = {'id': 1, 'items': [{'sku': i} for i in range(1000)]}
+    post_inits.clear()
+    with max_errors(3):
+        with pytest.raises(NestedInitializationException) as e:
+            Order(**payload)
+        assert len(e.value.records) == 3
+        assert not post_inits  # instances left unvalidated are invalid
+        # Every initialization gets the full budget.
+        with pytest.raises(NestedInitializationException) as e:
+            Order(**{'id': 'x', 'items': [], 'notes': [1, 2, 3, 4]})
+        assert len(e.value.records) == 3
+        assert Order(**{'id': 1, 'items': [{'sku': 'a'}]})
+    with pytest.raises(NestedInitializationException) as e:
+        Order(**payload)
+    assert len(e.value.records) == 1000
+
+
+def test_max_errors_on_item_validators():
+    @dataclass(nest=True, validate=True)
+    class Batch:
+        ids: List[int] = field(validators=all_greater_0, batch=True)
+        code: int = field(validators=is_greater_0, cache=8, default=1)
+        tags: FrozenSet[List[str]] = frozenset()
+
+    payloads = [{'ids': [-1] * 5}, {'ids': [-1] * 5, 'code': -1},
+                {'ids': [], 'code': -1, 'tags': [['a'], ['b'], ['c']]}]
+    for payload in payloads:
+        found = []
+        for _ in range(2):  # the second time from the validator cache
+            with max_errors(2):
+                with pytest.raises(NestedInitializationException) as e:
+                    Batch(**payload)
+            found.append(sorted(str(r.path) for r in e.value.records))
+        assert len(found[0]) <= 2
+        assert found[0] == found[1]
+
+
+@dataclass(nest=True, validate=True)
+class Stamp:
+    by: str = 'system'
+
+
+@dataclass(nest=True, validate=True)
+class Part:
+    sku: str
+    stamp: Stamp = field(default_factory=Stamp)
+
+
+@dataclass(nest=True, validate=True)
+class Assembly:
+    parts: List[Part]
+
+
+def test_max_errors_with_default_factories():
+    data = {'parts': [{'sku': i} for i in range(10)]}
+    with max_errors(3):
+        with pytest.raises(NestedInitializationException) as e:
+            Assembly(**data)
+    assert len(e.value.records) == 3
+
+
+probes = []
+
+
+def probe():
+    if not probes:
+        probes.append(None)
+        with pytest.raises(NestedInitializationException):
+            Probed(a='x')
+    return 0
+
+
+@dataclass(nest=True, validate=True)
+class Probed:
+    a: int
+    b: int = field(default_factory=probe)
+
+
+@dataclass(nest=True, validate=True)
+class ProbedOwner:
+    probed: Probed
+
+
+def test_default_factories_do_not_take_the_collector():
+    probes.clear()
+    assert ProbedOwner(**{'probed': {'a': 1}}).probed == Probed(1, 0)
+    assert probes
@@ -0,0 +1,91 @@
+from dataclasses import dataclass as std_dataclass
+from typing import List
+
+import pytest
+from tests.unit.util.validator_functions import is_greater_0
+
+from c11h.dataclassutils import dataclass, evolve, field
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+@dataclass(nest=True, validate=True, frozen=True)
+class Address:
+    city: str
+    number: int = field(validators=is_greater_0)
+
+
+@dataclass(nest=True, validate=True, frozen=True)
+class Person:
+    name: str
+    address: Address
+    tags: List[str]
+    upper_name: str = field(init=False, default='')
+
+    def __post_init__(self):
+        object.__setattr__(self, 'upper_name', self.name.upper())
+
+
+@std_dataclass
+class Plain:
+    a: int
+
+
+@pytest.fixture
+def person():
+    return Person(**{'name': 'pepe', 'address': {'city': 'a', 'number': 1},
+                     'tags': ['x']})
+
+
+def test_evolve_shares_unchanged(person):
+    new = evolve(person, name='frog')
+    assert new.name == 'frog'
+    assert new.upper_name == 'FROG'
+    assert new.address is person.address
+    assert new.tags is person.tags
+    assert person.name == 'pepe'
+
+
+def test_evolve_nests(person):
+    new = evolve(person, address={'city': 'b', 'number': 2})
+    assert new.address == Address('b', 2)
+
+
+def test_evolve_path(person):
+    new = evolve(person, **{'address.city': 'b'})
+    assert new.address.city == 'b'
+    assert new.address.number == 1
+    assert new.tags is person.tags
+    assert person.address.city == 'a'
+
+
+def test_evolve_invalid(person):
+    with pytest.raises(NestedInitializationException) as e:
+        evolve(person, name=1, **{'address.number': -1})
+    assert e.value.errors['name']
+    assert e.value.errors['address']['number']
+
+
+def test_evolve_wrong_fields(person):
+    with pytest.raises(TypeError):
+        evolve(person, age=1)
+    with pytest.raises(ValueError):
+        evolve(person, upper_name='A')
+    with pytest.raises(ValueError):
+        evolve(person, address={}, **{'address.city': 'b'})
+
+
+def test_evolve_plain_dataclass():
+    assert evolve(Plain(1), a=2) == Plain(2)
+    with pytest.raises(TypeError):
+        evolve({'a': 1}, a=2)
+
+
+def test_evolve_nested_errors_of_unvalidated_owner(person):
+    @dataclass(nest=True)
+    class Owner:
+        address: Address
+
+    owner = Owner(person.address)
+    with pytest.raises(NestedInitializationException) as e:
+        evolve(owner, **{'address.number': 'x'})
+    assert list(e.value.errors) == ['address']
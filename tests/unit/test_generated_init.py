@@ -0,0 +1,90 @@
+from dataclasses import InitVar
+from typing import List, Optional
+
+import pytest
+
+from c11h.dataclassutils import dataclass, field
+from c11h.dataclassutils.re_wrap import _init_wrapper
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+@dataclass(nest=True, validate=True)
+class Leaf:
+    a: int
+
+
+@dataclass(nest=True, validate=True, ignore_additional_properties=True)
+class Tree:
+    leaf: Leaf
+    name: Optional[str] = field(optional=True)
+    tags: List[str] = field(optional=True, default_optional_value=[])
+    leaves: List[Leaf] = field(default_factory=list)
+    size: int = field(default=0, init=False)
+
+
+@dataclass(frozen=True, validate=True)
+class Frozen:
+    a: int
+
+
+def test_generated():
+    assert Tree.__init__.__qualname__ == 'Tree.__init__'
+    assert Tree.__init__.__code__.co_filename == '<string>'
+
+
+def test_defaults():
+    tree = Tree(**{'leaf': {'a': 1}, 'unknown': 2})
+    assert tree == Tree(Leaf(1), None, [], [])
+    assert tree.size == 0
+    assert tree.tags is not Tree(Leaf(1)).tags
+
+
+def test_positional_optional():
+    assert Tree({'a': 1}, 'x').name == 'x'
+
+
+def test_input_is_copied():
+    leaves = [{'a': 1}]
+    tree = Tree(leaf={'a': 1}, leaves=leaves)
+    assert tree.leaves == [Leaf(1)]
+    assert leaves == [{'a': 1}]
+
+
+def test_missing_and_unexpected():
+    with pytest.raises(TypeError):
+        Tree()
+    with pytest.raises(TypeError):
+        Leaf(a=1, b=2)
+
+
+def test_validation():
+    with pytest.raises(NestedInitializationException):
+        Tree(leaf={'a': 'x'})
+    with pytest.raises(NestedInitializationException):
+        Frozen('x')
+    assert Frozen(1).a == 1
+
+
+def test_post_init_of_undecorated_subclass():
+    calls = []
+
+    class Sub(Leaf):
+        def __post_init__(self):
+            calls.append(self.a)
+
+    Sub(1)
+    assert calls == [1]
+
+
+def test_init_var_keeps_wrapper():
+    @dataclass(validate=True)
+    class WithInitVar:
+        a: int
+        b: InitVar[int] = 0
+
+        def __post_init__(self, b=0):
+            pass
+
+    assert WithInitVar.__init__.__code__ is not Tree.__init__.__code__
+    assert (WithInitVar.__init__.__code__.co_filename ==
+            _init_wrapper.__code__.co_filename)
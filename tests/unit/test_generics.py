@@ -0,0 +1,90 @@
+import copy
+import pickle
+from typing import Dict, Generic, List, Optional, TypeVar
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass
+from c11h.dataclassutils.binary import dumps, loads
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+K = TypeVar('K')
+T = TypeVar('T')
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+
+
+@dataclass(nest=True, validate=True)
+class Page(Generic[T]):
+    items: List[T]
+    first: Optional[T] = None
+
+
+@dataclass(nest=True, validate=True)
+class Index(Generic[K, T]):
+    pages: Dict[K, Page[T]]
+
+
+def test_specialization_is_cached():
+    assert Page[Item] is Page[Item]
+    assert Page[Item] is not Page[Order]
+    assert issubclass(Page[Item], Page)
+    assert Page[Item].__dataclass_fields__['items'].type == List[Item]
+    assert Page.__dataclass_fields__['items'].type == List[T]
+
+
+def test_nesting_and_validation():
+    page = Page[Item](**{'items': [{'sku': 'a'}], 'first': {'sku': 'b'}})
+    assert page.items == [Item('a')]
+    assert page.first == Item('b')
+    assert repr(page).startswith('Page[Item](')
+    with pytest.raises(NestedInitializationException) as e:
+        Page[Order](**{'items': [{'id': 'x'}]})
+    assert list(e.value.errors) == ['items']
+
+
+def test_unspecialized_class_is_untouched():
+    page = Page(**{'items': [{'sku': 'a'}]})
+    assert page.items == [{'sku': 'a'}]
+
+
+def test_nested_generics():
+    index = Index[str, Item](**{'pages': {'a': {'items': [{'sku': 'x'}]}}})
+    assert type(index.pages['a']) is Page[Item]
+    assert asdict(index) == {'pages': {'a': {'items': [{'sku': 'x'}]}}}
+
+
+def test_still_generic_subscriptions():
+    alias = Page[List[T]]
+    assert not isinstance(alias, type)
+    assert alias.__origin__ is Page
+
+
+def test_per_class_plans():
+    page = Page[Item](**{'items': [{'sku': 'a'}]})
+    assert loads(Page[Item], dumps(page)) == page
+
+
+def test_pickle_and_copy():
+    page = Page[Item](**{'items': [{'sku': 'a'}]})
+    for other in (pickle.loads(pickle.dumps(page)), copy.copy(page),
+                  copy.deepcopy(page)):
+        assert type(other) is Page[Item]
+        assert other == page
+    assert copy.deepcopy(page).items[0] is not page.items[0]
+
+
+def test_equal_to_unspecialized():
+    page = Page[Item](**{'items': [Item('a')]})
+    assert page == Page(items=[Item('a')])
+    assert Page(items=[Item('a')]) == page
+    assert page != Page(items=[Item('b')])
+    assert page != Page[Order](**{'items': []})
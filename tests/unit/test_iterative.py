@@ -0,0 +1,158 @@
+from enum import Enum
+from typing import ClassVar, Dict, List, Optional
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass, field, max_errors
+from c11h.dataclassutils.iterative import asdict_deep, build_deep
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+DEPTH = 10000
+
+
+class Color(Enum):
+    red = 'r'
+
+
+@dataclass(nest=True, validate=True)
+class Node:
+    name: str
+    children: List['Node'] = field(default_factory=list)
+    parent_of: Dict[str, 'Node'] = field(default_factory=dict)
+    color: Optional[Color] = None
+
+
+@dataclass(nest=True, validate=True)
+class Chain:
+    value: int
+    next: Optional['Chain'] = None
+
+
+@dataclass(nest=True, validate=True)
+class Tracked:
+    name: str
+    child: Optional['Tracked'] = None
+    order: ClassVar[List[str]] = []
+
+    def __post_init__(self):
+        self.order.append(self.name)
+
+
+@dataclass(nest=True, validate=True)
+class Forest:
+    trees: List['Tree']
+
+
+@dataclass(nest=True, validate=True)
+class Tree:
+    height: int
+
+
+def make_tree():
+    return {'name': 'root', 'color': 'r',
+            'children': [{'name': 'a', 'children': [{'name': 'b'}]},
+                         {'name': 'c'}],
+            'parent_of': {'x': {'name': 'd'}}}
+
+
+def make_chain(depth):
+    data = None
+    for value in range(depth):
+        data = {'value': value, 'next': data}
+    return data
+
+
+def test_same_as_init():
+    data = make_tree()
+    node = build_deep(Node, data)
+    assert node == Node(**make_tree())
+    assert node.color is Color.red
+    assert data == make_tree()  # the input is not mutated
+    assert asdict_deep(node) == asdict(node)
+
+
+def test_same_errors_as_init():
+    data = make_tree()
+    data['children'][0]['children'][0]['name'] = 1
+    data['children'][1]['color'] = 'nope'
+    with pytest.raises(NestedInitializationException) as deep:
+        build_deep(Node, data)
+    assert deep.value.messages() == {
+        'children': {0: {'children': {0: {'name': (
+            "'1' is of type '<class 'int'>' instead of '<class 'str'>'")}}},
+            1: {'color': deep.value.errors['children'][1]['color']}}}
+    with pytest.raises(NestedInitializationException) as regular:
+        Node(**data)
+    assert list(regular.value.errors['children']) == [0, 1]
+
+
+def test_wrong_fields():
+    with pytest.raises(TypeError):
+        build_deep(Node, {'children': []})
+    with pytest.raises(TypeError):
+        build_deep(Node, {'name': 'a', 'children': [{'unknown': 1}]})
+
+
+def test_post_init_runs_bottom_up():
+    Tracked.order = []
+    build_deep(Tracked, {'name': 'a', 'child': {'name': 'b'}})
+    assert Tracked.order == ['b', 'a']
+
+
+def test_deep_chain():
+    chain = build_deep(Chain, make_chain(DEPTH))
+    assert chain.value == DEPTH - 1
+    exported = asdict_deep(chain)
+    for _ in range(DEPTH - 1):
+        exported = exported['next']
+    assert exported == asdict(Chain(0))
+    with pytest.raises(RecursionError):
+        Chain(**make_chain(DEPTH))
+
+
+def test_deep_errors():
+    data = make_chain(DEPTH)
+    data['next']['next']['value'] = 'x'
+    with pytest.raises(NestedInitializationException) as e:
+        build_deep(Chain, data)
+    assert [r.path for r in e.value.records] == [('next', 'next', 'value')]
+
+
+def test_max_errors():
+    data = {'name': 'a', 'children': [{'name': i} for i in range(100)]}
+    with max_errors(3):
+        with pytest.raises(NestedInitializationException) as e:
+            build_deep(Node, data)
+    assert len(e.value.records) == 3
+
+
+def init_outcome(cls, data):
+    try:
+        return cls(**data)
+    except Exception as e:
+        return type(e)
+
+
+def test_forward_refs():
+    assert Node.__dataclass_fields__['children'].type == List[Node]
+    data = {'trees': [{'height': 1}]}
+    before = init_outcome(Forest, data)
+    assert build_deep(Forest, data).trees == [Tree(1)]
+    assert init_outcome(Forest, data) == before
+    assert str(Forest.__dataclass_fields__['trees'].type) == (
+        "typing.List[ForwardRef('Tree')]")
+
+
+@dataclass(nest=True, validate=False, coerce=True)
+class Loose:
+    n: int
+    color: Color
+    child: Optional[Chain] = None
+
+
+def test_without_validation():
+    data = {'n': 'x', 'color': 'zz', 'child': {'value': 'y'}}
+    loose = build_deep(Loose, data)
+    assert loose == Loose(**data)
+    assert loose.child == {'value': 'y'}
+    assert loose.child is not data['child']
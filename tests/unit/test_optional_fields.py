@@ -1,10 +1,12 @@
-from typing import Optional
+from typing import List, Optional
 
 import pytest
+from tests.unit.util.validator_functions import all_greater_0, is_greater_0
 
 from c11h.dataclassutils.nesting import asdict
 from c11h.dataclassutils.re_wrap import dataclass, field
 from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.validation import validator_cache_info
 
 
 @dataclass(validate=True, nest=True)
@@ -96,3 +98,19 @@ def test_basic_optional_composite():
     assert obj.a is None
     obj = BasicOptionalComposite(**{'a': {}})
     assert obj.a.b is None
+
+
+@dataclass(validate=True, nest=True)
+class OptionalValidated:
+    a: Optional[int] = field(validators=is_greater_0, cache=4)
+    b: Optional[List[int]] = field(validators=all_greater_0, batch=True)
+
+
+def test_optional_typing_keeps_validators():
+    assert OptionalValidated().a is None
+    assert OptionalValidated(a=1, b=[1, 2]).b == [1, 2]
+    with pytest.raises(NestedInitializationException) as e:
+        OptionalValidated(a=-1, b=[1, -2])
+    assert list(e.value.errors) == ['a', 'b']
+    assert list(e.value.errors['b']) == [1]
+    assert validator_cache_info(OptionalValidated)['a'].misses == 2
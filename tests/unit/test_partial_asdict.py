@@ -0,0 +1,78 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass
+from c11h.dataclassutils.nesting import _views
+
+
+@dataclass(nest=True, validate=True)
+class Tag:
+    name: str
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    price: float
+    tags: List[Tag]
+
+
+@dataclass(nest=True, validate=True)
+class Order:
+    id: int
+    items: List[Item]
+    by_sku: Dict[str, Item]
+    parent: Optional[Tag] = None
+
+
+@pytest.fixture
+def order():
+    item = {'sku': 'a', 'price': 1.0, 'tags': [{'name': 'x'}]}
+    return Order(**{'id': 1, 'items': [item], 'by_sku': {'a': item},
+                    'parent': {'name': 'p'}})
+
+
+def test_include(order):
+    assert asdict(order, include=['id', 'items[*].sku']) == {
+        'id': 1, 'items': [{'sku': 'a'}]}
+    assert asdict(order, include=['items.tags', 'by_sku.price']) == {
+        'items': [{'tags': [{'name': 'x'}]}], 'by_sku': {'a': {'price': 1.0}}}
+
+
+def test_exclude(order):
+    assert asdict(order, exclude=['items', 'by_sku.tags', 'parent']) == {
+        'id': 1, 'by_sku': {'a': {'sku': 'a', 'price': 1.0}}}
+
+
+def test_max_depth(order):
+    assert asdict(order, max_depth=0) == {'id': 1, 'items': [],
+                                          'by_sku': {}}
+    assert asdict(order, max_depth=1) == {
+        'id': 1, 'items': [{'sku': 'a', 'price': 1.0, 'tags': []}],
+        'by_sku': {'a': {'sku': 'a', 'price': 1.0, 'tags': []}},
+        'parent': {'name': 'p'}}
+    assert asdict(order, max_depth=2) == asdict(order)
+
+
+def test_max_depth_with_include(order):
+    assert asdict(order, include=['items', 'parent'], max_depth=0) == {
+        'items': []}
+
+
+def test_views_are_cached(order):
+    asdict(order, include=['items[*].sku'])
+    cached = len(_views)
+    asdict(order, include=['items[*].sku'])
+    assert len(_views) == cached
+
+
+def test_invalid_selection(order):
+    with pytest.raises(TypeError, match='no fields called'):
+        asdict(order, include=['items.missing'])
+    with pytest.raises(ValueError):
+        asdict(order, include=['id'], exclude=['items'])
+    with pytest.raises(TypeError, match='not a single str'):
+        asdict(order, include='id')
+    with pytest.raises(TypeError, match='not a single str'):
+        asdict(order, exclude='items')
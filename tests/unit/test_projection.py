@@ -0,0 +1,98 @@
+from typing import List, Optional
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass, from_dict
+from c11h.dataclassutils.projection import EXCLUDED
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+from c11h.dataclassutils.util.helper_functions import path_tree
+
+
+@dataclass(nest=True, validate=True)
+class Header:
+    id: int
+    author: str
+
+
+@dataclass(nest=True, validate=True)
+class Item:
+    sku: str
+    price: float
+
+
+@dataclass(nest=True, validate=True)
+class Document:
+    header: Header
+    items: List[Item]
+    parent: Optional[Header]
+
+
+DATA = {'header': {'id': 1, 'author': 'a'},
+        'items': [{'sku': 'x', 'price': 1.0}, {'sku': 'y', 'price': 'bad'}],
+        'parent': None}
+
+
+def test_path_tree():
+    assert path_tree(['a.b', 'a.c', 'd']) == {'a': {'b': None, 'c': None},
+                                              'd': None}
+    assert path_tree(['a[*].b', 'a']) == {'a': None}
+    assert path_tree(['a', 'a.b']) == {'a': None}
+
+
+def test_include():
+    doc = from_dict(Document, DATA, include=['header.id', 'items[*].sku'])
+    assert doc.header.id == 1
+    assert doc.header.author is EXCLUDED
+    assert [i.sku for i in doc.items] == ['x', 'y']
+    assert doc.items[1].price is EXCLUDED
+    assert doc.parent is EXCLUDED
+    assert asdict(doc) == {'header': {'id': 1},
+                           'items': [{'sku': 'x'}, {'sku': 'y'}]}
+
+
+def test_exclude():
+    doc = from_dict(Document, DATA, exclude=['items.price', 'parent'])
+    assert doc.header == Header(1, 'a')
+    assert doc.items[1].sku == 'y'
+    assert asdict(doc) == {'header': {'id': 1, 'author': 'a'},
+                           'items': [{'sku': 'x'}, {'sku': 'y'}]}
+
+
+def test_excluded_subtree_is_not_validated():
+    data = dict(DATA, header={'id': 'bad'})
+    doc = from_dict(Document, data, include=['items.sku'])
+    assert doc.header is EXCLUDED
+
+
+def test_selected_fields_are_validated():
+    with pytest.raises(NestedInitializationException) as e:
+        from_dict(Document, DATA, include=['items.price'])
+    assert e.value.errors == {'items': {1: {'price': (
+        "'bad' is of type '<class 'str'>' instead of '<class 'float'>'")}}}
+
+
+def test_values_which_can_not_be_projected():
+    data = dict(DATA, header=5, items=[{'sku': 'x', 'price': 1.0}, 'y'])
+    with pytest.raises(NestedInitializationException) as e:
+        from_dict(Document, data, include=['header.id', 'items.sku'])
+    assert list(e.value.errors) == ['header', 'items']
+    assert list(e.value.errors['items']) == [1]
+    header = Header(1, 'a')
+    doc = from_dict(Document, dict(DATA, header=header, parent=None),
+                    include=['header.id', 'parent.id'])
+    assert doc.header == header
+    assert doc.parent is None
+
+
+def test_without_paths():
+    data = dict(DATA, items=[])
+    assert from_dict(Document, data) == Document(**data)
+
+
+def test_invalid_paths():
+    with pytest.raises(TypeError):
+        from_dict(Document, DATA, include=['nope'])
+    with pytest.raises(TypeError):
+        from_dict(Document, DATA, include=['header.id.x'])
+    with pytest.raises(ValueError):
+        from_dict(Document, DATA, include=['header'], exclude=['items'])
@@ -0,0 +1,155 @@
+import csv
+from enum import Enum
+import io
+import sqlite3
+from typing import List, Optional
+
+import pytest
+
+from c11h.dataclassutils import (astuples, dataclass, field, from_rows,
+                                 iter_rows)
+from c11h.dataclassutils.rows import row_columns
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+class Color(Enum):
+    red = 'r'
+    blue = 'b'
+
+
+@dataclass(nest=True, validate=True)
+class Address:
+    city: str
+    zip: Optional[str]
+
+
+@dataclass(nest=True, validate=True)
+class Person:
+    name: str
+    color: Color
+    address: Optional[Address]
+    tags: List[str]
+
+
+@pytest.fixture
+def people():
+    return [Person(**{'name': 'a', 'color': 'r',
+                      'address': {'city': 'x', 'zip': '1'}, 'tags': ['t']}),
+            Person(**{'name': 'b', 'color': 'b', 'address': None,
+                      'tags': []})]
+
+
+def test_default_columns(people):
+    rows = astuples(people)
+    assert rows[0] == ('a', 'r', people[0].address, ['t'])
+    assert rows[0][3] is people[0].tags  # not copied
+
+
+def test_flatten(people):
+    assert row_columns(Person, flatten=True) == (
+        'name', 'color', 'address.city', 'address.zip', 'tags')
+    assert astuples(people, flatten=True) == [
+        ('a', 'r', 'x', '1', ['t']), ('b', 'b', None, None, [])]
+
+
+def test_columns(people):
+    assert astuples(people, ['address.city', 'name']) == [('x', 'a'),
+                                                          (None, 'b')]
+    assert astuples(people, ['name']) == [('a',), ('b',)]
+    assert astuples(people, ['color'], enum_values=False) == [
+        (Color.red,), (Color.blue,)]
+
+
+def test_unknown_column(people):
+    with pytest.raises(TypeError, match="no column 'tags.x'"):
+        astuples(people, ['tags.x'])
+    with pytest.raises(TypeError, match="no column 'missing'"):
+        astuples(people, ['missing'])
+
+
+def test_iter_rows_is_lazy():
+    def instances():
+        yield Address(**{'city': 'x', 'zip': None})
+        raise RuntimeError
+
+    rows = iter_rows(instances())
+    assert next(rows) == ('x', None)
+    with pytest.raises(RuntimeError):
+        next(rows)
+
+
+def test_sqlite_and_csv(people):
+    columns = ['name', 'color', 'address.city']
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE person (name, color, city)')
+    connection.executemany('INSERT INTO person VALUES (?, ?, ?)',
+                           iter_rows(people, columns))
+    assert connection.execute('SELECT * FROM person').fetchall() == [
+        ('a', 'r', 'x'), ('b', 'b', None)]
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(row_columns(Person, columns))
+    writer.writerows(iter_rows(people, columns))
+    assert out.getvalue().splitlines() == ['name,color,address.city',
+                                           'a,r,x', 'b,b,']
+
+
+@dataclass(nest=True, validate=True)
+class Card:
+    name: str
+    color: Color
+    address: Optional[Address]
+    tags: List[str] = field(default_factory=list)
+
+
+def test_from_rows_roundtrip(people):
+    rows = astuples(people, flatten=True)
+    assert from_rows(Person, rows) == people
+
+
+def test_from_rows_columns():
+    rows = [('x', 'r', 'a'), (None, 'b', 'b')]
+    cards = from_rows(Card, rows, ['address.city', 'color', 'name'])
+    assert cards[0] == Card(**{'name': 'a', 'color': 'r', 'tags': [],
+                               'address': {'city': 'x', 'zip': None}})
+    assert cards[1].address is None
+    assert cards[1].color is Color.blue
+    assert cards[0].tags is not cards[1].tags
+
+
+def test_from_rows_does_not_copy():
+    tags = ['t']
+    card, = from_rows(Card, [('a', 'r', None, None, tags)])
+    assert card.tags is tags
+
+
+def test_from_rows_errors():
+    rows = [('a', 'r', None), (1, 'x', None)]
+    columns = ['name', 'color', 'address.city']
+    with pytest.raises(NestedInitializationException) as e:
+        from_rows(Card, rows, columns)
+    assert list(e.value.errors) == [1]
+    assert set(e.value.errors[1]) == {'name', 'color'}
+    card, _ = from_rows(Card, [('a', 'r', None), (1, 'r', None)], columns,
+                        validate=False)
+    assert card.name == 'a'
+
+
+@dataclass(nest=True, validate=False, coerce=True)
+class Loose:
+    n: int
+    color: Color
+
+
+def test_from_rows_without_validation():
+    loose, = from_rows(Loose, [('x', 'zz')], ['n', 'color'])
+    assert loose == Loose(n='x', color='zz')
+
+
+def test_from_rows_invalid_columns():
+    with pytest.raises(TypeError, match="no column 'address.x'"):
+        from_rows(Card, [], ['name', 'color', 'address.x'])
+    with pytest.raises(TypeError, match="required field 'color'"):
+        from_rows(Card, [], ['name', 'address'])
+    with pytest.raises(TypeError, match='along with'):
+        from_rows(Card, [], ['name', 'color', 'address', 'address.city'])
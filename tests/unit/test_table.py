@@ -0,0 +1,140 @@
+from array import array
+from enum import Enum
+from typing import List, Optional
+
+import pytest
+
+from c11h.dataclassutils import asdict, dataclass, field
+from c11h.dataclassutils.table import Table
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+class Color(Enum):
+    red = 'r'
+    blue = 'b'
+
+
+@dataclass(nest=True, validate=True)
+class Tag:
+    name: str
+
+
+@dataclass(nest=True, validate=True)
+class Point:
+    x: int
+    y: float
+    visible: bool
+    color: Color
+    tags: List[Tag]
+    label: Optional[str]
+    z: int = field(optional=True, default_optional_value=0)
+
+
+@pytest.fixture
+def rows():
+    return [{'x': 1, 'y': 1.5, 'visible': True, 'color': 'r',
+             'tags': [{'name': 'a'}], 'label': 'p'},
+            {'x': 2, 'y': 2.5, 'visible': False, 'color': 'b',
+             'tags': [], 'z': 3}]
+
+
+def test_columns(rows):
+    table = Table[Point](rows)
+    assert len(table) == 2
+    assert isinstance(table._data[0], array)
+    assert isinstance(table._data[3], array)  # enum ordinals
+    assert table.column('color') == [Color.red, Color.blue]
+    assert table.column('visible') == [True, False]
+
+
+def test_rows(rows):
+    table = Table[Point](rows)
+    expected = [Point(**row) for row in rows]
+    assert table[0] == expected[0]
+    assert table[-1] == expected[1]
+    assert list(table) == expected
+    assert list(table[1:]) == expected[1:]
+    with pytest.raises(IndexError):
+        table[2]
+
+
+def test_asdict(rows):
+    table = Table[Point](rows)
+    assert table.asdict() == [asdict(Point(**row)) for row in rows]
+
+
+def test_extend_instances(rows):
+    table = Table[Point]()
+    table.append(Point(**rows[0]))
+    table.extend([rows[1]])
+    assert table.asdict() == [asdict(Point(**row)) for row in rows]
+
+
+def test_extend_invalid(rows):
+    table = Table[Point](rows)
+    rows[0]['x'] = 'a'
+    rows[1]['tags'] = [{'name': 1}]
+    with pytest.raises(NestedInitializationException) as e:
+        table.extend(rows)
+    assert e.value.errors[0]['x']
+    assert e.value.errors[1]['tags'][0]['name']
+    assert len(table) == 2
+
+
+def test_extend_wrong_fields(rows):
+    table = Table[Point]()
+    with pytest.raises(TypeError):
+        table.append({'x': 1})
+    rows[0]['unknown'] = 1
+    with pytest.raises(TypeError):
+        table.append(rows[0])
+
+
+def test_specialization():
+    assert Table[Point] is Table[Point]
+    with pytest.raises(TypeError):
+        Table()
+    with pytest.raises(TypeError):
+        Table[int]
+
+
+def test_values_arrays_can_not_hold():
+    @dataclass(nest=True)
+    class Loose:
+        x: int
+        flag: bool
+
+    table = Table[Loose]([{'x': 1, 'flag': True}])
+    table.append({'x': 2 ** 70, 'flag': 1})
+    table.append({'x': True, 'flag': False})
+    assert table.column('x') == [1, 2 ** 70, True]
+    assert [type(x) for x in table.column('x')] == [int, int, bool]
+    assert table.column('flag') == [True, 1, False]
+    assert table[1] == Loose(2 ** 70, 1)
+    assert Table[Loose]([{'x': 1, 'flag': True}])._data[0].typecode == 'q'
+
+
+def test_enum_values_of_unvalidated_classes():
+    @dataclass(nest=True, validate=False, coerce=True)
+    class Loose:
+        color: Color
+
+    table = Table[Loose]([{'color': 'r'}])
+    assert table._data[0].typecode == 'I'
+    table.append({'color': 'zz'})
+    table.append(Loose(color='b'))
+    assert table.column('color') == [Color.red, 'zz', Color.blue]
+
+
+def test_rows_which_are_no_dicts(rows):
+    with pytest.raises(TypeError, match='instances of it or dicts'):
+        Table[Point]([Point(**rows[0]), (2,)])
+
+
+def test_rows_are_copies(rows):
+    point = Point(**rows[0])
+    table = Table[Point]([point])
+    point.tags.append(Tag('b'))
+    assert table[0].tags == [Tag('a')]
+    table[0].tags.clear()
+    assert table.column('tags') == [[Tag('a')]]
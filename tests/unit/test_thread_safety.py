@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import List
+
+from c11h.dataclassutils import dataclass
+from c11h.dataclassutils.binary import dumps, loads
+from c11h.dataclassutils.table import Table
+from c11h.dataclassutils.util.plan_cache import PlanCache
+
+N_THREADS = 8
+
+
+def run_concurrently(func):
+    barrier = threading.Barrier(N_THREADS)
+
+    def task(i):
+        barrier.wait()
+        return func(i)
+    with ThreadPoolExecutor(N_THREADS) as pool:
+        return list(pool.map(task, range(N_THREADS)))
+
+
+def test_plan_cache_computes_once():
+    calls = []
+
+    def slow(key):
+        calls.append(key)
+        time.sleep(0.01)
+        return object()
+    cache = PlanCache(slow)
+    results = run_concurrently(lambda i: cache['key'])
+    assert calls == ['key']
+    assert all(r is results[0] for r in results)
+    assert 'key' in cache and len(cache) == 1
+
+
+def test_plan_cache_reentrant():
+    def factory(n):
+        return 0 if n == 0 else cache[n - 1] + 1
+    cache = PlanCache(factory)
+    assert cache[10] == 10
+
+
+@dataclass(nest=True, validate=True)
+class Leaf:
+    a: int
+
+
+@dataclass(nest=True, validate=True)
+class Tree:
+    leaves: List[Leaf]
+
+
+def test_table_specialization():
+    results = run_concurrently(lambda i: Table[Tree])
+    assert all(r is results[0] for r in results)
+
+
+def test_concurrent_construction():
+    def build(i):
+        tree = Tree(**{'leaves': [{'a': i}, {'a': i + 1}]})
+        return loads(Tree, dumps(tree))
+    results = run_concurrently(build)
+    assert [r.leaves[0].a for r in results] == list(range(N_THREADS))
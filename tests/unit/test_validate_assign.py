@@ -0,0 +1,85 @@
+from typing import List
+
+import pytest
+from tests.unit.util.validator_functions import is_greater_0
+
+from c11h.dataclassutils import dataclass, field
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+@dataclass(nest=True, validate='assign')
+class Leaf:
+    a: int = field(validators=is_greater_0)
+
+
+@dataclass(nest=True, validate='assign')
+class Tree:
+    leaf: Leaf
+    leaves: List[Leaf]
+
+
+def test_assign_valid():
+    obj = Leaf(1)
+    obj.a = 2
+    assert obj.a == 2
+
+
+def test_assign_invalid_type():
+    obj = Leaf(1)
+    with pytest.raises(NestedInitializationException) as e:
+        obj.a = '2'
+    assert 'a' in e.value.errors
+    assert obj.a == 1
+
+
+def test_assign_invalid_validator():
+    obj = Leaf(1)
+    with pytest.raises(NestedInitializationException):
+        obj.a = -1
+    assert obj.a == 1
+
+
+def test_assign_nests():
+    obj = Tree(**{'leaf': {'a': 1}, 'leaves': []})
+    data = [{'a': 2}, {'a': 3}]
+    obj.leaves = data
+    assert obj.leaves == [Leaf(2), Leaf(3)]
+    # the assigned value is not mutated by the nesting
+    assert data == [{'a': 2}, {'a': 3}]
+
+
+def test_assign_nest_errors():
+    obj = Tree(**{'leaf': {'a': 1}, 'leaves': []})
+    with pytest.raises(NestedInitializationException) as e:
+        obj.leaves = [{'a': 2}, {'a': 'b'}]
+    assert e.value.errors['leaves'][1]['a']
+    assert obj.leaves == []
+
+
+def test_assign_non_field():
+    obj = Leaf(1)
+    obj.not_a_field = 'anything'
+    assert obj.not_a_field == 'anything'
+
+
+def test_assign_frozen():
+    with pytest.raises(ValueError, match='frozen'):
+        @dataclass(validate='assign', frozen=True)
+        class FrozenLeaf:
+            a: int
+
+
+def test_invalid_validate_mode():
+    with pytest.raises(ValueError):
+        @dataclass(validate='always')
+        class Invalid:
+            a: int
+
+
+def test_assign_after_delete():
+    obj = Leaf(1)
+    del obj.a
+    with pytest.raises(NestedInitializationException):
+        obj.a = 'wrong type'
+    obj.a = 2
+    assert obj.a == 2
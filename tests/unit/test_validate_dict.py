@@ -0,0 +1,118 @@
+from enum import Enum
+from typing import Dict, List, Optional, Tuple, Union
+
+import pytest
+from tests.unit.util.validator_functions import is_greater_0
+
+from c11h.dataclassutils import dataclass, field, validate_dict
+from c11h.dataclassutils.util.exceptions import NestedInitializationException
+
+
+class Color(Enum):
+    red = 'r'
+
+
+@dataclass(nest=True, validate=True, frozen=True)
+class Leaf:
+    a: int = field(validators=is_greater_0)
+    color: Optional[Color] = field(optional=True)
+
+
+@dataclass(nest=True, validate=True)
+class Tree:
+    leaf: Leaf
+    leaves: List[Leaf]
+    pair: Tuple[Leaf, int]
+    meta: Dict[str, int]
+    name: str = field(optional=True, default_optional_value='')
+
+
+@dataclass(validate=True, ignore_additional_properties=True)
+class Loose:
+    a: int
+
+
+@dataclass(nest=True, validate=True)
+class Mixed:
+    either: Union[int, str]
+    items: List[Union[int, str]]
+    pair: Tuple[Union[int, str], Leaf]
+    ratios: Dict[str, float]
+    leaf: Optional[Leaf] = None
+
+
+VALID = {'leaf': {'a': 1, 'color': 'r'}, 'leaves': [{'a': 2}],
+         'pair': [{'a': 3}, 4], 'meta': {'x': 1}}
+
+
+def construction_errors(cls, data):
+    try:
+        cls(**data)
+    except NestedInitializationException as e:
+        return e.errors
+    return {}
+
+
+def test_valid():
+    assert validate_dict(Tree, VALID) == {}
+    assert construction_errors(Tree, VALID) == {}
+
+
+@pytest.mark.parametrize('change', [
+    {'leaf': {'a': -1}},
+    {'leaf': {'a': 'x'}},
+    {'leaf': {'a': 1, 'color': 'b'}},
+    {'leaves': [{'a': 1}, {'a': 'x'}]},
+    {'leaves': 1},
+    {'pair': [{'a': 1}]},
+    {'meta': {'x': 'y'}},
+    {'name': 1},
+])
+def test_same_fields_as_construction(change):
+    data = dict(VALID, **change)
+    errors = validate_dict(Tree, data)
+    assert errors
+    assert errors.keys() == construction_errors(Tree, data).keys()
+
+
+def test_item_positions():
+    data = dict(VALID, leaves=[{'a': 1}, {'a': 'x'}])
+    assert list(validate_dict(Tree, data)['leaves']) == [1]
+
+
+def test_input_not_mutated():
+    data = dict(VALID)
+    validate_dict(Tree, data)
+    assert data == VALID
+
+
+def test_missing_and_unknown_fields():
+    with pytest.raises(TypeError):
+        validate_dict(Tree, {'leaf': {'a': 1}})
+    with pytest.raises(TypeError):
+        validate_dict(Tree, dict(VALID, leaf={'a': 1, 'b': 2}))
+    assert validate_dict(Loose, {'a': 1, 'b': 2}) == {}
+
+
+@pytest.mark.parametrize('data', [
+    {'either': 1, 'items': [1, 'a'], 'pair': [1, {'a': 1}],
+     'ratios': {'a': 1.0}},
+    {'either': True, 'items': [], 'pair': ['a', {'a': 1}], 'ratios': {}},
+    {'either': 1.5, 'items': [1, True], 'pair': [1, {'a': 1}],
+     'ratios': {'a': 1}},
+    {'either': 'a', 'items': 'ab', 'pair': [False, {'a': 1}],
+     'ratios': {1: 1.0}},
+    {'either': None, 'items': [None], 'pair': [1, {'a': 'x'}],
+     'ratios': []},
+    {'either': 1, 'items': [], 'pair': [1, {'a': 1}], 'ratios': {},
+     'leaf': {'a': -5}},
+    {'either': 1, 'items': [], 'pair': [1, {'a': 1}], 'ratios': {},
+     'leaf': {'a': 1, 'color': 'x'}},
+    {'either': 1, 'items': [], 'pair': [1, {'a': 1}], 'ratios': {},
+     'leaf': 5},
+])
+def test_same_checks_as_construction(data):
+    errors = validate_dict(Mixed, data)
+    assert errors.keys() == construction_errors(Mixed, data).keys()
+    if 'leaf' in errors:
+        assert errors['leaf'] == construction_errors(Mixed, data)['leaf']
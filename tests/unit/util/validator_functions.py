@@ -8,3 +8,8 @@ def is_odd(i: int):
     """Check if a given integer is an odd number."""
     if i % 2 == 0:
         raise AttributeError("The given integer is not an odd number.")
+
+
+def all_greater_0(values):
+    """Return the positions of the given integers which are below 0."""
+    return [i for i, v in enumerate(values) if v < 0]